@@ -0,0 +1,79 @@
+"""Throughput benchmark of the offline signal engine.
+
+Runs typical derived signals over random data and reports processed samples per second for each signal and chunk
+size.
+
+Usage:
+    python benchmarks/engine_throughput.py [--channels 32] [--fs 500] [--seconds 600]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from nfb_studio.engine import build_chain
+
+signals = {
+    "alpha-butter": {
+        "SpatialFilterMatrix": "Ch1=1;Ch2=-1",
+        "fBandpassLowHz": 8.0,
+        "fBandpassHighHz": 12.0,
+        "sTemporalFilterType": "butter",
+        "fTemporalFilterButterOrder": 2,
+        "method": "Rectification",
+        "fSmoothingFactor": 0.97,
+        "sTemporalSmootherType": "exp",
+        "fAverage": 0.0,
+        "fStdDev": 1.0,
+    },
+    "alpha-cfir": {
+        "SpatialFilterMatrix": "Ch1=1;Ch2=-1",
+        "fBandpassLowHz": 8.0,
+        "fBandpassHighHz": 12.0,
+        "fFFTWindowSize": 500.0,
+        "method": "cFIR",
+        "fSmoothingFactor": 0.0,
+        "sTemporalSmootherType": "exp",
+    },
+    "average-delayed": {
+        "SpatialFilterMatrix": "",
+        "fBandpassLowHz": 1.0,
+        "fBandpassHighHz": 40.0,
+        "sTemporalFilterType": "butter",
+        "fTemporalFilterButterOrder": 4,
+        "iDelayMs": 500,
+    },
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", type=int, default=32, help="number of channels")
+    parser.add_argument("--fs", type=float, default=500, help="sampling frequency in Hz")
+    parser.add_argument("--seconds", type=float, default=600, help="length of the data in seconds")
+    parser.add_argument("--chunks", type=int, nargs="+", default=[1, 32, 1024], help="chunk sizes to test")
+    args = parser.parse_args()
+
+    channel_names = ["Ch{}".format(i + 1) for i in range(args.channels)]
+    data = np.random.default_rng(0).standard_normal((int(args.fs * args.seconds), args.channels))
+
+    print("{} samples x {} channels".format(*data.shape))
+    print("{:<18} {:>8} {:>16} {:>12}".format("signal", "chunk", "samples/s", "x realtime"))
+
+    for name, signal in signals.items():
+        for chunk_size in args.chunks:
+            chain = build_chain(signal, args.fs, channel_names)
+
+            start = time.perf_counter()
+            chain.run(data, chunk_size)
+            elapsed = time.perf_counter() - start
+
+            throughput = len(data) / elapsed
+            print("{:<18} {:>8} {:>16,.0f} {:>12,.1f}".format(name, chunk_size, throughput, throughput / args.fs))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Scaling benchmark of the parallel simulator.
+
+Runs many derived signals that share one data source (and, in groups, spatial and bandpass filters) with
+ParallelSimulator on 1, 2, 4, ... processes, and reports processed samples per second and speedup over a single
+process.
+
+Usage:
+    python benchmarks/parallel_preview.py [--signals 64] [--channels 32] [--fs 500] [--seconds 60] [--chunk 1024]
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+
+from nfb_studio.engine import ParallelSimulator, SyntheticStream
+
+bands = [(4.0, 8.0), (8.0, 12.0), (12.0, 20.0), (20.0, 30.0)]
+
+
+def make_signals(count, channel_names):
+    """Envelopes of several bands over channel pairs. Every spatial and bandpass filter is used by several signals."""
+    signals = []
+
+    for i in range(count):
+        lower, upper = bands[i % len(bands)]
+        first = channel_names[(i // 8) % len(channel_names)]
+        second = channel_names[(i // 8 + 1) % len(channel_names)]
+
+        signals.append({
+            "sSignalName": "Signal{}".format(i + 1),
+            "SpatialFilterMatrix": "{}=1;{}=-1".format(first, second),
+            "fBandpassLowHz": lower,
+            "fBandpassHighHz": upper,
+            "sTemporalFilterType": "fir",
+            "fFFTWindowSize": 251.0,
+            "method": "Rectification",
+            "fSmoothingFactor": 0.9 + 0.01 * (i // len(bands) % 8),
+            "sTemporalSmootherType": "exp",
+        })
+
+    return signals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signals", type=int, default=64, help="number of derived signals")
+    parser.add_argument("--channels", type=int, default=32, help="number of channels")
+    parser.add_argument("--fs", type=float, default=500, help="sampling frequency in Hz")
+    parser.add_argument("--seconds", type=float, default=60, help="length of the data in seconds")
+    parser.add_argument("--chunk", type=int, default=1024, help="chunk size in samples")
+    parser.add_argument("--processes", type=int, nargs="+", help="process counts to test (default: 1, 2, 4, ...)")
+    args = parser.parse_args()
+
+    process_counts = args.processes
+    if process_counts is None:
+        process_counts = [1]
+        while process_counts[-1] * 2 <= multiprocessing.cpu_count():
+            process_counts.append(process_counts[-1] * 2)
+
+    stream = SyntheticStream(channel_count=args.channels, fs=args.fs)
+    data = stream.read(int(args.fs * args.seconds))
+    signals = make_signals(args.signals, stream.channel_names)
+
+    print("{} derived signals, {} samples x {} channels, chunks of {}".format(
+        args.signals, len(data), args.channels, args.chunk
+    ))
+    print("{:>10} {:>16} {:>12} {:>10}".format("processes", "samples/s", "x realtime", "speedup"))
+
+    baseline = None
+    for processes in process_counts:
+        with ParallelSimulator(signals, args.fs, stream.channel_names, processes, args.chunk) as sim:
+            start = time.perf_counter()
+            for i in range(0, len(data), args.chunk):
+                sim.process(data[i:i + args.chunk])
+            elapsed = time.perf_counter() - start
+
+        throughput = len(data) / elapsed
+        baseline = baseline or throughput
+        print("{:>10} {:>16,.0f} {:>12,.1f} {:>10.2f}".format(
+            processes, throughput, throughput / args.fs, throughput / baseline
+        ))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Benchmark of loading a large signal scheme.
+
+Builds a scheme of chains LSLInput -> SpatialFilter -> BandpassFilter (three nodes and two edges per chain) and
+measures the time it takes to add it into a Scheme item by item with a live BSP index, and inside Scheme.bulkLoad().
+
+Usage:
+    python benchmarks/scheme_load.py [--nodes 3000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide2.QtWidgets import QApplication
+
+from nfb_studio.scheme import Scheme
+from nfb_studio.signal_nodes import LSLInput, SpatialFilter, BandpassFilter
+
+
+def make_items(node_count):
+    """Create nodes for `node_count // 3` chains and return a list of chains (lists of three nodes)."""
+    chains = []
+
+    for i in range(node_count // 3):
+        chain = [LSLInput(), SpatialFilter(), BandpassFilter()]
+
+        for j, node in enumerate(chain):
+            node.setPos(j * 250, i * 250)
+
+        chains.append(chain)
+
+    return chains
+
+
+def load(chains, bulk: bool):
+    """Add chains into a new scheme. Return the scheme and the time it took in seconds."""
+    scheme = Scheme()
+    start = time.perf_counter()
+
+    if bulk:
+        scheme.beginBulkLoad()
+
+    for chain in chains:
+        for node in chain:
+            scheme.addItem(node)
+
+        scheme.connect_nodes(chain[0].outputs[0], chain[1].inputs[0])
+        scheme.connect_nodes(chain[1].outputs[0], chain[2].inputs[0])
+
+    if bulk:
+        scheme.endBulkLoad()
+
+    scheme.sceneRect()  # Make sure the scene rect is computed in both cases
+    QApplication.processEvents()
+
+    return scheme, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=3000, help="number of nodes in the scheme")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs for each mode; best time is reported")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    for bulk in (False, True):
+        best = None
+        stats = None
+
+        for _ in range(args.repeat):
+            chains = make_items(args.nodes)
+            scheme, elapsed = load(chains, bulk)
+
+            if best is None or elapsed < best:
+                best = elapsed
+                stats = scheme.indexStatistics()
+
+        print("{:<12} {:8.3f} s  ({:.0f} nodes/s)".format(
+            "bulk" if bulk else "incremental", best, stats["nodes"] / best
+        ))
+        print("  index: {}".format(stats))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Throughput benchmark of signal schemes on a synthetic stream.
+
+Feeds a SyntheticStream (the stand-in for the "LSL generator" inlet) to the offline engine, which computes a number
+of alpha-band derived signals over it, and reports sustained samples per second. With --realtime, chunks arrive at
+the stream's sampling rate like they would from an amplifier. A chunk that arrives while the engine is still more
+than --buffer seconds behind is dropped, like samples lost by an overflowing LSL inlet. Dropped chunks are counted.
+
+With --lsl NAME, the stream is instead published as an LSL outlet (requires pylsl) in real time. An experiment
+exported from NFB Studio with an "LSL stream" inlet named NAME can then be run in NFB Lab against it.
+
+Usage:
+    python benchmarks/synthetic_stream.py [--channels 32] [--fs 500] [--signals 8] [--chunk 32] [--realtime]
+    python benchmarks/synthetic_stream.py --lsl NVX136_Data [--channels 32] [--fs 500]
+"""
+import argparse
+import sys
+import time
+
+from nfb_studio.engine import Simulator, SyntheticStream
+
+
+def make_signals(count, channel_names):
+    """Alpha envelope signals over neighbouring channel pairs."""
+    signals = []
+
+    for i in range(count):
+        first = channel_names[i % len(channel_names)]
+        second = channel_names[(i + 1) % len(channel_names)]
+
+        signals.append({
+            "sSignalName": "Alpha{}".format(i + 1),
+            "SpatialFilterMatrix": "{}=1;{}=-1".format(first, second),
+            "fBandpassLowHz": 8.0,
+            "fBandpassHighHz": 12.0,
+            "sTemporalFilterType": "butter",
+            "fTemporalFilterButterOrder": 2,
+            "method": "Rectification",
+            "fSmoothingFactor": 0.97,
+            "sTemporalSmootherType": "exp",
+        })
+
+    return signals
+
+
+def run_engine(simulator, stream, chunk_size, seconds, realtime, buffer):
+    """Process `seconds` of the stream. Returns (processed samples, dropped chunks, elapsed seconds)."""
+    count = int(seconds * stream.fs / chunk_size)
+    processed = 0
+    dropped = 0
+
+    start = time.perf_counter()
+
+    for i, chunk in enumerate(stream.chunks(chunk_size, count)):
+        if realtime:
+            arrival = start + (i + 1) * chunk_size / stream.fs
+            now = time.perf_counter()
+
+            if now < arrival:
+                time.sleep(arrival - now)
+            elif now - arrival > buffer:
+                dropped += 1
+                continue
+
+        simulator.process(chunk)
+        processed += len(chunk)
+
+    return processed, dropped, time.perf_counter() - start
+
+
+def publish_lsl(stream, name, chunk_size):
+    """Push the stream to an LSL outlet in real time, until interrupted."""
+    import pylsl
+
+    info = pylsl.StreamInfo(name, "EEG", stream.channel_count, stream.fs, "float32", "nfb-studio-synthetic")
+    channels = info.desc().append_child("channels")
+    for channel_name in stream.channel_names:
+        channels.append_child("channel").append_child_value("label", channel_name)
+
+    outlet = pylsl.StreamOutlet(info, chunk_size)
+    print("Publishing \"{}\": {} channels at {} Hz. Press Ctrl+C to stop.".format(
+        name, stream.channel_count, stream.fs
+    ))
+
+    start = time.perf_counter()
+    try:
+        for i, chunk in enumerate(stream.chunks(chunk_size)):
+            delay = start + i * chunk_size / stream.fs - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            outlet.push_chunk(chunk.tolist())
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", type=int, default=32, help="number of channels")
+    parser.add_argument("--fs", type=float, default=500, help="sampling frequency in Hz")
+    parser.add_argument("--signals", type=int, default=8, help="number of derived signals")
+    parser.add_argument("--chunk", type=int, default=32, help="chunk size in samples")
+    parser.add_argument("--seconds", type=float, default=60, help="length of the stream in seconds")
+    parser.add_argument("--realtime", action="store_true", help="deliver chunks at the sampling rate")
+    parser.add_argument("--buffer", type=float, default=1.0, help="seconds of lag after which chunks are dropped")
+    parser.add_argument("--lsl", metavar="NAME", help="publish the stream as an LSL outlet instead")
+    args = parser.parse_args()
+
+    stream = SyntheticStream(channel_count=args.channels, fs=args.fs)
+
+    if args.lsl is not None:
+        publish_lsl(stream, args.lsl, args.chunk)
+        return 0
+
+    simulator = Simulator(make_signals(args.signals, stream.channel_names), args.fs, stream.channel_names)
+    processed, dropped, elapsed = run_engine(simulator, stream, args.chunk, args.seconds, args.realtime, args.buffer)
+
+    throughput = processed / elapsed
+    print("{} channels at {:g} Hz, {} derived signals, chunks of {}".format(
+        args.channels, args.fs, args.signals, args.chunk
+    ))
+    print("{:<24} {:>14,.0f}".format("samples/s", throughput))
+    print("{:<24} {:>14,.1f}".format("x realtime", throughput / args.fs))
+    print("{:<24} {:>14,}".format("dropped chunks", dropped))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
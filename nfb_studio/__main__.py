@@ -1,18 +1,26 @@
 """Startup script for nfb_studio."""
 import sys
+import logging
 import platform
 import multiprocessing
 from PySide2.QtGui import QIcon
 from PySide2.QtWidgets import QApplication, QStyleFactory
 
 from nfb_studio.experiment_view import ExperimentView
+from nfb_studio.runner import WarmRunner
 import nfb_studio as package
 # Note: When using relative import in __main__.py, frozen executable fails to start with error:
 # ImportError: attempted relative import with no known parent package
 
 def main():
     multiprocessing.freeze_support()
-    app = QApplication(sys.argv)
+
+    # With --debug, timings such as how long a file took to open are logged and shown in the status bar
+    debug = "--debug" in sys.argv[1:]
+    args = [arg for arg in sys.argv if arg != "--debug"]
+    logging.basicConfig(level=logging.DEBUG if debug else logging.WARNING)
+
+    app = QApplication(args)
     app.setApplicationName("nfb-studio")
     app.setApplicationDisplayName("NFB Studio")
     app.setStyle(QStyleFactory.create("fusion"))
@@ -30,9 +38,12 @@ def main():
     main_window = ExperimentView()
     main_window.show()
 
+    # Import pynfb in a worker process ahead of time, so that experiments start without delay
+    WarmRunner.instance().start()
+
     # If a file was passed as a command-line argument, load it
-    if len(sys.argv) > 1:
-        main_window.fileOpen(sys.argv[1])
+    if len(args) > 1:
+        main_window.fileOpen(args[1])
 
     return app.exec_()
 
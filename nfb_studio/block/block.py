@@ -1,10 +1,13 @@
 """NFB Experiment block."""
 from PySide2.QtCore import QObject
 
+from nfb_studio.util import ExportCacheMixin
 
-class Block(QObject):
+
+class Block(ExportCacheMixin, QObject):
     """A single step of an experiment.
     Experiment consists of a sequence of blocks and block groups that are executed in some order.
+    Changing an attribute invalidates `export_cache`, the block's encoded XML fragment.
     """
     random_bound_types = ["SimCircle", "RandomCircle", "Bar"]
 
@@ -7,6 +7,8 @@ from PySide2.QtWidgets import (
 class BlockView(QWidget):
     """Config widget for a single experiment block.  
     In a model-view paradigm, this is a view, and block is a model. A new block can be set using setModel.
+    One view can be reused for many blocks. The view remembers if the user changed it since the model was set or last
+    updated (see `isModified`), so that unchanged views do not need to be copied to their models.
     """
     statistics_type_to_name = {
         "max": "Min/Max",
@@ -20,6 +22,9 @@ class BlockView(QWidget):
         self.setLayout(layout)
 
         self._model = None
+        self._modified = False
+        self._updating = False
+        """True while the view is updated from the model, when changes are not made by the user."""
 
         # Block properties ---------------------------------------------------------------------------------------------
         self.duration = QWidget()
@@ -109,6 +114,21 @@ class BlockView(QWidget):
         layout.addRow(mock_signal_groupbox)
         layout.addRow(after_block_groupbox)
 
+        # Tracking changes ---------------------------------------------------------------------------------------------
+        for spinbox in (self.duration_base, self.duration_deviation, self.mock_previous):
+            spinbox.valueChanged.connect(self._onEdited)
+        for line_edit in (
+            self.feedback_source, self.mock_signal_path, self.mock_signal_dataset, self.video_path, self.message
+        ):
+            line_edit.textChanged.connect(self._onEdited)
+        for combobox in (self.feedback_type, self.statistics_type, self.random_bound):
+            combobox.currentIndexChanged.connect(self._onEdited)
+        for checkbox in (
+            self.mock_previous_reverse, self.mock_previous_random, self.pause, self.beep,
+            self.start_data_driven_filter_designer, self.update_statistics, self.voiceover
+        ):
+            checkbox.stateChanged.connect(self._onEdited)
+
     def model(self):
         return self._model
 
@@ -118,7 +138,11 @@ class BlockView(QWidget):
         """
         self._model = block
         self.updateView()
-    
+
+    def isModified(self) -> bool:
+        """Return True if the user changed the view since the model was set or last updated."""
+        return self._modified
+
     def updateModel(self):
         """Copy data from this view to the block model.
         A similarly named function in the block copies data the opposite way. Use one or the other depending on where
@@ -146,12 +170,15 @@ class BlockView(QWidget):
         model.beep = self.beep.isChecked()
         model.update_statistics = self.update_statistics.isChecked()
         model.statistics_type = self.statistics_name_to_type[self.statistics_type.currentText()]
+        self._modified = False
 
     def updateView(self):
         model = self.model()
+        self._modified = False
         if model is None:
             return
         
+        self._updating = True
         self.duration_base.setValue(model.duration)
         self.duration_deviation.setValue(model.duration_deviation)
         self.feedback_source.setText(model.feedback_source)
@@ -170,3 +197,8 @@ class BlockView(QWidget):
         self.video_path.setText(model.video_path)
         self.message.setText(model.message)
         self.voiceover.setChecked(model.voiceover)
+        self._updating = False
+
+    def _onEdited(self):
+        if not self._updating:
+            self._modified = True
@@ -0,0 +1,14 @@
+"""Offline execution engine for the signal scheme.
+The engine computes derived signals from recorded data with NumPy and SciPy, without NFB Lab and without a running Qt
+application. It works on signals in the NFB Lab export format (see `Experiment.nfb_export_data`).
+"""
+from .stages import Stage
+from .chain import SignalChain, Simulator, build_chain, parse_spatial_filter, stage_specs
+from .calibration import Welford, calibrate, calibrate_file
+from .expression import CompiledExpression, ExpressionError, compile_expression
+from .filter_design import FrequencyResponse, filter_coefficients, frequency_response
+from .latency import LatencyBudget, signal_latency
+from .recording import Recording, open_recording
+from .spatial import StackedSpatialFilter, compile_spatial_filters, compile_vector, parse_vector
+from .parallel import ParallelSimulator, StageTree, partition
+from .synthetic import SyntheticStream
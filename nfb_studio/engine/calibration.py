@@ -0,0 +1,114 @@
+"""Calibration of Standardise parameters from recorded data.
+
+A derived signal is standardised by subtracting its average and dividing by its standard deviation. Calibration runs
+the part of the signal's chain before the Standardise node over a recording, chunk by chunk, and accumulates the
+average and standard deviation of the result with Welford's streaming algorithm, so that memory use does not depend on
+the length of the recording. Several signals are calibrated in parallel processes.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .chain import build_chain
+from .recording import Recording, open_recording
+
+
+class Welford:
+    """Streaming average and variance of a sequence of values.
+    Values are added in chunks. Each chunk is summarised with vectorized operations and merged into the running
+    statistics (the parallel form of Welford's algorithm by Chan et al.), which is numerically stable for long
+    recordings.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        """Sum of squared differences from the mean."""
+
+    def update(self, values: np.ndarray):
+        """Add values to the statistics."""
+        values = np.ravel(values)
+        if len(values) == 0:
+            return
+
+        mean = values.mean()
+        self._merge(len(values), mean, np.sum((values - mean) ** 2))
+
+    def merge(self, other: "Welford"):
+        """Add statistics of another accumulator to this one."""
+        if other.count != 0:
+            self._merge(other.count, other.mean, other._m2)
+
+    def _merge(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+
+        self.mean += delta * count / total
+        self._m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+    def variance(self) -> float:
+        """Population variance of the values, or 0 if there are none."""
+        return self._m2 / self.count if self.count != 0 else 0.0
+
+    def std(self) -> float:
+        """Population standard deviation of the values."""
+        return float(np.sqrt(self.variance()))
+
+
+def calibrate(signal: dict, recording: Recording, chunk_size: int = 65536, discard: float = 0) -> Tuple[float, float]:
+    """Compute the average and standard deviation of a derived signal over a recording.
+    `signal` is a derived signal in the NFB Lab export format (see `build_chain`); its standardisation and artificial
+    delay are ignored. The first `discard` seconds of output are left out, to skip the transients of filters.
+    Returns (average, standard deviation).
+    """
+    signal = {key: value for key, value in signal.items() if key not in ("fAverage", "fStdDev", "iDelayMs")}
+
+    channel_names = recording.channel_names
+    if channel_names is None:
+        channel_names = ["Ch{}".format(i + 1) for i in range(recording.channel_count)]
+
+    chain = build_chain(signal, recording.fs, channel_names)
+    statistics = Welford()
+    skip = int(round(discard * recording.fs))
+
+    for chunk in recording.chunks(chunk_size):
+        result = chain.process(chunk)
+
+        if skip > 0:
+            skipped = min(skip, len(result))
+            result = result[skipped:]
+            skip -= skipped
+
+        statistics.update(np.real(result))
+
+    return float(statistics.mean), statistics.std()
+
+
+def calibrate_file(signals: Sequence[dict], path: str, fs: float = None, channel_names: Sequence[str] = None,
+                   chunk_size: int = 65536, discard: float = 0, processes: int = None) -> List[Tuple[float, float]]:
+    """Calibrate several derived signals over the recording at `path` (see `calibrate` and `open_recording`).
+    Signals are calibrated in up to `processes` parallel processes (by default, one per CPU core). Each process reads
+    the recording on its own, lazily. Returns a list of (average, standard deviation), one per signal.
+    """
+    signals = list(signals)
+    processes = min(len(signals), processes or os.cpu_count() or 1)
+    arguments = (path, fs, channel_names, chunk_size, discard)
+
+    if processes <= 1:
+        return [_calibrate_file(signal, *arguments) for signal in signals]
+
+    # Processes are spawned rather than forked, since this may be called from a thread of a running Qt application
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+        futures = [executor.submit(_calibrate_file, signal, *arguments) for signal in signals]
+        return [future.result() for future in futures]
+
+
+def _calibrate_file(signal, path, fs, channel_names, chunk_size, discard):
+    with open_recording(path, fs, channel_names) as recording:
+        return calibrate(signal, recording, chunk_size, discard)
@@ -0,0 +1,271 @@
+"""Signal chains and the offline simulator of an experiment's derived signals."""
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+from . import stages
+from .expression import compile_expression
+from .filter_design import filter_coefficients
+from .spatial import compile_spatial_filters, compile_vector
+
+
+class SignalChain:
+    """A sequence of stages that turns raw multichannel data into one derived signal."""
+
+    def __init__(self, stages_: Sequence[stages.Stage], name=None):
+        self.stages = list(stages_)
+        self.name = name
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Process a chunk of shape (samples, channels), carrying state from previous chunks."""
+        for stage in self.stages:
+            chunk = stage.process(chunk)
+
+        return chunk
+
+    def reset(self):
+        """Forget all state carried between chunks."""
+        for stage in self.stages:
+            stage.reset()
+
+    def run(self, data: np.ndarray, chunk_size: int = 1024) -> np.ndarray:
+        """Process all of `data` in chunks of `chunk_size` samples and return the concatenated result."""
+        outputs = [self.process(data[i:i + chunk_size]) for i in range(0, len(data), chunk_size)]
+
+        if len(outputs) == 0:
+            return self.process(data)
+        return np.concatenate(outputs)
+
+
+# Building chains from exported signals ================================================================================
+savgol_window = 151
+"""Window length of the Savitzky-Golay smoother, in samples."""
+
+savgol_polyorder = 2
+"""Polynomial order of the Savitzky-Golay smoother."""
+
+
+def parse_spatial_filter(vector: str, channel_names: Sequence[str]) -> np.ndarray:
+    """Parse a spatial filter in the "Fp1=1;Cz=-1" format into an array of weights, one per channel.
+    Channels that are not mentioned get weight 0. Raises ValueError if a channel is not in `channel_names`.
+    """
+    weights, unknown = compile_vector(vector, tuple(channel_names))
+
+    if unknown:
+        raise ValueError("unknown channel \"{}\" in spatial filter".format(unknown[0]))
+    return weights.copy()
+
+
+def build_chain(signal: dict, fs: float, channel_names: Sequence[str], spatial_filter=True) -> SignalChain:
+    """Build a SignalChain from a derived signal in the NFB Lab export format.
+    `signal` is a dict produced by the signal nodes' `add_nfb_export_data` (as in `Experiment.nfb_export_data`), or the
+    same dict decoded from an exported XML file. `fs` is the sampling frequency in Hz and `channel_names` are the names
+    of the recorded channels.
+
+    Stages follow the order of the signal scheme: spatial filter, bandpass filter, envelope detector, standardisation
+    and delay. If the spatial filter is empty, the chain averages all channels. If `spatial_filter` is False, the
+    spatial filter stage is left out and the chain expects already filtered data with one channel (see `Simulator`).
+    """
+    chain = []
+
+    # Spatial filter ---------------------------------------------------------------------------------------------------
+    if spatial_filter:
+        vector = signal.get("SpatialFilterMatrix")
+
+        if vector is not None and "=" in vector:
+            weights = parse_spatial_filter(vector, channel_names)
+        else:
+            weights, _ = compile_vector(vector, tuple(channel_names))
+
+        chain.append(stages.SpatialFilter(weights))
+
+    chain.extend(factory() for _, factory in stage_specs(signal, fs))
+
+    return SignalChain(chain, name=signal.get("sSignalName"))
+
+
+def stage_specs(signal: dict, fs: float) -> List[Tuple[tuple, Callable[[], stages.Stage]]]:
+    """Describe the stages of a derived signal after its spatial filter (see `build_chain`).
+    Returns a list of (key, factory) in chain order. The key is a hashable description of the stage and its
+    parameters: stages with equal keys process data in the same way. The factory creates a new stage.
+    """
+    specs = []
+
+    # Bandpass filter and envelope detector ----------------------------------------------------------------------------
+    lower = _float_or_none(signal.get("fBandpassLowHz"))
+    upper = _float_or_none(signal.get("fBandpassHighHz"))
+    filter_type = signal.get("sTemporalFilterType", "butter")
+    filter_length = int(float(signal.get("fFFTWindowSize", 1000)))
+    filter_order = int(float(signal.get("fTemporalFilterButterOrder", 2)))
+
+    has_envelope = "method" in signal or "fSmoothingFactor" in signal
+    method = signal.get("method", "Rectification")
+
+    if has_envelope and method != "Rectification":
+        # Complex demodulation selects the band and computes its envelope in one step
+        taps = stages.complex_bandpass(lower, upper, fs, filter_length)
+        specs.append((("cfir", lower, upper, fs, filter_length), lambda: stages.LFilter(taps)))
+        specs.append((("magnitude",), stages.Magnitude))
+    else:
+        coefficients = filter_coefficients(filter_type, lower, upper, fs, filter_order, filter_length)
+        key = ("bandpass", filter_type, lower, upper, fs, filter_order if filter_type == "butter" else filter_length)
+
+        if coefficients is None:
+            pass  # The filter passes everything
+        elif filter_type == "butter":
+            specs.append((key, lambda: stages.SOSFilter(coefficients)))
+        else:
+            specs.append((key, lambda: stages.LFilter(coefficients)))
+
+        if has_envelope:
+            specs.append((("magnitude",), stages.Magnitude))
+
+    if has_envelope:
+        smoother_type = signal.get("sTemporalSmootherType", "exp")
+        factor = float(signal.get("fSmoothingFactor", 0))
+
+        if smoother_type == "savgol":
+            taps = stages.savgol_smoother(savgol_window, savgol_polyorder)
+            specs.append((("savgol", savgol_window, savgol_polyorder), lambda: stages.LFilter(taps)))
+        elif factor != 0:
+            specs.append((("exp", factor), lambda: stages.LFilter(*stages.exponential_smoother(factor))))
+
+    # Standardise ------------------------------------------------------------------------------------------------------
+    if "fAverage" in signal or "fStdDev" in signal:
+        average = float(signal.get("fAverage", 0))
+        standard_deviation = float(signal.get("fStdDev", 1))
+        specs.append((
+            ("standardise", average, standard_deviation),
+            lambda: stages.Standardise(average, standard_deviation)
+        ))
+
+    # Artificial delay -------------------------------------------------------------------------------------------------
+    samples = int(round(float(signal.get("iDelayMs", 0)) * fs / 1000))
+    if samples != 0:
+        specs.append((("delay", samples), lambda: stages.Delay(samples)))
+
+    return specs
+
+
+def _float_or_none(value):
+    """Convert a value from exported data to float. None, "None" and "" become None."""
+    if value is None or value == "None" or value == "":
+        return None
+    return float(value)
+
+
+# Simulator ============================================================================================================
+class Simulator:
+    """Offline simulator of an experiment's derived and composite signals.
+    Runs every derived signal over recorded multichannel data, chunk by chunk, exactly as it would be computed when
+    samples arrive in real time. Spatial filters of all derived signals are stacked into one matrix and applied with one
+    matrix multiplication per chunk. Composite signals are evaluated from the derived signals of the same chunk. Does
+    not require a running Qt application.
+
+    Example:
+    ```python
+    sim = Simulator(experiment.nfb_export_data()["vSignals"]["DerivedSignal"], fs=500, channel_names=names)
+    result = sim.run(data)  # data has shape (samples, channels)
+    result["Alpha"]  # Array of shape (samples,)
+    ```
+    """
+    def __init__(self, signals: List[dict], fs: float, channel_names: Sequence[str], chunk_size: int = 1024,
+                 composite_signals: List[dict] = ()):
+        self.fs = fs
+        self.channel_names = list(channel_names)
+        self.chunk_size = chunk_size
+        self.chains = {}
+        """Signal chains, by signal name."""
+        self.composites = {}
+        """Compiled composite signal expressions, by signal name."""
+
+        self.spatial_filters = compile_spatial_filters(
+            [signal.get("SpatialFilterMatrix") for signal in signals], self.channel_names
+        )
+        """Spatial filters of all derived signals, stacked in the order of `signals`."""
+
+        for signal, unknown in zip(signals, self.spatial_filters.unknown):
+            if unknown:
+                raise ValueError("spatial filter of \"{}\" uses unknown channel(s): {}".format(
+                    signal.get("sSignalName"), ", ".join(unknown)
+                ))
+
+        self._columns = {}  # Column of `spatial_filters` for each chain, by signal name
+        for i, signal in enumerate(signals):
+            chain = build_chain(signal, fs, self.channel_names, spatial_filter=False)
+            if chain.name in self.chains:
+                raise ValueError("duplicate derived signal name \"{}\"".format(chain.name))
+
+            self.chains[chain.name] = chain
+            self._columns[chain.name] = i
+
+        for signal in composite_signals:
+            compiled = compile_expression(signal["sExpression"])
+
+            if signal["sSignalName"] in self.chains or signal["sSignalName"] in self.composites:
+                raise ValueError("duplicate composite signal name \"{}\"".format(signal["sSignalName"]))
+
+            unknown = compiled.unknown_names(self.chains.keys())
+            if unknown:
+                raise ValueError("composite signal \"{}\" uses unknown signal(s): {}".format(
+                    signal["sSignalName"], ", ".join(sorted(unknown))
+                ))
+
+            self.composites[signal["sSignalName"]] = compiled
+
+    @classmethod
+    def from_experiment(cls, experiment, fs: float, channel_names: Sequence[str], **kw):
+        """Create a simulator for all derived and composite signals of an Experiment."""
+        signals = experiment.nfb_export_data()["vSignals"]
+        return cls(signals["DerivedSignal"], fs, channel_names, composite_signals=signals["CompositeSignal"], **kw)
+
+    def reset(self):
+        for chain in self.chains.values():
+            chain.reset()
+
+    def process(self, chunk: np.ndarray) -> dict:
+        """Process one chunk of shape (samples, channels).
+        Returns a dict of signal name to array of shape (samples,).
+        """
+        filtered = self.spatial_filters.apply(self._validate(chunk))
+        result = {
+            name: chain.process(filtered[:, [self._columns[name]]])[:, 0] for name, chain in self.chains.items()
+        }
+
+        return self._add_composites(result)
+
+    def run(self, data: np.ndarray) -> dict:
+        """Process all of `data` in chunks. Returns a dict of signal name to array of shape (samples,).
+        Only one chunk of `data` is converted and spatially filtered at a time, so `data` may be a memory-mapped
+        recording that does not fit in memory.
+        """
+        if len(data) == 0:
+            return self.process(data)
+
+        outputs = {name: [] for name in self.chains}
+
+        for i in range(0, len(data), self.chunk_size):
+            filtered = self.spatial_filters.apply(self._validate(data[i:i + self.chunk_size]))
+
+            for name, chain in self.chains.items():
+                outputs[name].append(chain.process(filtered[:, [self._columns[name]]])[:, 0])
+
+        return self._add_composites({name: np.concatenate(arrays) for name, arrays in outputs.items()})
+
+    def _add_composites(self, derived: dict) -> dict:
+        """Evaluate composite signals over derived signal outputs and add them to the result."""
+        result = dict(derived)
+
+        for name, compiled in self.composites.items():
+            result[name] = compiled.evaluate(derived)
+
+        return result
+
+    def _validate(self, data):
+        data = np.asarray(data, dtype=float)
+
+        if data.ndim != 2 or data.shape[1] != len(self.channel_names):
+            raise ValueError(
+                "data must have shape (samples, {}), got {}".format(len(self.channel_names), data.shape)
+            )
+        return data
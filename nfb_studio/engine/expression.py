@@ -0,0 +1,141 @@
+"""Compiler of composite signal expressions.
+
+A composite signal is an arithmetic expression over derived signal names, such as "Alpha / (Beta + Theta)". The
+expression is parsed once into a Python AST, checked against a whitelist of operations, and compiled into a function
+that evaluates it over whole NumPy arrays. Compiled expressions are cached by their source string.
+"""
+import ast
+from functools import lru_cache
+from typing import Mapping, FrozenSet
+
+import numpy as np
+
+functions = {
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "sign": np.sign,
+    "floor": np.floor,
+    "ceil": np.ceil,
+    "min": np.minimum,
+    "max": np.maximum,
+}
+"""Functions that can be called in an expression."""
+
+constants = {
+    "pi": np.pi,
+    "e": np.e,
+}
+"""Named constants that can be used in an expression. Signals with these names are shadowed by them."""
+
+_binary_operators = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod)
+_unary_operators = (ast.UAdd, ast.USub)
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression can not be compiled."""
+
+
+class CompiledExpression:
+    """A composite signal expression, compiled for evaluation over NumPy arrays.
+    Do not create this class directly, use `compile_expression`.
+    """
+    def __init__(self, source: str, code, names: FrozenSet[str]):
+        self.source = source
+        self._code = code
+        self.names = names
+        """Names of signals that the expression uses."""
+
+    def unknown_names(self, known) -> FrozenSet[str]:
+        """Return names used in the expression that are not in `known`."""
+        return self.names - frozenset(known)
+
+    def evaluate(self, signals: Mapping[str, np.ndarray]) -> np.ndarray:
+        """Evaluate the expression. `signals` maps signal names to arrays (or scalars) of the same shape.
+        Raises ExpressionError if a signal is missing.
+        """
+        missing = self.unknown_names(signals.keys())
+        if missing:
+            raise ExpressionError("unknown signal name(s): " + ", ".join(sorted(missing)))
+
+        namespace = {name: signals[name] for name in self.names}
+        namespace.update(functions)
+        namespace.update(constants)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.asarray(eval(self._code, {"__builtins__": {}}, namespace), dtype=float)
+
+    def __repr__(self):
+        return "CompiledExpression({!r})".format(self.source)
+
+
+class _Validator(ast.NodeTransformer):
+    """Check that an AST contains only allowed operations, and collect signal names."""
+    def __init__(self):
+        self.names = set()
+
+    def generic_visit(self, node):
+        raise ExpressionError("\"{}\" is not allowed in an expression".format(type(node).__name__))
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _binary_operators):
+            raise ExpressionError("operator \"{}\" is not allowed in an expression".format(type(node.op).__name__))
+
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, _unary_operators):
+            raise ExpressionError("operator \"{}\" is not allowed in an expression".format(type(node.op).__name__))
+
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Constant(self, node):
+        if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+            raise ExpressionError("constant {!r} is not allowed in an expression".format(node.value))
+        return node
+
+    def visit_Name(self, node):
+        if node.id in functions:
+            raise ExpressionError("function \"{}\" must be called".format(node.id))
+        if node.id not in constants:
+            self.names.add(node.id)
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name):
+            raise ExpressionError("only functions can be called in an expression")
+        if node.func.id not in functions:
+            raise ExpressionError("unknown function \"{}\"".format(node.func.id))
+        if node.keywords:
+            raise ExpressionError("keyword arguments are not allowed in an expression")
+
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression: str) -> CompiledExpression:
+    """Compile a composite signal expression. Results are cached by the expression string.
+    Raises ExpressionError if the expression is not valid. `^` means exponentiation, like in sympy expressions.
+    """
+    try:
+        tree = ast.parse(expression.strip().replace("^", "**"), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError("invalid expression: {}".format(e.msg)) from None
+
+    validator = _Validator()
+    tree = ast.fix_missing_locations(validator.visit(tree))
+
+    return CompiledExpression(expression, compile(tree, "<expression>", "eval"), frozenset(validator.names))
@@ -0,0 +1,67 @@
+"""Cached design of bandpass filters and their frequency responses.
+
+Filter coefficients and frequency responses are cached by the parameter tuple, so that stepping through values in the
+config widget, or building many chains with the same filter, designs each filter only once. Returned arrays are
+read-only, since they are shared between callers.
+"""
+from functools import lru_cache
+
+import numpy as np
+import scipy.signal
+
+from . import stages
+
+
+class FrequencyResponse:
+    """Frequency response of a filter.
+    Do not create this class directly, use `frequency_response`.
+    """
+    def __init__(self, frequencies: np.ndarray, magnitude: np.ndarray, phase: np.ndarray):
+        self.frequencies = frequencies
+        """Frequencies in Hz, from 0 to the Nyquist frequency."""
+        self.magnitude = magnitude
+        """Gain at each frequency in dB."""
+        self.phase = phase
+        """Unwrapped phase at each frequency in radians."""
+
+
+@lru_cache(maxsize=256)
+def filter_coefficients(filter_type: str, lower, upper, fs: float, order: int, length: int):
+    """Design a bandpass filter with the parameters of a BandpassFilter node.
+    For a "butter" filter, returns second-order sections. For other filter types, returns FIR taps of length `length`.
+    Returns None if neither band edge limits the band, meaning the filter passes everything. Raises ValueError if the
+    band is invalid. Results are cached by arguments.
+    """
+    if filter_type == "butter":
+        coefficients = stages.butter_bandpass(lower, upper, fs, order)
+    else:
+        coefficients = stages.fir_bandpass(lower, upper, fs, length)
+
+    if coefficients is not None:
+        coefficients.setflags(write=False)
+    return coefficients
+
+
+@lru_cache(maxsize=256)
+def frequency_response(filter_type: str, lower, upper, fs: float, order: int, length: int, points: int = 512):
+    """Compute the frequency response of a filter designed by `filter_coefficients` at `points` frequencies.
+    Results are cached by arguments. Raises ValueError if the band is invalid.
+    """
+    coefficients = filter_coefficients(filter_type, lower, upper, fs, order, length)
+
+    if coefficients is None:
+        frequencies = np.linspace(0, fs / 2, points, endpoint=False)
+        h = np.ones(points, dtype=complex)
+    elif filter_type == "butter":
+        frequencies, h = scipy.signal.sosfreqz(coefficients, worN=points, fs=fs)
+    else:
+        frequencies, h = scipy.signal.freqz(coefficients, worN=points, fs=fs)
+
+    with np.errstate(divide="ignore"):
+        magnitude = 20 * np.log10(np.abs(h))
+    phase = np.unwrap(np.angle(h))
+
+    for array in (frequencies, magnitude, phase):
+        array.setflags(write=False)
+
+    return FrequencyResponse(frequencies, magnitude, phase)
@@ -0,0 +1,112 @@
+"""Analytic latency of derived signals.
+
+The latency of a derived signal is the delay between an event in the raw data and its appearance in the signal. It is
+computed from the signal's parameters, without running the chain: the group delay of the bandpass filter in its
+passband, the group delay of the envelope smoother at low frequencies, and the artificial delay. Spatial filters and
+standardisation do not delay the signal. Each stage's latency is cached by the parameters of that stage, so changing one
+node recomputes only that node's stage.
+"""
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+import scipy.signal
+
+from . import stages
+from .chain import savgol_window, savgol_polyorder, _float_or_none
+from .filter_design import filter_coefficients
+
+
+class LatencyBudget:
+    """Latency of a derived signal, split by processing stage.
+    Do not create this class directly, use `signal_latency`.
+    """
+    def __init__(self, stages_: List[Tuple[str, float]]):
+        self.stages = stages_
+        """List of (stage name, latency in ms). Stages that do not delay the signal are not listed."""
+
+    def total(self) -> float:
+        """Total latency in ms."""
+        return sum(ms for _, ms in self.stages)
+
+    def __str__(self):
+        if not self.stages:
+            return "Latency: 0 ms"
+
+        return "Latency: {:.0f} ms ({})".format(
+            self.total(), ", ".join("{} {:.0f}".format(name, ms) for name, ms in self.stages)
+        )
+
+
+def signal_latency(signal: dict, fs: float) -> LatencyBudget:
+    """Compute the latency of a derived signal in the NFB Lab export format, sampled at `fs` Hz.
+    The signal's stages are interpreted like in `build_chain`. Raises ValueError if the bandpass filter is invalid.
+    """
+    result = []
+
+    lower = _float_or_none(signal.get("fBandpassLowHz"))
+    upper = _float_or_none(signal.get("fBandpassHighHz"))
+    filter_type = signal.get("sTemporalFilterType", "butter")
+    filter_length = int(float(signal.get("fFFTWindowSize", 1000)))
+    filter_order = int(float(signal.get("fTemporalFilterButterOrder", 2)))
+
+    has_envelope = "method" in signal or "fSmoothingFactor" in signal
+    method = signal.get("method", "Rectification")
+
+    if has_envelope and method != "Rectification":
+        # Complex demodulation: a linear-phase lowpass filter, shifted in frequency
+        result.append(("filter", (filter_length - 1) / 2 / fs * 1000))
+    else:
+        ms = filter_latency(filter_type, lower, upper, fs, filter_order, filter_length)
+        if ms != 0:
+            result.append(("filter", ms))
+
+    if has_envelope:
+        ms = smoother_latency(signal.get("sTemporalSmootherType", "exp"), float(signal.get("fSmoothingFactor", 0)), fs)
+        if ms != 0:
+            result.append(("smoother", ms))
+
+    delay_ms = float(signal.get("iDelayMs", 0))
+    if delay_ms != 0:
+        result.append(("delay", delay_ms))
+
+    return LatencyBudget(result)
+
+
+@lru_cache(maxsize=256)
+def filter_latency(filter_type: str, lower, upper, fs: float, order: int, length: int) -> float:
+    """Group delay in ms of a bandpass filter at the center of its passband. Results are cached by arguments."""
+    coefficients = filter_coefficients(filter_type, lower, upper, fs, order, length)
+
+    if coefficients is None:
+        return 0.0
+
+    if filter_type != "butter":
+        return (len(coefficients) - 1) / 2 / fs * 1000  # Linear-phase FIR filter
+
+    band, btype = stages._band(lower, upper, fs)
+    if btype == "bandpass":
+        center = (band[0] + band[1]) / 2
+    elif btype == "lowpass":
+        center = band / 2
+    else:
+        center = (band + fs / 2) / 2
+
+    b, a = scipy.signal.sos2tf(coefficients)
+    _, delay = scipy.signal.group_delay((b, a), w=[center], fs=fs)
+
+    return float(delay[0]) / fs * 1000
+
+
+@lru_cache(maxsize=256)
+def smoother_latency(smoother_type: str, factor: float, fs: float) -> float:
+    """Group delay in ms of an envelope smoother at low frequencies. Results are cached by arguments."""
+    if smoother_type == "savgol":
+        taps = stages.savgol_smoother(savgol_window, savgol_polyorder)
+        samples = np.sum(np.arange(len(taps)) * taps) / np.sum(taps)  # Close to 0: it estimates the newest sample
+    elif 0 < factor < 1:
+        samples = factor / (1 - factor)  # Group delay of y[n] = factor*y[n-1] + (1 - factor)*x[n] at 0 Hz
+    else:
+        samples = 0
+
+    return round(float(samples) / fs * 1000, 6)  # Rounded to hide floating-point noise
@@ -0,0 +1,373 @@
+"""Parallel simulator of many derived signals.
+
+Derived signals of one scheme often share parts of their chains: several signals may use the same spatial filter, or
+the same spatial and bandpass filters with different envelope smoothers. `StageTree` merges the chains of several
+signals into a tree, in which stages that are shared by chains (equal stages with equal parameters, preceded by equal
+stages) are computed once.
+
+`ParallelSimulator` splits the tree between worker processes. Every chunk of input is multiplied by the stacked
+spatial filters once, in the main process, and written to a shared memory block. Workers read their columns of it
+without copying, run their part of the tree and write derived signals to another shared memory block, from which the
+results are returned without copying. Since stages keep state between chunks, each part of the tree always stays in
+the same worker.
+"""
+import multiprocessing
+import traceback
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from . import stages
+from .chain import stage_specs
+from .expression import compile_expression
+from .spatial import compile_spatial_filters
+
+
+class StageTree:
+    """Stages of several chains, merged so that shared prefixes of the chains are computed once.
+    Every chain starts at a column of the input (a spatially filtered signal) and ends at an output.
+    """
+    class _Node:
+        def __init__(self, stage):
+            self.stage = stage
+            self.children = {}
+            """Child nodes by stage key."""
+            self.outputs = []
+            """Outputs of chains that end at this node."""
+
+    def __init__(self):
+        self._roots = {}
+        """Root node for each input column."""
+        self.stage_count = 0
+        """Number of stages in the tree, after merging."""
+
+    def add(self, column: int, specs, output):
+        """Add a chain that processes input column `column` with stages described by `specs` (see `stage_specs`).
+        The result of the chain is returned by `process` under the key `output`.
+        """
+        if column not in self._roots:
+            self._roots[column] = self._Node(stages.Identity())
+        node = self._roots[column]
+
+        for key, factory in specs:
+            if key not in node.children:
+                node.children[key] = self._Node(factory())
+                self.stage_count += 1
+            node = node.children[key]
+
+        node.outputs.append(output)
+
+    def process(self, inputs: np.ndarray, results: dict = None) -> dict:
+        """Process a chunk of inputs of shape (samples, columns).
+        Returns a dict of output to array of shape (samples,). If `results` is given, arrays are written into it.
+        """
+        if results is None:
+            results = {}
+
+        for column, root in self._roots.items():
+            self._process(root, inputs[:, column:column + 1], results)
+
+        return results
+
+    def _process(self, node, chunk, results):
+        chunk = node.stage.process(chunk)
+
+        for output in node.outputs:
+            results[output] = chunk[:, 0]
+        for child in node.children.values():
+            self._process(child, chunk, results)
+
+    def reset(self):
+        for root in self._roots.values():
+            self._reset(root)
+
+    def _reset(self, node):
+        node.stage.reset()
+        for child in node.children.values():
+            self._reset(child)
+
+
+def partition(paths: Sequence[tuple], parts: int) -> List[List[int]]:
+    """Split chains into at most `parts` groups for parallel processing, keeping shared prefixes together.
+    `paths` are the chains as tuples of stage keys. Chains are grouped by their prefix of the shortest length that
+    gives at least `parts` groups, so only prefixes shorter than that are computed in more than one group. Groups are
+    then balanced by the number of chains. Returns lists of chain indices.
+    """
+    if not paths:
+        return []
+
+    max_depth = max(len(path) for path in paths)
+
+    for depth in range(1, max_depth + 1):
+        groups = {}
+        for i, path in enumerate(paths):
+            groups.setdefault(path[:depth], []).append(i)
+
+        if len(groups) >= parts:
+            break
+
+    parts = min(parts, len(groups))
+    bins = [[] for _ in range(parts)]
+
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(bins, key=len).extend(group)
+
+    return [sorted(b) for b in bins if b]
+
+
+class ParallelSimulator:
+    """Simulator of many derived signals that uses several processes.
+    Has the interface of `Simulator`. Arrays returned by `process` are views of shared memory that are only valid
+    until the next call; `run` returns copies. Call `close` (or use the simulator in a `with` block) to stop the
+    worker processes.
+
+    Example:
+    ```python
+    with ParallelSimulator(signals, fs=500, channel_names=names, processes=4) as sim:
+        result = sim.run(data)
+    ```
+    """
+    def __init__(self, signals: List[dict], fs: float, channel_names: Sequence[str], processes: int = None,
+                 chunk_size: int = 1024, composite_signals: List[dict] = ()):
+        self.fs = fs
+        self.channel_names = list(channel_names)
+        self.chunk_size = chunk_size
+        """Maximum number of samples processed at once. Longer chunks are split."""
+        self.names = [signal.get("sSignalName") for signal in signals]
+        """Names of derived signals, in output order."""
+
+        for i, name in enumerate(self.names):
+            if name in self.names[:i]:
+                raise ValueError("duplicate derived signal name \"{}\"".format(name))
+
+        # Spatial filters are computed in the main process, once for every distinct filter
+        vectors = [signal.get("SpatialFilterMatrix") for signal in signals]
+        distinct = list(dict.fromkeys(vectors))
+        self.spatial_filters = compile_spatial_filters(distinct, self.channel_names)
+
+        for vector, unknown in zip(distinct, self.spatial_filters.unknown):
+            if unknown:
+                raise ValueError("spatial filter \"{}\" uses unknown channel(s): {}".format(vector, ", ".join(unknown)))
+
+        columns = [distinct.index(vector) for vector in vectors]
+        paths = [
+            (("spatial", vector),) + tuple(key for key, _ in stage_specs(signal, fs))
+            for vector, signal in zip(vectors, signals)
+        ]
+
+        self.composites = {}
+        for signal in composite_signals:
+            if signal["sSignalName"] in self.names or signal["sSignalName"] in self.composites:
+                raise ValueError("duplicate composite signal name \"{}\"".format(signal["sSignalName"]))
+
+            compiled = compile_expression(signal["sExpression"])
+
+            unknown = compiled.unknown_names(self.names)
+            if unknown:
+                raise ValueError("composite signal \"{}\" uses unknown signal(s): {}".format(
+                    signal["sSignalName"], ", ".join(sorted(unknown))
+                ))
+            self.composites[signal["sSignalName"]] = compiled
+
+        # Shared memory for inputs (spatially filtered) and outputs (derived signals)
+        self._input_memory = SharedMemory(create=True, size=max(chunk_size * len(distinct), 1) * 8)
+        self._output_memory = SharedMemory(create=True, size=max(chunk_size * len(signals), 1) * 8)
+        self._inputs = np.ndarray((chunk_size, len(distinct)), dtype=float, buffer=self._input_memory.buf)
+        self._outputs = np.ndarray((chunk_size, len(signals)), dtype=float, buffer=self._output_memory.buf)
+
+        # Workers
+        self._connections = []
+        self._processes = []
+        self._tree = None
+
+        self._finalizer = weakref.finalize(
+            self, _shutdown, self._connections, self._processes, self._input_memory, self._output_memory
+        )
+
+        groups = partition(paths, processes or multiprocessing.cpu_count())
+
+        if len(groups) <= 1:
+            # One process: run the tree here
+            self._tree = StageTree()
+            for i, signal in enumerate(signals):
+                self._tree.add(columns[i], stage_specs(signal, fs), i)
+        else:
+            context = multiprocessing.get_context("spawn")
+
+            for group in groups:
+                connection, child_connection = context.Pipe()
+                process = context.Process(
+                    target=_worker,
+                    args=(
+                        child_connection, self._input_memory.name, self._inputs.shape, self._output_memory.name,
+                        self._outputs.shape, [(signals[i], columns[i], i) for i in group], fs
+                    ),
+                    daemon=True
+                )
+                process.start()
+
+                self._connections.append(connection)
+                self._processes.append(process)
+
+            try:
+                self._receiveAll()  # Wait until the workers are ready
+            except RuntimeError:
+                self.close()
+                raise
+
+    @property
+    def process_count(self) -> int:
+        """Number of worker processes, or 0 if signals are computed in the main process."""
+        return len(self._processes)
+
+    def process(self, chunk: np.ndarray) -> Dict[str, np.ndarray]:
+        """Process one chunk of shape (samples, channels) with at most `chunk_size` samples.
+        Returns a dict of signal name to array of shape (samples,). Arrays of derived signals are views of shared
+        memory, valid until the next call.
+        """
+        chunk = np.asarray(chunk, dtype=float)
+
+        if chunk.ndim != 2 or chunk.shape[1] != len(self.channel_names):
+            raise ValueError(
+                "data must have shape (samples, {}), got {}".format(len(self.channel_names), chunk.shape)
+            )
+        if len(chunk) > self.chunk_size:
+            raise ValueError("chunk has {} samples, more than chunk_size ({})".format(len(chunk), self.chunk_size))
+
+        n = len(chunk)
+        np.matmul(chunk, self.spatial_filters.matrix, out=self._inputs[:n])
+
+        if self._tree is not None:
+            for i, result in self._tree.process(self._inputs[:n]).items():
+                self._outputs[:n, i] = result
+        else:
+            for connection in self._connections:
+                connection.send(("process", n))
+            self._receiveAll()
+
+        result = {name: self._outputs[:n, i] for i, name in enumerate(self.names)}
+        for name, compiled in self.composites.items():
+            result[name] = compiled.evaluate(result)
+
+        return result
+
+    def run(self, data: np.ndarray) -> Dict[str, np.ndarray]:
+        """Process all of `data` in chunks. Returns a dict of signal name to array of shape (samples,)."""
+        outputs = {}
+
+        for i in range(0, len(data), self.chunk_size):
+            for name, result in self.process(data[i:i + self.chunk_size]).items():
+                outputs.setdefault(name, []).append(np.array(result))
+
+        return {name: np.concatenate(arrays) for name, arrays in outputs.items()}
+
+    def reset(self):
+        """Forget all state carried between chunks."""
+        if self._tree is not None:
+            self._tree.reset()
+
+        for connection in self._connections:
+            connection.send(("reset", None))
+        self._receiveAll()
+
+    def close(self):
+        """Stop worker processes and release shared memory."""
+        self._inputs = self._outputs = None  # Views must be released before shared memory is closed
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _receiveAll(self):
+        """Receive the reply of every worker to a command. If a worker failed, raises RuntimeError after all replies are
+        received, so that no reply is left to be mistaken for the reply to the next command.
+        """
+        errors = []
+
+        for connection in self._connections:
+            try:
+                self._receive(connection)
+            except RuntimeError as e:
+                errors.append(e)
+
+        if errors:
+            raise errors[0]
+
+    @staticmethod
+    def _receive(connection):
+        try:
+            status, message = connection.recv()
+        except EOFError:
+            raise RuntimeError("a worker process exited unexpectedly") from None
+
+        if status == "error":
+            raise RuntimeError("error in a worker process:\n" + message)
+
+
+def _worker(connection, input_name, input_shape, output_name, output_shape, chains, fs):
+    """Worker process of ParallelSimulator. `chains` is a list of (signal, input column, output column)."""
+    input_memory = SharedMemory(name=input_name)
+    output_memory = SharedMemory(name=output_name)
+    inputs = outputs = None
+
+    try:
+        inputs = np.ndarray(input_shape, dtype=float, buffer=input_memory.buf)
+        outputs = np.ndarray(output_shape, dtype=float, buffer=output_memory.buf)
+
+        tree = StageTree()
+        for signal, column, output in chains:
+            tree.add(column, stage_specs(signal, fs), output)
+
+        connection.send(("ready", None))
+
+        while True:
+            try:
+                command, argument = connection.recv()
+            except EOFError:
+                return  # The simulator is gone
+
+            try:
+                if command == "process":
+                    for output, result in tree.process(inputs[:argument]).items():
+                        outputs[:argument, output] = result
+                elif command == "reset":
+                    tree.reset()
+                else:
+                    break
+            except Exception:
+                connection.send(("error", traceback.format_exc()))
+            else:
+                connection.send(("done", None))
+    except Exception:
+        try:
+            connection.send(("error", traceback.format_exc()))
+        except OSError:
+            pass  # The simulator is gone
+    finally:
+        inputs = outputs = None  # Views must be released before shared memory is closed
+        input_memory.close()
+        output_memory.close()
+
+
+def _shutdown(connections, processes, input_memory, output_memory):
+    for connection in connections:
+        try:
+            connection.send(("stop", None))
+        except (BrokenPipeError, OSError):
+            pass
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+
+    for memory in (input_memory, output_memory):
+        try:
+            memory.close()
+        except BufferError:
+            pass  # Results returned by `process` are still referenced. The memory is freed when they are
+        memory.unlink()
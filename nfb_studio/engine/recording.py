@@ -0,0 +1,155 @@
+"""Reading recorded multichannel data.
+
+Recordings are read lazily: NumPy files are memory-mapped and HDF5 datasets are sliced on demand, so opening a
+recording does not read its samples, and iterating over it in chunks keeps memory use bounded by the chunk size.
+Supported formats:
+
+- `.npy` - an array of shape (samples, channels). The file has no metadata, so the sampling frequency (and channel
+  names, if needed) must be given by the caller.
+- `.h5`, `.hdf5` - an NFB Lab results file (datasets "fs", "channels" and "protocolN/raw_data", which are read as one
+  recording in protocol order), or a file with a 2D dataset named "raw_data" or "data". Requires h5py.
+- `.xdf` - the EEG stream of an XDF file (or the stream with most channels). Requires pyxdf. XDF files can not be
+  memory-mapped, so the stream is loaded into memory.
+"""
+import os
+from typing import Iterator, Sequence
+
+import numpy as np
+
+
+class Recording:
+    """Recorded multichannel data, read lazily.
+    Do not create this class directly, use `open_recording`.
+    """
+    def __init__(self, segments: Sequence, fs: float, channel_names=None, path=None, file=None):
+        self.segments = list(segments)
+        """Array-like parts of the recording, each of shape (samples, channels), in order."""
+        self.fs = fs
+        """Sampling frequency in Hz."""
+        self.channel_names = list(channel_names) if channel_names is not None else None
+        """Names of the channels, or None if the recording does not have them."""
+        self.path = path
+        self._file = file
+
+    def __len__(self):
+        return sum(len(segment) for segment in self.segments)
+
+    @property
+    def channel_count(self) -> int:
+        return self.segments[0].shape[1] if self.segments else 0
+
+    def chunks(self, chunk_size: int = 65536) -> Iterator[np.ndarray]:
+        """Iterate over the recording in chunks of at most `chunk_size` samples, each of shape (samples, channels).
+        Only one chunk is in memory at a time.
+        """
+        for segment in self.segments:
+            for i in range(0, len(segment), chunk_size):
+                yield np.asarray(segment[i:i + chunk_size], dtype=float)
+
+    def close(self):
+        """Close the underlying file, if any. Segments are released, so that memory-mapped files are unmapped once
+        nothing else refers to them.
+        """
+        self.segments = []
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def open_recording(path: str, fs: float = None, channel_names: Sequence[str] = None) -> Recording:
+    """Open a recording without reading its samples. The format is chosen by the file extension.
+    `fs` and `channel_names` are used if the file does not store them. Raises ValueError if the file format is not
+    supported or the sampling frequency is not known.
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".npy":
+        recording = _open_npy(path)
+    elif extension in (".h5", ".hdf5"):
+        recording = _open_hdf5(path)
+    elif extension == ".xdf":
+        recording = _open_xdf(path)
+    else:
+        raise ValueError("unsupported recording format \"{}\"".format(extension))
+
+    if recording.fs is None:
+        recording.fs = fs
+    if recording.channel_names is None and channel_names is not None:
+        recording.channel_names = list(channel_names)
+
+    if recording.fs is None:
+        recording.close()
+        raise ValueError("sampling frequency of \"{}\" is not known".format(path))
+    if recording.channel_names is not None and len(recording.channel_names) != recording.channel_count:
+        recording.close()
+        raise ValueError("recording has {} channels, but {} channel names".format(
+            recording.channel_count, len(recording.channel_names)
+        ))
+
+    return recording
+
+
+def _open_npy(path) -> Recording:
+    data = np.load(path, mmap_mode="r")
+
+    if data.ndim != 2:
+        raise ValueError("recording must have shape (samples, channels), got {}".format(data.shape))
+    return Recording([data], None, path=path)
+
+
+def _open_hdf5(path) -> Recording:
+    import h5py
+
+    file = h5py.File(path, "r")
+
+    fs = float(file["fs"][()]) if "fs" in file else None
+    channel_names = None
+    if "channels" in file:
+        channel_names = [name.decode() if isinstance(name, bytes) else str(name) for name in file["channels"][:]]
+
+    protocols = sorted(
+        (key for key in file.keys() if key.startswith("protocol") and key[len("protocol"):].isdigit()),
+        key=lambda key: int(key[len("protocol"):])
+    )
+
+    if protocols:
+        segments = [file[key]["raw_data"] for key in protocols if "raw_data" in file[key]]
+    elif "raw_data" in file:
+        segments = [file["raw_data"]]
+    elif "data" in file:
+        segments = [file["data"]]
+    else:
+        file.close()
+        raise ValueError("no raw data found in \"{}\"".format(path))
+
+    return Recording(segments, fs, channel_names, path=path, file=file)
+
+
+def _open_xdf(path) -> Recording:
+    import pyxdf
+
+    streams, _ = pyxdf.load_xdf(path)
+    streams = [stream for stream in streams if np.ndim(stream["time_series"]) == 2]
+
+    if not streams:
+        raise ValueError("no multichannel streams found in \"{}\"".format(path))
+
+    eeg = [stream for stream in streams if stream["info"]["type"][0].lower() == "eeg"]
+    stream = max(eeg or streams, key=lambda stream: stream["time_series"].shape[1])
+
+    fs = float(stream["info"]["nominal_srate"][0]) or None
+    channel_names = None
+    try:
+        channels = stream["info"]["desc"][0]["channels"][0]["channel"]
+        channel_names = [channel["label"][0] for channel in channels]
+    except (KeyError, IndexError, TypeError):
+        pass
+
+    return Recording([np.asarray(stream["time_series"])], fs, channel_names, path=path)
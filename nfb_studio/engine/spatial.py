@@ -0,0 +1,131 @@
+"""Compiler of spatial filters.
+
+Spatial filters of derived signals are written as "Fp1=1;Cz=-1;..." strings, or as paths to files with one weight per
+channel. This module parses them into weight vectors for a given list of channels and stacks the vectors of all
+derived signals into one matrix, so that every derived signal's spatial filter is applied with one matrix
+multiplication per chunk. Parsed vectors and stacked matrices are cached.
+"""
+import os
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+class StackedSpatialFilter:
+    """Spatial filters of several derived signals, stacked into one matrix.
+    Do not create this class directly, use `compile_spatial_filters`.
+    """
+    def __init__(self, vectors: Tuple[str], channel_names: Tuple[str], matrix: np.ndarray, unknown: Tuple[tuple]):
+        self.vectors = vectors
+        self.channel_names = channel_names
+        self.matrix = matrix
+        """Weights of shape (channels, filters). Column i is the spatial filter `vectors[i]`."""
+        self.unknown = unknown
+        """For every filter, a tuple of channel names that are not in `channel_names`. These channels are ignored."""
+
+    def apply(self, chunk: np.ndarray) -> np.ndarray:
+        """Apply all filters to a chunk of shape (samples, channels). Returns an array of shape (samples, filters)."""
+        if chunk.shape[1] != self.matrix.shape[0]:
+            raise ValueError(
+                "spatial filters expect {} channels, got {}".format(self.matrix.shape[0], chunk.shape[1])
+            )
+
+        return chunk @ self.matrix
+
+    def __len__(self):
+        return self.matrix.shape[1]
+
+
+def compile_vector(vector: str, channel_names: Tuple[str]) -> Tuple[np.ndarray, tuple]:
+    """Parse one spatial filter for the channels `channel_names`.
+    `vector` is a "Fp1=1;Cz=-1" string, a path to a file with one weight per channel, or an empty string (or None),
+    which means averaging all channels. Channel names are case-insensitive. The vector is parsed as a string first (see
+    `parse_vector`); it is read from a file only if that gives unknown channels and `vector` is the path of an existing
+    file, so a channel name such as "Cz" is never taken for a path.
+
+    Returns a tuple (weights, unknown), where weights is a read-only array with one weight per channel and unknown is a
+    tuple of channel names that are not in `channel_names`. Results are cached by arguments (and files by their
+    modification time); `channel_names` must be a tuple. Raises ValueError if the vector can not be parsed, and OSError
+    if the file can not be read.
+    """
+    weights, unknown = parse_vector(vector, channel_names)
+
+    if unknown and "=" not in vector and os.path.isfile(vector):
+        weights = _load_vector_file(vector, os.path.getmtime(vector))
+
+        if len(weights) != len(channel_names):
+            raise ValueError("spatial filter file \"{}\" has {} weights for {} channels".format(
+                vector, len(weights), len(channel_names)
+            ))
+        return weights, ()
+
+    return weights, unknown
+
+
+@lru_cache(maxsize=1024)
+def parse_vector(vector: str, channel_names: Tuple[str]) -> Tuple[np.ndarray, tuple]:
+    """Parse one spatial filter written as a "Fp1=1;Cz=-1" string, like `compile_vector`, but never read it from a
+    file. A channel without a weight, such as "Cz", gets weight 1. Raises ValueError if the vector can not be parsed.
+    """
+    if vector is None or vector.strip() == "":
+        if len(channel_names) == 0:
+            raise ValueError("no channels to average")
+
+        weights = np.full(len(channel_names), 1 / len(channel_names))
+        weights.setflags(write=False)
+        return weights, ()
+
+    index = {name.lower(): i for i, name in enumerate(channel_names)}
+    weights = np.zeros(len(channel_names))
+    unknown = []
+
+    for entry in vector.split(";"):
+        entry = entry.strip()
+        if entry == "":
+            continue
+
+        name, _, weight = entry.partition("=")
+        name = name.strip()
+
+        try:
+            weight = float(weight) if weight.strip() != "" else 1.0
+        except ValueError:
+            raise ValueError("invalid weight \"{}\" for channel \"{}\"".format(weight, name)) from None
+
+        if name.lower() in index:
+            weights[index[name.lower()]] = weight
+        else:
+            unknown.append(name)
+
+    weights.setflags(write=False)
+    return weights, tuple(unknown)
+
+
+@lru_cache(maxsize=64)
+def _load_vector_file(path, mtime) -> np.ndarray:
+    """Load weights from a file. `mtime` is part of the cache key, so that a changed file is loaded again."""
+    weights = np.loadtxt(path, ndmin=1)
+    weights.setflags(write=False)
+
+    return weights
+
+
+@lru_cache(maxsize=64)
+def _compile(vectors: Tuple[str], channel_names: Tuple[str]) -> StackedSpatialFilter:
+    compiled = [compile_vector(vector, channel_names) for vector in vectors]
+
+    if compiled:
+        matrix = np.column_stack([weights for weights, _ in compiled])
+    else:
+        matrix = np.zeros((len(channel_names), 0))
+    matrix.setflags(write=False)
+
+    return StackedSpatialFilter(vectors, channel_names, matrix, tuple(unknown for _, unknown in compiled))
+
+
+def compile_spatial_filters(vectors: Sequence[str], channel_names: Sequence[str]) -> StackedSpatialFilter:
+    """Parse spatial filters of several derived signals and stack them into one matrix.
+    Results are cached by the filter strings and channel names. See `compile_vector` for the format of `vectors`.
+    """
+    return _compile(tuple(vectors), tuple(channel_names))
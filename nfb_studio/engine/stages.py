@@ -0,0 +1,214 @@
+"""Processing stages of a derived signal.
+
+Each stage processes a chunk of samples at a time. A chunk is a 2D array of shape (samples, channels). Stages that have
+memory (filters, smoothers, delays) carry their state from one chunk to the next, so that processing a recording in
+chunks of any size gives the same result as processing it in one go. All stages are vectorized across samples and
+channels.
+"""
+import numpy as np
+import scipy.signal
+
+
+class Stage:
+    """Base class for a processing stage."""
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Process a chunk of shape (samples, channels) and return the result of shape (samples, channels')."""
+        raise NotImplementedError
+
+    def reset(self):
+        """Forget all state carried between chunks."""
+        pass
+
+
+class Identity(Stage):
+    """A stage that does nothing."""
+
+    def process(self, chunk):
+        return chunk
+
+
+class SpatialFilter(Stage):
+    """A linear combination of input channels.
+    `weights` is an array of shape (channels,) for a single output channel, or (channels, outputs).
+    """
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=float)
+        if weights.ndim == 1:
+            weights = weights[:, np.newaxis]
+
+        self.weights = weights
+
+    def process(self, chunk):
+        if chunk.shape[1] != self.weights.shape[0]:
+            raise ValueError(
+                "spatial filter expects {} channels, got {}".format(self.weights.shape[0], chunk.shape[1])
+            )
+
+        return chunk @ self.weights
+
+
+class SOSFilter(Stage):
+    """An IIR filter in second-order sections form, applied to every channel."""
+
+    def __init__(self, sos):
+        self.sos = np.array(sos, dtype=float)  # A copy: sosfilt requires a writable array
+        self._zi = None
+
+    def process(self, chunk):
+        if self._zi is None or self._zi.shape[2] != chunk.shape[1]:
+            self._zi = np.zeros((self.sos.shape[0], 2, chunk.shape[1]))
+
+        result, self._zi = scipy.signal.sosfilt(self.sos, chunk, axis=0, zi=self._zi)
+        return result
+
+    def reset(self):
+        self._zi = None
+
+
+class LFilter(Stage):
+    """A filter in transfer function form (b, a), applied to every channel.
+    Coefficients may be complex, in which case the output is complex as well.
+    """
+    def __init__(self, b, a=(1.0,)):
+        self.b = np.atleast_1d(np.asarray(b))
+        self.a = np.atleast_1d(np.asarray(a))
+        self._zi = None
+
+    def process(self, chunk):
+        order = max(len(self.a), len(self.b)) - 1
+
+        if order == 0:
+            return chunk * (self.b[0] / self.a[0])
+
+        if self._zi is None or self._zi.shape[1] != chunk.shape[1]:
+            dtype = np.result_type(self.b, self.a, chunk)
+            self._zi = np.zeros((order, chunk.shape[1]), dtype=dtype)
+
+        result, self._zi = scipy.signal.lfilter(self.b, self.a, chunk, axis=0, zi=self._zi)
+        return result
+
+    def reset(self):
+        self._zi = None
+
+
+class Magnitude(Stage):
+    """Absolute value of every sample. Rectifies real signals and takes the envelope of complex (analytic) ones."""
+
+    def process(self, chunk):
+        return np.abs(chunk)
+
+
+class Standardise(Stage):
+    """Subtract the average and divide by the standard deviation."""
+
+    def __init__(self, average, standard_deviation):
+        if standard_deviation == 0:
+            raise ValueError("standard deviation must not be zero")
+
+        self.average = average
+        self.standard_deviation = standard_deviation
+
+    def process(self, chunk):
+        return (chunk - self.average) / self.standard_deviation
+
+
+class Delay(Stage):
+    """Delay the signal by a fixed number of samples. The first samples of the output are zeros."""
+
+    def __init__(self, samples: int):
+        if samples < 0:
+            raise ValueError("delay must not be negative")
+
+        self.samples = samples
+        self._buffer = None
+
+    def process(self, chunk):
+        if self.samples == 0:
+            return chunk
+
+        if self._buffer is None or self._buffer.shape[1] != chunk.shape[1]:
+            self._buffer = np.zeros((self.samples, chunk.shape[1]), dtype=chunk.dtype)
+
+        joined = np.concatenate((self._buffer, chunk))
+        self._buffer = joined[-self.samples:]
+
+        return joined[:len(chunk)]
+
+    def reset(self):
+        self._buffer = None
+
+
+# Filter design ========================================================================================================
+def butter_bandpass(lower, upper, fs, order) -> np.ndarray:
+    """Design a Butterworth filter in second-order sections form.
+    `lower` and `upper` are band edges in Hz. If one of them is None, 0 or beyond the Nyquist frequency, a lowpass or
+    highpass filter is designed instead. Returns None if neither edge limits the band.
+    """
+    band, btype = _band(lower, upper, fs)
+    if band is None:
+        return None
+
+    return scipy.signal.butter(int(order), band, btype=btype, fs=fs, output="sos")
+
+
+def fir_bandpass(lower, upper, fs, numtaps) -> np.ndarray:
+    """Design a linear-phase FIR filter with `numtaps` taps. Band edges are interpreted like in `butter_bandpass`."""
+    band, btype = _band(lower, upper, fs)
+    if band is None:
+        return None
+
+    numtaps = int(numtaps)
+    if btype in ("highpass", "bandpass") and numtaps % 2 == 0:
+        numtaps += 1  # FIR filters that pass the Nyquist frequency need an odd number of taps
+
+    return scipy.signal.firwin(numtaps, band, pass_zero=(btype == "lowpass"), fs=fs)
+
+
+def complex_bandpass(lower, upper, fs, numtaps) -> np.ndarray:
+    """Design a complex FIR filter that passes positive frequencies between `lower` and `upper`.
+    The magnitude of its output is the envelope of the band, like in the cFIR method of NFB Lab.
+    """
+    if lower is None or upper is None:
+        raise ValueError("complex bandpass filter requires both band edges")
+
+    numtaps = int(numtaps)
+    center = (lower + upper) / 2
+    half_width = (upper - lower) / 2
+
+    lowpass = scipy.signal.firwin(numtaps, half_width, fs=fs)
+    t = np.arange(numtaps) / fs
+
+    return lowpass * np.exp(2j * np.pi * center * t)
+
+
+def exponential_smoother(factor):
+    """Return (b, a) of the exponential smoother y[n] = factor*y[n-1] + (1 - factor)*x[n]."""
+    return np.array([1 - factor]), np.array([1, -factor])
+
+
+def savgol_smoother(window, polyorder):
+    """Return FIR taps of a causal Savitzky-Golay smoother, which estimates the newest sample of each window."""
+    coeffs = scipy.signal.savgol_coeffs(window, polyorder, pos=window - 1, use="dot")
+    return coeffs[::-1]
+
+
+def _band(lower, upper, fs):
+    """Normalize band edges. Returns (band, btype) for scipy filter design functions, or (None, None)."""
+    nyquist = fs / 2
+
+    if lower is not None and lower <= 0:
+        lower = None
+    if upper is not None and upper >= nyquist:
+        upper = None
+
+    if lower is None and upper is None:
+        return None, None
+    if lower is None:
+        return upper, "lowpass"
+    if upper is None:
+        return lower, "highpass"
+    if lower >= upper:
+        raise ValueError("lower band edge ({} Hz) must be below the upper one ({} Hz)".format(lower, upper))
+
+    return [lower, upper], "bandpass"
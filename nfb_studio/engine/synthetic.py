@@ -0,0 +1,105 @@
+"""Synthetic EEG-like data, a local stand-in for the "LSL generator" inlet.
+
+The generator precomputes a buffer of a few seconds of data with vectorized operations and then serves chunks by
+looping over it, so that reading data costs no more than copying it. The buffer contains:
+
+- background noise with a 1/f spectrum, independent in every channel;
+- alpha bursts: a sinusoid with a slowly varying envelope, with a different amplitude in every channel;
+- artifacts: short large deflections (like eye blinks) at random times, strongest in the first channels.
+"""
+from typing import Iterator, Sequence
+
+import numpy as np
+
+
+class SyntheticStream:
+    """A synthetic multichannel stream.
+
+    Example:
+    ```python
+    stream = SyntheticStream(channel_count=32, fs=500)
+    chunk = stream.read(1024)  # Array of shape (1024, 32)
+    ```
+    """
+    def __init__(self, channel_count: int = 32, fs: float = 500, seconds: float = 10,
+                 channel_names: Sequence[str] = None, noise: float = 10.0, alpha_amplitude: float = 20.0,
+                 alpha_frequency: float = 10.0, burst_duration: float = 1.0, artifact_rate: float = 0.2,
+                 artifact_amplitude: float = 100.0, seed: int = 0):
+        """Create the stream and precompute its buffer of `seconds` seconds. Amplitudes are in microvolts.
+        `burst_duration` is the typical length of an alpha burst in seconds, and `artifact_rate` is the average
+        number of artifacts per second.
+        """
+        self.fs = fs
+        self.channel_count = channel_count
+        self.channel_names = list(channel_names) if channel_names is not None else [
+            "Ch{}".format(i + 1) for i in range(channel_count)
+        ]
+        if len(self.channel_names) != channel_count:
+            raise ValueError("{} channel names given for {} channels".format(len(self.channel_names), channel_count))
+
+        rng = np.random.default_rng(seed)
+        n = int(round(seconds * fs))
+        t = np.arange(n) / fs
+
+        # Background noise with a 1/f spectrum, shaped in the frequency domain
+        spectrum = np.fft.rfft(rng.standard_normal((n, channel_count)), axis=0)
+        frequencies = np.fft.rfftfreq(n, 1 / fs)
+        spectrum[1:] /= np.sqrt(frequencies[1:, np.newaxis])
+        spectrum[0] = 0
+        background = np.fft.irfft(spectrum, n, axis=0)
+        background *= noise / background.std(axis=0)
+
+        # Alpha bursts: the envelope is smoothed noise, made periodic so that the buffer loops without a seam
+        envelope_spectrum = np.fft.rfft(rng.standard_normal(n))
+        envelope_spectrum[frequencies > 1 / burst_duration] = 0
+        envelope = np.fft.irfft(envelope_spectrum, n)
+        envelope = np.clip(envelope / (np.abs(envelope).max() or 1), 0, None)
+
+        alpha = envelope * np.sin(2 * np.pi * alpha_frequency * t)
+        gains = rng.uniform(0.2, 1.0, channel_count)
+
+        # Artifacts: gaussian deflections, decaying from the first channels to the last
+        artifacts = np.zeros(n)
+        times = rng.uniform(0, seconds, rng.poisson(artifact_rate * seconds))
+        width = 0.1
+        for time in times:
+            artifacts += np.exp(-0.5 * ((t - time) / (width / 2)) ** 2)
+        artifact_gains = np.exp(-np.arange(channel_count) / max(channel_count / 8, 1))
+
+        self.buffer = (
+            background
+            + alpha_amplitude * alpha[:, np.newaxis] * gains
+            + artifact_amplitude * artifacts[:, np.newaxis] * artifact_gains
+        )
+        """Precomputed data of shape (samples, channels), served in a loop."""
+        self.buffer.setflags(write=False)
+
+        self._position = 0
+
+    @classmethod
+    def for_data_source(cls, data_source, **kw):
+        """Create a stream with the channel count, sampling frequency and channel names of an LSLDataSource."""
+        return cls(
+            channel_count=data_source.channel_count,
+            fs=data_source.frequency,
+            channel_names=data_source.channel_names,
+            **kw
+        )
+
+    def read(self, samples: int) -> np.ndarray:
+        """Return the next `samples` samples, of shape (samples, channels)."""
+        indices = np.arange(self._position, self._position + samples) % len(self.buffer)
+        self._position = (self._position + samples) % len(self.buffer)
+
+        return self.buffer[indices]
+
+    def chunks(self, chunk_size: int, count: int = None) -> Iterator[np.ndarray]:
+        """Iterate over `count` chunks of `chunk_size` samples, or forever if `count` is None."""
+        i = 0
+        while count is None or i < count:
+            yield self.read(chunk_size)
+            i += 1
+
+    def reset(self):
+        """Start reading from the beginning of the buffer again."""
+        self._position = 0
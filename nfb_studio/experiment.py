@@ -4,13 +4,15 @@ from sympy.parsing.sympy_parser import parse_expr
 
 from .block import Block, BlockDict
 from .group import Group, GroupDict
-from .serial import json, xml, hooks
+from .serial import base, json, xml, hooks
 from .scheme import Scheme
+from .util import ExportCacheMixin
 from .signal_nodes import *
+from .signal_nodes.export_plan import temporal_type
 from .sequence_nodes import *
 
 
-class Experiment:
+class Experiment(ExportCacheMixin):
     """NFB Experiment: the main class of nfb_studio.
     An instance of Experiment represents a collection
     """
@@ -22,7 +24,12 @@ class Experiment:
     }
     inlet_type_import_values = {v: k for k, v in inlet_type_export_values.items()}
 
+    export_encoder = xml.XMLEncoder(separator="\n", indent="\t", metadata=False, hooks={bool: lambda x: int(x)})
+    """Encoder of exported files. Cached fragments of exported files are only reused with the same encoder."""
+
     def __init__(self):
+        super().__init__()
+
         self.name = "Experiment"
         self.lsl_stream_name = "NVX136_Data"
         self.inlet = "lsl"
@@ -43,6 +50,10 @@ class Experiment:
         self.sequence = []
         """A list of nodes that is the subset of scheme to be exported."""
 
+        self.recordings = RecordingRegistry()
+        """Recordings opened as data sources by LSL Input nodes of the signal scheme. Closed by `close`."""
+        self._watchSignalScheme()
+
         self.blocks = BlockDict()
         self.groups = GroupDict()
 
@@ -68,20 +79,103 @@ class Experiment:
         
         return (True, None)
     
+    # Recordings =======================================================================================================
+    def close(self):
+        """Close the recordings opened by this experiment. Called when the experiment is no longer used."""
+        self.recordings.close()
+
+    def _watchSignalScheme(self):
+        """Give LSL Input nodes of the signal scheme, and nodes added to it later, this experiment's recordings."""
+        self.signal_scheme.graphChanged.connect(self._onSignalGraphChanged)
+
+        for node in self.signal_scheme.builtGraph().nodes:
+            self._onSignalGraphChanged(node)
+
+    def _onSignalGraphChanged(self, item):
+        if (isinstance(item, LSLInput) and item.recordings() is not self.recordings and
+                item in self.signal_scheme.builtGraph().nodes):
+            item.setRecordings(self.recordings)
+
     # Serialization ====================================================================================================
     def export(self) -> str:
-        data = {"NeurofeedbackSignalSpecs": self}
+        """Export the experiment to an XML string for NFBLab.
+        The file is assembled from separately encoded fragments: general properties, blocks, groups and the data of
+        every signal node. Fragments are cached in the `export_cache` of their objects, so only objects that changed
+        since the last export are encoded again. The result is the same as encoding `nfb_export_data`.
+        Raises ExportError if some derived signals can not be exported.
+        """
+        encoder = self.export_encoder
 
-        enc_hooks = {
-            Experiment: Experiment.nfb_export_data,
-            Block: Block.nfb_export_data,
-            Group: Group.nfb_export_data,
-            bool: lambda x: int(x)
-        }
+        plan = ExportPlan(self.signal_scheme.graph)
+        plan.raise_errors()
+
+        general, sequence = self.export_cache.get(encoder, lambda: (
+            "".join(encoder.encode_element(key, value, 1) for key, value in self._nfb_export_general().items()),
+            encoder.encode_element("vPSequence", {"s": self.sequence}, 1),
+        ))
+
+        # Blocks and groups --------------------------------------------------------------------------------------------
+        def encode_block(name):
+            return encoder.encode_element("FeedbackProtocol", self._nfb_export_block(name), 2)
+
+        def encode_group(name):
+            return encoder.encode_element("PGroup", self._nfb_export_group(name), 2)
 
-        encoder = xml.XMLEncoder(separator="\n", indent="\t", metadata=False, hooks=enc_hooks)
+        blocks = [
+            self.blocks[name].export_cache.get((encoder, name), lambda: encode_block(name)) for name in self.blocks
+        ]
+        groups = [
+            self.groups[name].export_cache.get((encoder, name), lambda: encode_group(name)) for name in self.groups
+        ]
+
+        if len(self.groups) == 0:
+            # Append a null group as a nfb bug workaround
+            groups.append(encoder.encode_element("PGroup", None, 2))
 
-        return encoder.encode(data)
+        # Signals ------------------------------------------------------------------------------------------------------
+        signals = [self._export_derived_signal(plan, chain, encoder) for chain in plan.signals]
+
+        for node in self.signal_scheme.graph.topologicalOrder():
+            if isinstance(node, CompositeSignalExport):
+                _, fragment = self._export_node(node, encoder)
+                signals.append(encoder.join("CompositeSignal", [fragment], 2))
+
+        # --------------------------------------------------------------------------------------------------------------
+        return encoder.join("NeurofeedbackSignalSpecs", [
+            general,
+            encoder.join("vProtocols", blocks, 1),
+            encoder.join("vPGroups", groups, 1),
+            encoder.join("vSignals", signals, 1),
+            sequence,
+        ])
+
+    def _export_derived_signal(self, plan, chain, encoder) -> str:
+        """Assemble the XML element of a derived signal from cached fragments of its nodes."""
+        keys = set()
+        fragments = []
+
+        for node in chain:
+            node_keys, fragment = self._export_node(node, encoder)
+
+            if not keys.isdisjoint(node_keys):
+                # A node overwrites a value of another node, which fragments can not express
+                return encoder.encode_element("DerivedSignal", plan.signal_data(chain), 2)
+
+            keys.update(node_keys)
+            fragments.append(fragment)
+
+        fragments.append(encoder.encode_element("sTemporalType", temporal_type(chain), 3))
+        return encoder.join("DerivedSignal", fragments, 2)
+
+    @staticmethod
+    def _export_node(node, encoder):
+        """Return the keys that a signal node adds to its signal, and their XML fragment. The fragment is cached."""
+        def encode():
+            data = {}
+            node.add_nfb_export_data(data)
+            return frozenset(data), "".join(encoder.encode_element(key, value, 3) for key, value in data.items())
+
+        return node.export_cache.get(encoder, encode)
 
     def save(self) -> str:
         encoder = json.JSONEncoder(separator="\n", indent="\t", hooks=hooks.qt)
@@ -90,8 +184,8 @@ class Experiment:
     
     @classmethod
     def load(cls, data: str):
-        decoder = json.JSONDecoder(hooks=hooks.qt)
-        return decoder.decode(data)
+        decoder = base.BaseDecoder(hooks=hooks.qt)
+        return decoder.decode(json.loads(data))
 
     @classmethod
     def import_xml(cls, xml_string: str):
@@ -154,124 +248,125 @@ class Experiment:
         ex.reward_refractory_period = float(data.get("fRewardPeriodS", ex.reward_refractory_period))
 
         # Decode signals -----------------------------------------------------------------------------------------------
-        node_pos = [0, 0]
-        node_xdiff = -250  # TODO: Change to a size dependent on node default width
-        node_ydiff = 250
-
-        derived_signals = {}  # For connecting with composite signals
-
-        for signal_data in data["vSignals"]["DerivedSignal"]:
-            # Assemble the signal front to back, starting with the signal name.
-            # Some nodes may not be present, this loop accounts for it.
-            if "sSignalName" in signal_data:
-                # Create the node and set variables from data
-                n = DerivedSignalExport()
-                n.setSignalName(signal_data["sSignalName"])
-                derived_signals[signal_data["sSignalName"]] = n
-
-                # Set position and add to scheme
-                n.setPos(*node_pos)
-                node_pos[0] += node_xdiff
-
-                ex.signal_scheme.addItem(n)
-            if (signal_data.get("fAverage") is not None) or (signal_data.get("fStdDev") is not None):
-                last = n
-                n = Standardise()
-                n.setAverage(float(signal_data.get("fAverage", n.default_average)))
-                n.setStandardDeviation(float(signal_data.get("fStdDev", n.default_standard_deviation)))
-
-                n.setPos(*node_pos)
-                node_pos[0] += node_xdiff
-
-                ex.signal_scheme.addItem(n)
-                ex.signal_scheme.connect_nodes(n.outputs[0], last.inputs[0])
-            if ("fSmoothingFactor" in signal_data) or ("method" in signal_data):
+        with ex.signal_scheme.bulkLoad():
+            node_pos = [0, 0]
+            node_xdiff = -250  # TODO: Change to a size dependent on node default width
+            node_ydiff = 250
+
+            derived_signals = {}  # For connecting with composite signals
+
+            for signal_data in data["vSignals"]["DerivedSignal"]:
+                # Assemble the signal front to back, starting with the signal name.
+                # Some nodes may not be present, this loop accounts for it.
+                if "sSignalName" in signal_data:
+                    # Create the node and set variables from data
+                    n = DerivedSignalExport()
+                    n.setSignalName(signal_data["sSignalName"])
+                    derived_signals[signal_data["sSignalName"]] = n
+
+                    # Set position and add to scheme
+                    n.setPos(*node_pos)
+                    node_pos[0] += node_xdiff
+
+                    ex.signal_scheme.addItem(n)
+                if (signal_data.get("fAverage") is not None) or (signal_data.get("fStdDev") is not None):
+                    last = n
+                    n = Standardise()
+                    n.setAverage(float(signal_data.get("fAverage", n.default_average)))
+                    n.setStandardDeviation(float(signal_data.get("fStdDev", n.default_standard_deviation)))
+
+                    n.setPos(*node_pos)
+                    node_pos[0] += node_xdiff
+
+                    ex.signal_scheme.addItem(n)
+                    ex.signal_scheme.connect_nodes(n.outputs[0], last.inputs[0])
+                if ("fSmoothingFactor" in signal_data) or ("method" in signal_data):
+                    last = n
+                    n = EnvelopeDetector()
+                    n.setSmoothingFactor(float(signal_data.get("fSmoothingFactor", n.default_smoothing_factor)))
+                    n.setSmootherType(signal_data.get("sTemporalSmootherType", n.default_smoother_type))
+                    n.setMethod(signal_data.get("method", n.default_method))
+
+                    n.setPos(*node_pos)
+                    node_pos[0] += node_xdiff
+
+                    ex.signal_scheme.addItem(n)
+                    ex.signal_scheme.connect_nodes(n.outputs[0], last.inputs[0])
+                if ("fBandpassLowHz" in signal_data) or ("fBandpassHighHz" in signal_data):
+                    last = n
+                    n = BandpassFilter()
+
+                    lower_bound = signal_data.get("fBandpassLowHz", n.default_lower_bound)
+                    upper_bound = signal_data.get("fBandpassHighHz", n.default_upper_bound)
+
+                    if lower_bound is not None:
+                        lower_bound = float(lower_bound)
+                    if upper_bound is not None:
+                        upper_bound = float(upper_bound)
+
+                    n.setLowerBound(lower_bound)
+                    n.setUpperBound(upper_bound)
+                    n.setFilterLength(float(signal_data.get("fFFTWindowSize", n.default_filter_length)))
+                    n.setFilterType(signal_data.get("sTemporalFilterType", n.default_filter_type))
+                    n.setFilterOrder(float(signal_data.get("fTemporalFilterButterOrder", n.default_filter_order)))
+
+                    n.setPos(*node_pos)
+                    node_pos[0] += node_xdiff
+
+                    ex.signal_scheme.addItem(n)
+                    ex.signal_scheme.connect_nodes(n.outputs[0], last.inputs[0])
+                if "SpatialFilterMatrix" in signal_data:
+                    last = n
+                    n = SpatialFilter()
+
+                    if signal_data["SpatialFilterMatrix"] is None:
+                        pass
+                    elif "=" in signal_data["SpatialFilterMatrix"]:
+                        n.setVector(signal_data["SpatialFilterMatrix"])
+                    else:
+                        n.setVectorPath(signal_data["SpatialFilterMatrix"])
+
+                    n.setPos(*node_pos)
+                    node_pos[0] += node_xdiff
+
+                    ex.signal_scheme.addItem(n)
+                    ex.signal_scheme.connect_nodes(n.outputs[0], last.inputs[0])
+                # Unconditionally add LSLInput
                 last = n
-                n = EnvelopeDetector()
-                n.setSmoothingFactor(float(signal_data.get("fSmoothingFactor", n.default_smoothing_factor)))
-                n.setSmootherType(signal_data.get("sTemporalSmootherType", n.default_smoother_type))
-                n.setMethod(signal_data.get("method", n.default_method))
+                n = LSLInput()
 
                 n.setPos(*node_pos)
                 node_pos[0] += node_xdiff
 
                 ex.signal_scheme.addItem(n)
                 ex.signal_scheme.connect_nodes(n.outputs[0], last.inputs[0])
-            if ("fBandpassLowHz" in signal_data) or ("fBandpassHighHz" in signal_data):
-                last = n
-                n = BandpassFilter()
 
-                lower_bound = signal_data.get("fBandpassLowHz", n.default_lower_bound)
-                upper_bound = signal_data.get("fBandpassHighHz", n.default_upper_bound)
+                # Bump vertial coordinates to prepare for a new signal
+                node_pos[0] = 0
+                node_pos[1] += node_ydiff
 
-                if lower_bound is not None:
-                    lower_bound = float(lower_bound)
-                if upper_bound is not None:
-                    upper_bound = float(upper_bound)
+            # Add composite signals separately
+            for comp_data in data["vSignals"]["CompositeSignal"]:
+                if comp_data is None:
+                    continue
 
-                n.setLowerBound(lower_bound)
-                n.setUpperBound(upper_bound)
-                n.setFilterLength(float(signal_data.get("fFFTWindowSize", n.default_filter_length)))
-                n.setFilterType(signal_data.get("sTemporalFilterType", n.default_filter_type))
-                n.setFilterOrder(float(signal_data.get("fTemporalFilterButterOrder", n.default_filter_order)))
-
-                n.setPos(*node_pos)
-                node_pos[0] += node_xdiff
-
-                ex.signal_scheme.addItem(n)
-                ex.signal_scheme.connect_nodes(n.outputs[0], last.inputs[0])
-            if "SpatialFilterMatrix" in signal_data:
-                last = n
-                n = SpatialFilter()
-
-                if signal_data["SpatialFilterMatrix"] is None:
-                    pass
-                elif "=" in signal_data["SpatialFilterMatrix"]:
-                    n.setVector(signal_data["SpatialFilterMatrix"])
-                else:
-                    n.setVectorPath(signal_data["SpatialFilterMatrix"])
+                n = CompositeSignalExport()
+                n.setSignalName(comp_data["sSignalName"])
+                n.setExpression(comp_data["sExpression"])
 
+                # Set position and add to scheme
                 n.setPos(*node_pos)
-                node_pos[0] += node_xdiff
+                node_pos[0] = 0
+                node_pos[1] += node_ydiff
 
                 ex.signal_scheme.addItem(n)
-                ex.signal_scheme.connect_nodes(n.outputs[0], last.inputs[0])
-            # Unconditionally add LSLInput
-            last = n
-            n = LSLInput()
-
-            n.setPos(*node_pos)
-            node_pos[0] += node_xdiff
-
-            ex.signal_scheme.addItem(n)
-            ex.signal_scheme.connect_nodes(n.outputs[0], last.inputs[0])
-
-            # Bump vertial coordinates to prepare for a new signal
-            node_pos[0] = 0
-            node_pos[1] += node_ydiff
-
-        # Add composite signals separately
-        for comp_data in data["vSignals"]["CompositeSignal"]:
-            if comp_data is None:
-                continue
-
-            n = CompositeSignalExport()
-            n.setSignalName(comp_data["sSignalName"])
-            n.setExpression(comp_data["sExpression"])
 
-            # Set position and add to scheme
-            n.setPos(*node_pos)
-            node_pos[0] = 0
-            node_pos[1] += node_ydiff
+                # Find which derived signals are connected to this composite signal
+                variables = {str(x) for x in parse_expr(comp_data["sExpression"]).free_symbols}
 
-            ex.signal_scheme.addItem(n)
-            
-            # Find which derived signals are connected to this composite signal
-            variables = {str(x) for x in parse_expr(comp_data["sExpression"]).free_symbols}
-
-            for name, derived_n in derived_signals.items():
-                if name in variables:
-                    ex.signal_scheme.connect_nodes(derived_n.outputs[0], n.inputs[0])
+                for name, derived_n in derived_signals.items():
+                    if name in variables:
+                        ex.signal_scheme.connect_nodes(derived_n.outputs[0], n.inputs[0])
 
         # Decode blocks ------------------------------------------------------------------------------------------------
         for block_data in data["vProtocols"]["FeedbackProtocol"]:
@@ -290,26 +385,27 @@ class Experiment:
         # Decode sequence ----------------------------------------------------------------------------------------------
         ex.sequence = data["vPSequence"]["s"]
 
-        node = None
-        node_pos = [0, 0]
-        node_xdiff = 250
+        with ex.sequence_scheme.bulkLoad():
+            node = None
+            node_pos = [0, 0]
+            node_xdiff = 250
 
-        for name in ex.sequence:
-            last = node
+            for name in ex.sequence:
+                last = node
 
-            if name in ex.blocks:
-                node = BlockNode()
-            else:
-                node = GroupNode()
+                if name in ex.blocks:
+                    node = BlockNode()
+                else:
+                    node = GroupNode()
 
-            node.setTitle(name)
-            node.setPos(*node_pos)
-            node_pos[0] += node_xdiff
+                node.setTitle(name)
+                node.setPos(*node_pos)
+                node_pos[0] += node_xdiff
 
-            ex.sequence_scheme.addItem(node)
+                ex.sequence_scheme.addItem(node)
 
-            if last is not None:
-                ex.sequence_scheme.connect_nodes(last.outputs[0], node.inputs[0])
+                if last is not None:
+                    ex.sequence_scheme.connect_nodes(last.outputs[0], node.inputs[0])
 
         # --------------------------------------------------------------------------------------------------------------
         return ex
@@ -362,102 +458,45 @@ class Experiment:
         obj.groups = data["groups"]
         obj.sequence = data["sequence"]
 
+        obj._watchSignalScheme()
+
         obj.blocks.setExperiment(obj)
         obj.groups.setExperiment(obj)
 
         return obj
 
     def nfb_export_data(self) -> dict:
-        """Export data in a dict format for encoding to XML and usage in NFBLab."""
-        data = {}
+        """Export data in a dict format for encoding to XML and usage in NFBLab.
+        Raises ExportError if some derived signals can not be exported.
+        """
+        plan = ExportPlan(self.signal_scheme.graph)
+        plan.raise_errors()
 
-        # General ------------------------------------------------------------------------------------------------------
-        data["sExperimentName"] = self.name
-        data["sStreamName"] = self.lsl_stream_name
-        data["sPrefilterBand"] = str(self.prefilter_band[0]) + " " + str(self.prefilter_band[1])
-        data["bDC"] = self.dc
-        data["sInletType"] = self.inlet
-        data["sRawDataFilePath"] = self.raw_data_path
-        data["sFTHostnamePort"] = self.hostname_port
-        data["bPlotRaw"] = self.plot_raw
-        data["bPlotSignals"] = self.plot_signals
-        data["bPlotSourceSpace"] = 0
-        data["fRewardPeriodS"] = self.reward_refractory_period
-        data["sReference"] = self.discard_channels
-        data["sReferenceSub"] = self.reference_sub
-        data["bUseExpyriment"] = 0
-        data["bShowPhotoRectangle"] = self.show_photo_rectangle
-        data["sVizNotchFilters"] = self.show_notch_filters
+        data = self._nfb_export_general()
 
         # Blocks -------------------------------------------------------------------------------------------------------
         data["vProtocols"] = {
-            "FeedbackProtocol": []
+            "FeedbackProtocol": [self._nfb_export_block(name) for name in self.blocks]
         }
 
-        for name in self.blocks:
-            block = self.blocks[name]
-
-            data["vProtocols"]["FeedbackProtocol"].append(block.nfb_export_data())  # Add other information
-            data["vProtocols"]["FeedbackProtocol"][-1]["sProtocolName"] = name  # Add name
-
         # Groups -------------------------------------------------------------------------------------------------------
         data["vPGroups"] = {
-            "PGroup": []
+            "PGroup": [self._nfb_export_group(name) for name in self.groups]
         }
-
-        for name in self.groups:
-            group = self.groups[name]
-
-            data["vPGroups"]["PGroup"].append(group.nfb_export_data())  # Add other information
-            data["vPGroups"]["PGroup"][-1]["sName"] = name  # Add name
         
         if len(self.groups) == 0:
             # Append a null group as a nfb bug workaround
             data["vPGroups"]["PGroup"].append(None)
 
         # Derived Signals ----------------------------------------------------------------------------------------------
-        signals = []
-
-        # Build a list of lists of nodes (e.g. list of sequences)
-        for node in self.signal_scheme.graph.nodes:
-            if isinstance(node, DerivedSignalExport):
-                signal = []
-                n = node
-
-                while True:
-                    signal.append(n)
-
-                    if len(n.inputs) == 0:
-                        break
-                    
-                    n = list(n.inputs[0].edges)[0].sourceNode()
-                
-                signals.append(signal)
-        
-        # Convert list of lists of nodes to a list of serialized signals
-        for i in range(len(signals)):
-            signal = {}
-
-            for node in signals[i]:
-                node.add_nfb_export_data(signal)
-            
-            if isinstance(signals[i][1], EnvelopeDetector):
-                signal["sTemporalType"] = "envdetector"
-            elif isinstance(signals[i][1], BandpassFilter):
-                signal["sTemporalType"] = "filter"
-            else:
-                signal["sTemporalType"] = "identity"
-            
-            signals[i] = signal
-
         data["vSignals"] = {
-            "DerivedSignal": signals
+            "DerivedSignal": [plan.signal_data(chain) for chain in plan.signals]
         }
 
         # Composite signals --------------------------------------------------------------------------------------------
         signals = []
 
-        for node in self.signal_scheme.graph.nodes:
+        for node in self.signal_scheme.graph.topologicalOrder():
             if isinstance(node, CompositeSignalExport):
                 signal = {}
                 node.add_nfb_export_data(signal)
@@ -471,3 +510,36 @@ class Experiment:
         }
 
         return data
+
+    def _nfb_export_general(self) -> dict:
+        """Export general properties of the experiment (the first part of `nfb_export_data`)."""
+        data = {}
+
+        data["sExperimentName"] = self.name
+        data["sStreamName"] = self.lsl_stream_name
+        data["sPrefilterBand"] = str(self.prefilter_band[0]) + " " + str(self.prefilter_band[1])
+        data["bDC"] = self.dc
+        data["sInletType"] = self.inlet
+        data["sRawDataFilePath"] = self.raw_data_path
+        data["sFTHostnamePort"] = self.hostname_port
+        data["bPlotRaw"] = self.plot_raw
+        data["bPlotSignals"] = self.plot_signals
+        data["bPlotSourceSpace"] = 0
+        data["fRewardPeriodS"] = self.reward_refractory_period
+        data["sReference"] = self.discard_channels
+        data["sReferenceSub"] = self.reference_sub
+        data["bUseExpyriment"] = 0
+        data["bShowPhotoRectangle"] = self.show_photo_rectangle
+        data["sVizNotchFilters"] = self.show_notch_filters
+
+        return data
+
+    def _nfb_export_block(self, name) -> dict:
+        data = self.blocks[name].nfb_export_data()  # Add other information
+        data["sProtocolName"] = name  # Add name
+        return data
+
+    def _nfb_export_group(self, name) -> dict:
+        data = self.groups[name].nfb_export_data()  # Add other information
+        data["sName"] = name  # Add name
+        return data
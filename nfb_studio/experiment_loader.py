@@ -0,0 +1,152 @@
+"""Opening experiment files without freezing the GUI.
+
+Loading an experiment has two parts. Reading the file and parsing JSON into plain data does not touch Qt objects, and
+runs in a thread pool. Building objects from that data creates widgets and graphics items, which must happen in the
+GUI thread; it is done in batches of `ExperimentLoader.time_slice` seconds, between which the event loop runs, so the
+window stays responsive and loading can be cancelled.
+"""
+import json
+import logging
+import time
+
+from PySide2.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from .serial import base, hooks
+
+logger = logging.getLogger(__name__)
+
+
+class ExperimentLoader(QObject):
+    """Loads an experiment from a file in the background.
+
+    Example:
+    ```python
+    loader = ExperimentLoader(path)
+    loader.finished.connect(view.setModel)
+    loader.failed.connect(showError)
+    loader.start()
+    ```
+    """
+
+    time_slice = 0.02
+    """Time in seconds that the loader may block the GUI thread at a time."""
+
+    progressChanged = Signal(int, int)
+    """Emitted with the number of objects built so far and the total number of objects in the file."""
+    finished = Signal(object)
+    """Emitted with the loaded Experiment."""
+    failed = Signal(str)
+    """Emitted with an error message if the file could not be loaded."""
+
+    def __init__(self, path: str, parent=None):
+        super().__init__(parent)
+        self.path = path
+
+        self._cancelled = False
+        self._steps = None
+        """Generator that builds the experiment (see `BaseDecoder.decode_steps`)."""
+        self._done = 0
+        self._total = 0
+
+        self._start_time = None
+        self.open_time = None
+        """Time in seconds from `start` until the experiment was built, or None."""
+        self.longest_stall = 0.0
+        """Longest time in seconds that the loader blocked the GUI thread."""
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._build)
+
+        self._results = _ReadResults()
+        self._results.finished.connect(self._onRead)
+
+    def start(self):
+        """Start reading the file. Returns immediately."""
+        self._start_time = time.perf_counter()
+        QThreadPool.globalInstance().start(_ReadTask(self.path, self._results))
+
+    def cancel(self):
+        """Stop loading. Neither `finished` nor `failed` is emitted afterwards."""
+        self._cancelled = True
+        self._timer.stop()
+        self._steps = None
+
+    def _onRead(self, data, total, error):
+        if self._cancelled:
+            return
+
+        if error is not None:
+            self.failed.emit(error)
+            return
+
+        self._steps = base.BaseDecoder(hooks=hooks.qt).decode_steps(data)
+        self._total = total
+        self.progressChanged.emit(0, total)
+        self._timer.start(0)
+
+    def _build(self):
+        """Build objects for one time slice."""
+        start = time.perf_counter()
+        deadline = start + self.time_slice
+
+        try:
+            while time.perf_counter() < deadline:
+                if next(self._steps) is not None:
+                    self._done += 1  # An object was built, rather than a part of one
+        except StopIteration as e:
+            self._steps = None
+            result = e.value
+        except Exception as e:
+            self._steps = None
+            logger.exception("Failed to build the experiment from \"%s\"", self.path)
+            self.failed.emit("{}: {}".format(type(e).__name__, e))
+            return
+        else:
+            result = None
+
+        self.longest_stall = max(self.longest_stall, time.perf_counter() - start)
+        self.progressChanged.emit(self._done, self._total)
+
+        if self._steps is not None:
+            self._timer.start(0)
+            return
+
+        self.open_time = time.perf_counter() - self._start_time
+        logger.debug(
+            "Built \"%s\" (%d objects) in %.3f s, longest GUI stall %.1f ms",
+            self.path, self._done, self.open_time, self.longest_stall * 1000
+        )
+        self.finished.emit(result)
+
+
+class _ReadResults(QObject):
+    """Carries results from a _ReadTask to the GUI thread."""
+    finished = Signal(object, int, object)
+    """Emitted with (data, number of objects, error). Either data or error is None."""
+
+
+class _ReadTask(QRunnable):
+    """Read and parse an experiment file in a thread pool."""
+    def __init__(self, path, results):
+        super().__init__()
+        self.path = path
+        self.results = results
+
+    def run(self):
+        count = 0
+
+        def object_hook(data):
+            # A Python hook also lets the GUI thread take the GIL between objects while the C parser runs
+            nonlocal count
+            if "__class__" in data:
+                count += 1
+            return data
+
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file, object_hook=object_hook)
+        except (OSError, ValueError) as e:
+            self.results.finished.emit(None, 0, str(e))
+        else:
+            self.results.finished.emit(data, count, None)
@@ -1,34 +1,37 @@
 """View widget for Experiment class and the main window of this application."""
 import os
 import sys
+import time
+import logging
 import traceback
-from datetime import datetime
+from functools import partial
 from typing import Optional
 from pathlib import Path
-from multiprocessing import Process
 
-from PySide2.QtCore import Qt, QModelIndex, QDir
+from PySide2.QtCore import Qt, QModelIndex, QObject, QRunnable, QThreadPool, Signal
 from PySide2.QtGui import QStandardItem, QKeySequence
-from PySide2.QtWidgets import QMainWindow, QDockWidget, QStackedWidget, QFileDialog, QMessageBox, QScrollArea, QTextEdit
-from pynfb.main import run as run_experiment
+from PySide2.QtWidgets import (
+    QMainWindow, QDockWidget, QStackedWidget, QFileDialog, QMessageBox, QScrollArea, QTextEdit, QProgressDialog
+)
 
 import nfb_studio
 
 from .experiment import Experiment
+from .experiment_loader import ExperimentLoader
 from .block import BlockView
 from .group import GroupView
-from .util import StackedDictWidget
 from .general_view import GeneralView
 from .property_tree import PropertyTree
 from .scheme import SchemeEditor
 from .sequence_editor import SequenceEditor
-from .signal_nodes import node_types
+from .signal_nodes import node_types, Standardise, LSLInput, ExportError, SchemeValidator
+from .engine.calibration import calibrate_file
+from .stream_registry import StreamRegistry
+from .run_manager import RunManager
+from .run_view import RunView
 from .sequence_nodes import *
 
-
-def run(file_path, results_path):
-    os.chdir(results_path)
-    run_experiment(file_path)
+logger = logging.getLogger(__name__)
 
 
 class ExperimentView(QMainWindow):
@@ -40,8 +43,11 @@ class ExperimentView(QMainWindow):
         self._save_path = None
         """Save path of the experiment that is being edited."""
 
-        self._processes = []
-        """Process handles for experiments that were started."""
+        self._calibration_tasks = []
+        """Calibrations that are running in the background."""
+        self._loader = None
+        """ExperimentLoader of a file that is being opened, or None."""
+        self._open_progress = None
 
         # Exceptions ---------------------------------------------------------------------------------------------------
         self.__excepthook__ = sys.excepthook
@@ -86,6 +92,9 @@ class ExperimentView(QMainWindow):
         action_start_ex.triggered.connect(self.actionStartExperiment)
         action_start_ex.setShortcut("F9")
 
+        action_calibrate = runmenu.addAction("Calibrate Standardise Nodes...")
+        action_calibrate.triggered.connect(self.actionCalibrate)
+
         # Property tree ------------------------------------------------------------------------------------------------
         self.tree = PropertyTree()
         self.tree_view = self.tree.getView()
@@ -98,16 +107,38 @@ class ExperimentView(QMainWindow):
         self.property_tree_dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.property_tree_dock)
 
+        # Experiment runs dock widget ----------------------------------------------------------------------------------
+        self.run_manager = RunManager(parent=self)
+
+        self.run_view = RunView()
+        self.run_view.setManager(self.run_manager)
+
+        self.run_dock = QDockWidget("Runs", self)
+        self.run_dock.setWidget(self.run_view)
+        self.run_dock.setAllowedAreas(Qt.BottomDockWidgetArea | Qt.TopDockWidgetArea)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.run_dock)
+        self.run_dock.hide()
+
+        runmenu.addSeparator()
+        runmenu.addAction(self.run_dock.toggleViewAction())
+
         # Editing widgets ----------------------------------------------------------------------------------------------
         self.general_view = GeneralView()
         
         self.signal_editor = SchemeEditor()
 
+        # Signal nodes show problems with the scheme (unconnected inputs, duplicate signal names, ...) as messages
+        self.signal_validator = SchemeValidator(self)
+
+        # LSL Input nodes show information about their streams, which are discovered in the background
+        StreamRegistry.instance().streamsChanged.connect(self._onStreamsChanged)
+
         for name in node_types:
             self.signal_editor.toolbox().addItem(name, node_types[name]())
 
-        self.blocks = StackedDictWidget()
-        self.groups = StackedDictWidget()
+        # Blocks and groups are edited in one view each, which is set to the selected block or group
+        self.block_view = BlockView()
+        self.group_view = GroupView()
 
         # Sequence editor ----------------------------------------------------------------------------------------------
         self.sequence_editor = SequenceEditor()
@@ -120,8 +151,14 @@ class ExperimentView(QMainWindow):
         scrollarea.setWidget(self.general_view)
         self.central_widget.addWidget(scrollarea)
         self.central_widget.addWidget(self.signal_editor)
-        self.central_widget.addWidget(self.blocks)
-        self.central_widget.addWidget(self.groups)
+
+        self.block_scrollarea = QScrollArea()
+        self.block_scrollarea.setWidget(self.block_view)
+        self.central_widget.addWidget(self.block_scrollarea)
+
+        self.group_scrollarea = QScrollArea()
+        self.group_scrollarea.setWidget(self.group_view)
+        self.central_widget.addWidget(self.group_scrollarea)
         self.central_widget.addWidget(self.sequence_editor)
 
         # New experiment view is created with a new experiment ---------------------------------------------------------
@@ -145,10 +182,12 @@ class ExperimentView(QMainWindow):
         return self._save_path
 
     def setModel(self, ex: Experiment, /):
+        old = self._model
         self._model = ex
 
         self.tree.setExperiment(ex)
         self.signal_editor.setScheme(ex.signal_scheme)
+        self.signal_validator.setScheme(ex.signal_scheme)
 
         self.sequence_editor.setScheme(ex.sequence_scheme)
 
@@ -159,6 +198,9 @@ class ExperimentView(QMainWindow):
         ex.groups.itemRenamed.connect(self._onGroupRenamed)
         ex.groups.itemRemoved.connect(self._onGroupRemoved)
 
+        if old is not None and old is not ex:
+            old.close()  # Recordings of the replaced experiment are no longer used
+
         self.updateView()
 
     # Experiment syncronization ========================================================================================
@@ -168,19 +210,20 @@ class ExperimentView(QMainWindow):
         if ex is None:
             return
         
-        # For each block, write it's data to the experiment
-        for name in self.blocks.keys():
-            block_view: BlockView = self.blocks.widget(name).widget()
-            block_view.updateModel()
-        
-        # For each group, write its data to the experiment
-        for name in self.groups.keys():
-            group_view: GroupView = self.groups.widget(name).widget()
-            group_view.updateModel()
+        # Write the block and group that the user edited. Other blocks and groups are up to date
+        self._commitBlockView()
+        self._commitGroupView()
 
         # Write general experiment data
         self.general_view.updateModel(ex)
 
+        # A recording of the "LSL file stream" inlet can be used as a data source of the signal scheme
+        if ex.inlet == "lsl_from_file" and ex.raw_data_path != "":
+            try:
+                ex.recordings.add(ex.raw_data_path)
+            except (OSError, ValueError, ImportError):
+                pass  # The path is not a readable recording yet
+
         # Write the selected sequence
         ex.sequence = [node.title() for node in self.sequence_editor.selectedSequence()[1]]
 
@@ -221,23 +264,31 @@ class ExperimentView(QMainWindow):
         general.show_notch_filters.setChecked(ex.show_notch_filters)
 
         # Blocks and groups --------------------------------------------------------------------------------------------
+        # Select general properties, so that the selection does not move through items as they are removed
+        self.tree_view.setCurrentIndex(self.tree.indexFromItem(self.tree.general))
+        self.block_view.setModel(None)
+        self.group_view.setModel(None)
+
         while self.tree.blocks.rowCount() > 0:
             name = self.tree.blocks.child(0).text()
             self.tree.blocks.removeRow(0)
-            self.blocks.removeWidget(name)
             self.sequence_editor.toolbox().removeItem(name)
         
         while self.tree.groups.rowCount() > 0:
             name = self.tree.groups.child(0).text()
             self.tree.groups.removeRow(0)
-            self.groups.removeWidget(name)
             self.sequence_editor.toolbox().removeItem(name)
 
+        # Only the item that ends up selected is shown in a view
+        tree_item = None
         for name in ex.blocks:
-            ex.blocks.itemAdded.emit(name)
+            tree_item = self._addBlockItem(name)
         
         for name in ex.groups:
-            ex.groups.itemAdded.emit(name)
+            tree_item = self._addGroupItem(name)
+
+        if tree_item is not None:
+            self.tree_view.setCurrentIndex(self.tree.indexFromItem(tree_item))
         
         # Sequence -----------------------------------------------------------------------------------------------------
         for sgraph, slist, button in self.sequence_editor.sequences():
@@ -245,49 +296,50 @@ class ExperimentView(QMainWindow):
                 button.setChecked(True)
                 break
 
+    def _onStreamsChanged(self):
+        ex = self.model()
+        if ex is None:
+            return
+
+        for node in ex.signal_scheme.builtGraph().nodes:
+            if isinstance(node, LSLInput):
+                node.refreshDataSource()
+
     def _onBlockAdded(self, name):
         """Function that gets called when a new block has been added to the experiment."""
-        # Add an item to the property tree
-        tree_item = QStandardItem(name)
-        tree_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable)
-        self.tree.blocks.appendRow(tree_item)
-        
-        # Add a view to the widget stack
-        block_view = BlockView()
-        block_view.setModel(self.model().blocks[name])
-        scrollarea = QScrollArea()
-        scrollarea.setWidget(block_view)
-        self.blocks.addWidget(name, scrollarea)
-
-        # Add a node to draw the sequence
-        node = BlockNode()
-        node.setTitle(name)
-        self.sequence_editor.toolbox().addItem(name, node)
+        tree_item = self._addBlockItem(name)
 
         # Select this item
         self.tree_view.setCurrentIndex(self.tree.indexFromItem(tree_item))
     
     def _onGroupAdded(self, name):
         """Function that gets called when a new group has been added to the experiment."""
-        # Add an item to the property tree
+        tree_item = self._addGroupItem(name)
+
+        # Select this item
+        self.tree_view.setCurrentIndex(self.tree.indexFromItem(tree_item))
+
+    def _addBlockItem(self, name) -> QStandardItem:
+        """Add a block to the property tree and the sequence editor, and return its tree item."""
         tree_item = QStandardItem(name)
         tree_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable)
-        self.tree.groups.appendRow(tree_item)
+        self.tree.blocks.appendRow(tree_item)
 
-        # Add a view to the widget stack
-        group_view = GroupView()
-        group_view.setModel(self.model().groups[name])
-        scrollarea = QScrollArea()
-        scrollarea.setWidget(group_view)
-        self.groups.addWidget(name, scrollarea)
+        # Add a node to draw the sequence. It is created when it is first dragged
+        self.sequence_editor.toolbox().addItem(name, partial(_sequenceNode, BlockNode, name))
 
-        # Add a node to draw the sequence
-        node = GroupNode()
-        node.setTitle(name)
-        self.sequence_editor.toolbox().addItem(name, node)
+        return tree_item
 
-        # Select this item
-        self.tree_view.setCurrentIndex(self.tree.indexFromItem(tree_item))
+    def _addGroupItem(self, name) -> QStandardItem:
+        """Add a group to the property tree and the sequence editor, and return its tree item."""
+        tree_item = QStandardItem(name)
+        tree_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable)
+        self.tree.groups.appendRow(tree_item)
+
+        # Add a node to draw the sequence. It is created when it is first dragged
+        self.sequence_editor.toolbox().addItem(name, partial(_sequenceNode, GroupNode, name))
+
+        return tree_item
     
     def _onBlockRenamed(self, old_name, new_name):
         """Function that gets called when a block has been renamed."""
@@ -297,20 +349,10 @@ class ExperimentView(QMainWindow):
             if item.text() == old_name:
                 item.setText(new_name)
                 break
-        
-        # Rename in widget stack
-        current_key = self.blocks.currentKey()
-
-        w = self.blocks.removeWidget(old_name)
-        self.blocks.addWidget(new_name, w)
-
-        if current_key == old_name:
-            self.blocks.setCurrentKey(new_name)
 
         # Rename in the sequence editor
-        node = self.sequence_editor.toolbox().removeItem(old_name)
-        node.setTitle(new_name)
-        self.sequence_editor.toolbox().addItem(new_name, node)
+        self.sequence_editor.toolbox().removeItem(old_name)
+        self.sequence_editor.toolbox().addItem(new_name, partial(_sequenceNode, BlockNode, new_name))
 
         for node in self.sequence_editor.scheme().graph.nodes:
             if node.title() == old_name:
@@ -330,20 +372,10 @@ class ExperimentView(QMainWindow):
             if item.text() == old_name:
                 item.setText(new_name)
                 break
-        
-        # Rename in widget stack
-        current_key = self.groups.currentKey()
-
-        w = self.groups.removeWidget(old_name)
-        self.groups.addWidget(new_name, w)
-
-        if current_key == old_name:
-            self.groups.setCurrentKey(new_name)
 
         # Rename in the sequence editor
-        node = self.sequence_editor.toolbox().removeItem(old_name)
-        node.setTitle(new_name)
-        self.sequence_editor.toolbox().addItem(new_name, node)
+        self.sequence_editor.toolbox().removeItem(old_name)
+        self.sequence_editor.toolbox().addItem(new_name, partial(_sequenceNode, GroupNode, new_name))
 
         for node in self.sequence_editor.scheme().graph.nodes:
             if node.title() == old_name:
@@ -364,8 +396,9 @@ class ExperimentView(QMainWindow):
                 self.tree.blocks.removeRow(i)
                 break
         
-        # Remove from widget stack and the sequence editor toolbox
-        self.blocks.removeWidget(name)
+        # Remove from the block view and the sequence editor toolbox
+        if self.block_view.model() not in self.model().blocks.values():
+            self.block_view.setModel(None)
         self.sequence_editor.toolbox().removeItem(name)
     
     def _onGroupRemoved(self, name):
@@ -377,10 +410,21 @@ class ExperimentView(QMainWindow):
                 self.tree.groups.removeRow(i)
                 break
         
-        # Remove from widget stack and the sequence editor toolbox
-        self.groups.removeWidget(name)
+        # Remove from the group view and the sequence editor toolbox
+        if self.group_view.model() not in self.model().groups.values():
+            self.group_view.setModel(None)
         self.sequence_editor.toolbox().removeItem(name)
 
+    def _commitBlockView(self):
+        """Write the block view to its block, if the user changed it."""
+        if self.block_view.isModified():
+            self.block_view.updateModel()
+
+    def _commitGroupView(self):
+        """Write the group view to its group, if the user changed it."""
+        if self.group_view.isModified():
+            self.group_view.updateModel()
+
     # Property tree syncronization =====================================================================================
     def displayTreeItem(self, index: QModelIndex):
         """Display the widget corresponding to the item in the property tree."""
@@ -396,12 +440,18 @@ class ExperimentView(QMainWindow):
             self.central_widget.setCurrentWidget(self.signal_editor)
         elif item.parent() is self.tree.blocks:
             # A block
-            self.central_widget.setCurrentWidget(self.blocks)
-            self.blocks.setCurrentKey(item.text())
+            block = self.model().blocks.get(item.text())
+            if block is not None and self.block_view.model() is not block:
+                self._commitBlockView()
+                self.block_view.setModel(block)
+            self.central_widget.setCurrentWidget(self.block_scrollarea)
         elif item.parent() is self.tree.groups:
             # A group
-            self.central_widget.setCurrentWidget(self.groups)
-            self.groups.setCurrentKey(item.text())
+            group = self.model().groups.get(item.text())
+            if group is not None and self.group_view.model() is not group:
+                self._commitGroupView()
+                self.group_view.setModel(group)
+            self.central_widget.setCurrentWidget(self.group_scrollarea)
         elif item is self.tree.sequence:
             # Sequence editor
             self.central_widget.setCurrentWidget(self.sequence_editor)
@@ -416,6 +466,17 @@ class ExperimentView(QMainWindow):
         self.setWindowTitle(self.projectTitle() + " - NFB Studio")
         return True
 
+    def exportModel(self) -> Optional[str]:
+        """Export the experiment to a string for NFBLab. If the signal scheme has problems that prevent exporting,
+        shows them to the user and returns None.
+        """
+        try:
+            return self.model().export()
+        except ExportError as e:
+            self.central_widget.setCurrentWidget(self.signal_editor)
+            QMessageBox.warning(self, "Unable to export the experiment", str(e))
+            return None
+
     def actionExport(self) -> bool:        
         self.updateModel()
         
@@ -425,7 +486,9 @@ class ExperimentView(QMainWindow):
             self.central_widget.setCurrentWidget(self.sequence_editor)
             return False
 
-        data = self.model().export()
+        data = self.exportModel()
+        if data is None:
+            return False
 
         file_path = QFileDialog.getSaveFileName(filter="XML Files (*.xml)")[0]
         if file_path == "":
@@ -477,7 +540,6 @@ class ExperimentView(QMainWindow):
             return False
 
         self.fileOpen(path)
-        self.setWindowTitle(self.projectTitle() + " - NFB Studio")
         return True
 
     def actionImport(self) -> bool:
@@ -519,6 +581,10 @@ class ExperimentView(QMainWindow):
             self.central_widget.setCurrentWidget(self.sequence_editor)
             return
 
+        data = self.exportModel()
+        if data is None:
+            return
+
         results_path = QFileDialog.getExistingDirectory(
             caption="Select a folder to save experiment results",
             options=QFileDialog.ShowDirsOnly | QFileDialog.DontResolveSymlinks
@@ -526,29 +592,77 @@ class ExperimentView(QMainWindow):
         if results_path == "":
             return False  # Action was cancelled
 
-        data = self.model().export()
+        self.run_manager.submit(self.projectTitle(), data, results_path)
 
-        temp_dir = QDir.tempPath() + "/nfb_studio"
-        os.makedirs(temp_dir, exist_ok=True)
+        self.run_dock.show()
+        self.run_dock.raise_()
 
-        timestamp = datetime.now()
-        file_path = "{}/experiment ({:04d}-{:02d}-{:02d} {:02d}-{:02d}-{:02d}).xml".format(
-            temp_dir,
-            timestamp.year,
-            timestamp.month,
-            timestamp.day,
-            timestamp.hour,
-            timestamp.minute,
-            timestamp.second
-        )
+    def actionCalibrate(self) -> bool:
+        """User action "Calibrate Standardise Nodes". Computes the average and standard deviation of the selected
+        Standardise nodes (or all of them, if none are selected) from the recording that the scheme reads, or from a
+        recording that the user is prompted to select.
+        Nodes are calibrated separately for each data source, since data sources differ in channels and sampling
+        frequency. Calibration runs in the background, with one process per node. Returns True if calibration was
+        started.
+        """
+        self.updateModel()
 
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.write(data)
-        
-        proc = Process(target=run, args=(file_path, results_path))
-        proc.start()
+        nodes = [node for node in self.model().signal_scheme.graph.nodes if isinstance(node, Standardise)]
+        nodes = [node for node in nodes if node.isSelected()] or nodes
+
+        if len(nodes) == 0:
+            QMessageBox.information(self, "NFB Studio", "There are no Standardise nodes to calibrate.")
+            return False
+
+        # Group nodes by the name of their data source (None if it is not connected)
+        groups = {}
+        for node in nodes:
+            data_source = node.dataSourceInfo()
+            name = data_source.name if data_source is not None else None
+            groups.setdefault(name, (data_source, []))[1].append(node)
+
+        tasks = []
+        for data_source, group in groups.values():
+            fs = data_source.frequency if data_source is not None else None
+            channel_names = data_source.channel_names if data_source is not None else None
+
+            if data_source is not None and data_source.recording() is not None:
+                path = data_source.recording().path  # The scheme reads a recording, calibrate from it
+            else:
+                title = "Open Recording"
+                if data_source is not None and len(groups) > 1:
+                    title = "Open Recording of " + data_source.name
+
+                path = QFileDialog.getOpenFileName(
+                    self, title, self.model().raw_data_path, filter="Recordings (*.npy *.h5 *.hdf5 *.xdf)"
+                )[0]
+                if path == "":
+                    return False  # Nothing is started if any recording was not selected
+
+            tasks.append(_CalibrationTask(group, [node.calibrationSignal() for node in group], path, fs, channel_names))
+
+        for task in tasks:
+            task.results.finished.connect(self._onCalibrationFinished)
+            self._calibration_tasks.append(task)
+            QThreadPool.globalInstance().start(task)
+
+        paths = ", ".join(sorted({os.path.basename(task.path) for task in tasks}))
+        self.statusBar().showMessage("Calibrating {} node(s) from {}...".format(len(nodes), paths))
+        return True
+
+    def _onCalibrationFinished(self, task, results, error):
+        self._calibration_tasks.remove(task)
 
-        self._processes.append(proc)
+        if error is not None:
+            self.statusBar().clearMessage()
+            QMessageBox.critical(self, "Calibration failed", "{}\n\n{}".format(task.path, error))
+            return
+
+        for node, (average, standard_deviation) in zip(task.nodes, results):
+            node.setCalibration(average, standard_deviation)
+
+        if not self._calibration_tasks:
+            self.statusBar().showMessage("Calibrated {} node(s)".format(len(task.nodes)), 5000)
 
     def promptSaveChanges(self) -> bool:
         """Prompt the user to save changes to current project.
@@ -578,12 +692,67 @@ class ExperimentView(QMainWindow):
 
     # File operations ==================================================================================================
     def fileOpen(self, path):
-        with open(path, encoding="utf-8") as file:
-            data = file.read()
-        
-        ex = Experiment.load(data)
+        """Start opening an experiment file. The file is read in the background and the experiment is built in parts,
+        with a progress dialog that lets the user cancel. The current experiment is replaced when loading finishes.
+        """
+        if self._loader is not None:
+            self._endOpen().cancel()
+
+        self._loader = ExperimentLoader(path, self)
+        self._loader.progressChanged.connect(self._onOpenProgress)
+        self._loader.finished.connect(self._onOpenFinished)
+        self._loader.failed.connect(self._onOpenFailed)
+
+        self._open_progress = QProgressDialog("Opening \"{}\"...".format(os.path.basename(path)), "Cancel", 0, 0, self)
+        self._open_progress.setWindowModality(Qt.WindowModal)
+        self._open_progress.setMinimumDuration(300)
+        self._open_progress.setAutoReset(False)
+        self._open_progress.canceled.connect(self._onOpenCancelled)
+
+        self._loader.start()
+
+    def _onOpenProgress(self, done, total):
+        self._open_progress.setMaximum(total)
+        self._open_progress.setValue(done)
+
+    def _onOpenFinished(self, ex):
+        loader = self._endOpen()
+
+        start = time.perf_counter()
         self.setModel(ex)
-        self._save_path = path
+        self._save_path = loader.path
+        self.setWindowTitle(self.projectTitle() + " - NFB Studio")
+        duration = time.perf_counter() - start
+
+        # Views are created in one go, which also stalls the GUI
+        open_time = loader.open_time + duration
+        stall = max(loader.longest_stall, duration)
+        logger.debug("Opened \"%s\" in %.3f s, longest GUI stall %.1f ms", loader.path, open_time, stall * 1000)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            self.statusBar().showMessage(
+                "Opened in {:.3f} s, longest GUI stall {:.1f} ms".format(open_time, stall * 1000), 10000
+            )
+
+    def _onOpenFailed(self, error):
+        loader = self._endOpen()
+        QMessageBox.critical(self, "Unable to open the experiment", "{}\n\n{}".format(loader.path, error))
+
+    def _onOpenCancelled(self):
+        self._endOpen().cancel()
+
+    def _endOpen(self) -> ExperimentLoader:
+        """Close the progress dialog of the file that is being opened and return its loader."""
+        loader = self._loader
+        self._loader = None
+
+        self._open_progress.canceled.disconnect(self._onOpenCancelled)
+        self._open_progress.close()
+        self._open_progress.deleteLater()
+        self._open_progress = None
+
+        loader.deleteLater()
+        return loader
 
     def fileSave(self, path):
         self.updateModel()
@@ -609,3 +778,40 @@ class ExperimentView(QMainWindow):
         message.exec_()
 
         self.__excepthook__(etype, value, tb)
+
+
+def _sequenceNode(cls, title):
+    """Create a node of the sequence editor toolbox with a title."""
+    node = cls()
+    node.setTitle(title)
+    return node
+
+
+class _CalibrationResults(QObject):
+    """Carries results from a _CalibrationTask to the GUI thread."""
+    finished = Signal(object, object, object)
+    """Emitted with (task, results, error). Either results or error is None."""
+
+
+class _CalibrationTask(QRunnable):
+    """Calibrate Standardise nodes in a thread pool, using `calibrate_file`."""
+    def __init__(self, nodes, signals, path, fs, channel_names):
+        super().__init__()
+        self.setAutoDelete(False)  # The task is kept until its results are applied
+
+        self.nodes = nodes
+        self.signals = signals
+        self.path = path
+        self.fs = fs
+        self.channel_names = channel_names
+        self.results = _CalibrationResults()
+
+    def run(self):
+        try:
+            results = calibrate_file(self.signals, self.path, self.fs, self.channel_names)
+        except (OSError, ValueError, ImportError) as e:
+            self.results.finished.emit(self, None, str(e))
+        except Exception as e:  # Errors of file readers and of worker processes, which must still end the task
+            self.results.finished.emit(self, None, "{}: {}".format(type(e).__name__, e))
+        else:
+            self.results.finished.emit(self, results, None)
@@ -4,6 +4,7 @@ from PySide2.QtWidgets import (
 )
 from nfb_studio.util import StackedDictWidget
 from nfb_studio.pathedit import PathEdit
+from nfb_studio.stream_registry import StreamRegistry
 
 
 class GeneralView(QWidget):
@@ -20,6 +21,9 @@ class GeneralView(QWidget):
     }
     inlet_type_import_values = {v: k for k, v in inlet_type_export_values.items()}
 
+    default_stream_names = ["NVX136_Data", "Mitsar"]
+    """Stream names offered for the "LSL stream" inlet in addition to streams found on the network."""
+
     def __init__(self, parent=None):
         super().__init__(parent=parent)
         layout = QFormLayout()
@@ -70,9 +74,13 @@ class GeneralView(QWidget):
         self.inlet_type.addItem("LSL generator")
         self.inlet_type.addItem("Field trip buffer")
 
+        # Streams found on the network are added to the list in the background. The name can also be typed in, since
+        # the stream does not have to be running while the experiment is edited.
         self.lsl_stream_name = QComboBox()
-        self.lsl_stream_name.addItem("NVX136_Data")
-        self.lsl_stream_name.addItem("Mitsar")
+        self.lsl_stream_name.setEditable(True)
+        self.lsl_stream_name.addItems(self.default_stream_names)
+        StreamRegistry.instance().streamsChanged.connect(self.updateStreamNames)
+        self.updateStreamNames()
 
         self.lsl_filename = PathEdit()
         dialog = QFileDialog(self, "Open")
@@ -158,6 +166,23 @@ class GeneralView(QWidget):
         ex.show_notch_filters = self.show_notch_filters.isChecked()
         ex.reward_refractory_period = self.reward_refractory_period.value()
 
+    def updateStreamNames(self):
+        """Update the list of LSL stream names with streams found on the network. Never blocks."""
+        names = list(self.default_stream_names)
+        for stream in StreamRegistry.instance().streams():
+            if stream.name not in names:
+                names.append(stream.name)
+
+        if names == [self.lsl_stream_name.itemText(i) for i in range(self.lsl_stream_name.count())]:
+            return
+
+        current = self.lsl_stream_name.currentText()
+        self.lsl_stream_name.blockSignals(True)
+        self.lsl_stream_name.clear()
+        self.lsl_stream_name.addItems(names)
+        self.lsl_stream_name.setCurrentText(current)
+        self.lsl_stream_name.blockSignals(False)
+
     def _adjust(self):
         if self.prefilter_lower_bound_enable.isChecked():
             self.prefilter_lower_bound.setEnabled(True)
@@ -4,12 +4,14 @@ from collections.abc import MutableSequence
 
 from PySide2.QtCore import QObject
 
+from nfb_studio.util import ExportCacheMixin
+
 
 class GroupMetaclass(type(QObject), type(MutableSequence)):
     """Metaclass for Group. Merges QObject and MutableSequence metaclasses."""
 
 
-class Group(QObject, MutableSequence, metaclass=GroupMetaclass):
+class Group(ExportCacheMixin, QObject, MutableSequence, metaclass=GroupMetaclass):
     """A group of experiment blocks.
     Experiment consists of a sequence of blocks and block groups that are executed in some order. A group consists of
     a sequence of blocks. Each block can be repeated one or more times, and can be set to execute in random order.
@@ -37,6 +39,7 @@ class Group(QObject, MutableSequence, metaclass=GroupMetaclass):
     def __delitem__(self, index):
         del self.blocks[index]
         del self.repeats[index]
+        self.export_cache.invalidate()
     
     def __len__(self):
         assert len(self.blocks) == len(self.repeats)
@@ -51,6 +54,7 @@ class Group(QObject, MutableSequence, metaclass=GroupMetaclass):
         
         self.blocks.insert(index, value[0])
         self.repeats.insert(index, value[1])
+        self.export_cache.invalidate()
 
     def serialize(self) -> dict:
         return {
@@ -3,14 +3,17 @@ from PySide2.QtWidgets import QWidget, QFormLayout, QLineEdit, QCheckBox
 
 
 class GroupView(QWidget):
-    """Config widget for a group of blocks."""
-
+    """Config widget for a group of blocks.
+    Like BlockView, one view can be reused for many groups, and remembers if the user changed it (see `isModified`).
+    """
     def __init__(self, parent=None):
         super().__init__(parent)
         layout = QFormLayout()
         self.setLayout(layout)
 
         self._model = None
+        self._modified = False
+        self._updating = False
 
         self.blocks = QLineEdit()
         self.repeats = QLineEdit()
@@ -20,6 +23,10 @@ class GroupView(QWidget):
         layout.addRow("Repeats", self.repeats)
         layout.addRow("Random order", self.random_order)
 
+        self.blocks.textChanged.connect(self._onEdited)
+        self.repeats.textChanged.connect(self._onEdited)
+        self.random_order.stateChanged.connect(self._onEdited)
+
     def model(self):
         return self._model
     
@@ -27,12 +34,18 @@ class GroupView(QWidget):
         self._model = group
         self.updateView()
 
+    def isModified(self) -> bool:
+        """Return True if the user changed the view since the model was set or last updated."""
+        return self._modified
+
     def updateModel(self):
         """Copy data from this view to the group model.
         A similarly named function in the group copies data the opposite way. Use one or the other depending on where
         data was changed.
         """
         model = self.model()
+        if model is None:
+            return
 
         model.random_order = self.random_order.isChecked()
         if self.blocks.text() == "":
@@ -41,12 +54,20 @@ class GroupView(QWidget):
         else:
             model.blocks = self.blocks.text().split(" ")
             model.repeats = [int(number) for number in self.repeats.text().split(" ")]
+        self._modified = False
 
     def updateView(self):
         model = self.model()
+        self._modified = False
         if model is None:
             return
         
+        self._updating = True
         self.blocks.setText(" ".join(model.blocks))
         self.repeats.setText(" ".join([str(x) for x in model.repeats]))
-        self.random_order.setChecked(model.random_order)
\ No newline at end of file
+        self.random_order.setChecked(model.random_order)
+        self._updating = False
+
+    def _onEdited(self):
+        if not self._updating:
+            self._modified = True
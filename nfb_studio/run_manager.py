@@ -0,0 +1,225 @@
+"""Queue and monitoring of experiment runs.
+
+`RunManager` starts experiments with a WarmRunner, at most `maxRunning()` at a time; other runs wait in a queue. Output
+of running experiments is read from their pipes without blocking, by a timer in the Qt event loop, and runs are
+finished when their processes exit. RunView (see `nfb_studio.run_view`) displays the runs of a manager.
+"""
+import time
+from typing import List, Optional
+
+from PySide2.QtCore import QObject, QTimer, Signal
+
+from .runner import WarmRunner
+
+
+class Run:
+    """An experiment that was submitted to a RunManager."""
+    Queued = "Queued"
+    Running = "Running"
+    Finished = "Finished"
+    Failed = "Failed"
+    Cancelled = "Cancelled"
+
+    def __init__(self, name, data, results_path):
+        self.name = name
+        self.data = data
+        """Exported experiment XML."""
+        self.results_path = results_path
+        self.file_path = None
+        """Path of the XML file that pynfb reads (see ExperimentCache), or None if the run has not started yet."""
+
+        self.status = Run.Queued
+        self.exit_code = None
+        """Exit code of the process, or None if it has not exited."""
+        self.output = []
+        """Output of the experiment, as a list of (stream name, text) pairs."""
+
+        self.queued_time = time.time()
+        self.start_time = None
+        self.end_time = None
+
+        self.process = None
+        self.connection = None
+
+    def isActive(self) -> bool:
+        """Return True if the run is queued or running."""
+        return self.status in (Run.Queued, Run.Running)
+
+    def duration(self) -> Optional[float]:
+        """Return the time in seconds that the run has been running, or None if it has not started."""
+        if self.start_time is None:
+            return None
+        return (self.end_time or time.time()) - self.start_time
+
+    def text(self) -> str:
+        """Return all output of the run as one string."""
+        return "".join(text for _, text in self.output)
+
+
+class RunManager(QObject):
+    """Runs experiments in the background, limiting how many run at the same time.
+
+    Example:
+    ```python
+    manager = RunManager()
+    manager.setMaxRunning(4)  # Simulated sessions can run in parallel
+    run = manager.submit("Alpha training", experiment.export(), "results/")
+    manager.outputReceived.connect(lambda run, stream, text: print(text, end=""))
+    ```
+    """
+
+    poll_interval = 50
+    """Interval in milliseconds at which pipes and processes of running experiments are checked."""
+
+    read_limit = 200
+    """Maximum number of messages read from the pipe of a running experiment per check. Other messages are read at the
+    next check, so that an experiment that writes a lot of output does not block the GUI.
+    """
+
+    runAdded = Signal(object)
+    """Emitted with a Run after it was submitted."""
+    runChanged = Signal(object)
+    """Emitted with a Run when its status changed."""
+    runRemoved = Signal(object)
+    """Emitted with a Run that was removed from the list (see `removeFinished`)."""
+    outputReceived = Signal(object, str, str)
+    """Emitted with a Run, the stream name ("stdout" or "stderr") and the text that the experiment wrote."""
+
+    def __init__(self, runner: WarmRunner = None, parent=None):
+        """Create a manager that starts experiments with `runner` (by default, the runner of the application)."""
+        super().__init__(parent)
+        self._runner = runner
+        self._runs = []
+        self._max_running = 1
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.poll_interval)
+        self._timer.timeout.connect(self.poll)
+
+    def runner(self) -> WarmRunner:
+        return self._runner or WarmRunner.instance()
+
+    def runs(self) -> List[Run]:
+        """Return all runs, in the order they were submitted."""
+        return list(self._runs)
+
+    def maxRunning(self) -> int:
+        return self._max_running
+
+    def setMaxRunning(self, count: int, /):
+        """Set how many experiments can run at the same time. Queued runs are started if the limit was raised."""
+        self._max_running = max(1, count)
+        self._startQueued()
+
+    def runningCount(self) -> int:
+        return sum(1 for run in self._runs if run.status == Run.Running)
+
+    # Runs =============================================================================================================
+    def submit(self, name: str, data: str, results_path: str) -> Run:
+        """Add an experiment, exported as XML `data`, to the queue and start it if fewer than `maxRunning()`
+        experiments are running.
+        """
+        run = Run(name, data, results_path)
+        self._runs.append(run)
+        self.runAdded.emit(run)
+
+        self._startQueued()
+        return run
+
+    def cancel(self, run: Run):
+        """Cancel a queued run, or terminate a running one. Does nothing if the run has already ended."""
+        if run.status == Run.Queued:
+            self._finish(run, Run.Cancelled)
+        elif run.status == Run.Running:
+            run.process.terminate()
+            run.process.join(1)
+            self._read(run)
+            self._finish(run, Run.Cancelled)
+            self._startQueued()
+
+    def removeFinished(self):
+        """Remove runs that have ended from the list."""
+        for run in [run for run in self._runs if not run.isActive()]:
+            self._runs.remove(run)
+            self.runRemoved.emit(run)
+
+    def poll(self):
+        """Read output of running experiments and finish runs whose processes exited. Called by a timer."""
+        for run in list(self._runs):
+            if run.status != Run.Running:
+                continue
+
+            self._read(run, self.read_limit)
+
+            if not run.process.is_alive():
+                run.process.join()
+                self._read(run)  # The process is gone, so the rest of its output is no more than the pipe buffer
+                self._finish(run, Run.Finished if run.process.exitcode == 0 else Run.Failed)
+
+        self._startQueued()
+
+    # Internal =========================================================================================================
+    def _startQueued(self):
+        running = self.runningCount()
+
+        for run in self._runs:
+            if running >= self._max_running:
+                break
+
+            if run.status == Run.Queued:
+                try:
+                    run.process, run.connection = self.runner().run(run.data, run.results_path)
+                except (OSError, RuntimeError) as e:
+                    run.output.append(("stderr", str(e)))
+                    self._finish(run, Run.Failed)
+                    continue
+
+                run.status = Run.Running
+                run.start_time = time.time()
+                running += 1
+                self.runChanged.emit(run)
+
+        if running > 0:
+            if not self._timer.isActive():
+                self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _read(self, run, limit=None):
+        """Read available messages from the pipe of a run, without blocking. If `limit` is given, reads at most `limit`
+        messages.
+        """
+        if run.connection is None:
+            return
+
+        count = 0
+
+        try:
+            while (limit is None or count < limit) and run.connection.poll():
+                count += 1
+                message = run.connection.recv()
+
+                if not isinstance(message, tuple):
+                    continue  # The worker reports that it is ready, which is of no interest once it runs
+
+                stream, text = message
+                if stream == "file":
+                    run.file_path = text
+                else:
+                    run.output.append((stream, text))
+                    self.outputReceived.emit(run, stream, text)
+        except (EOFError, OSError):
+            run.connection.close()
+            run.connection = None
+
+    def _finish(self, run, status):
+        if run.connection is not None:
+            run.connection.close()
+            run.connection = None
+
+        run.status = status
+        run.end_time = time.time()
+        if run.process is not None:
+            run.exit_code = run.process.exitcode
+
+        self.runChanged.emit(run)
@@ -0,0 +1,173 @@
+"""Widget that displays experiment runs of a RunManager."""
+import time
+
+from PySide2.QtCore import Qt, QTimer
+from PySide2.QtGui import QTextCursor
+from PySide2.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem, QPlainTextEdit, QPushButton, QSpinBox, QLabel,
+    QSplitter, QHeaderView
+)
+
+from .run_manager import Run, RunManager
+
+
+class RunView(QWidget):
+    """List of experiment runs with their status, exit code and timing, and the output of the selected run."""
+
+    columns = ["Experiment", "Status", "Exit code", "Started", "Duration"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._manager = None
+        self._items = {}
+        """Tree items by Run."""
+
+        # Runs ---------------------------------------------------------------------------------------------------------
+        self.runs = QTreeWidget()
+        self.runs.setHeaderLabels(self.columns)
+        self.runs.setRootIsDecorated(False)
+        self.runs.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.runs.currentItemChanged.connect(self._onCurrentItemChanged)
+
+        # Output -------------------------------------------------------------------------------------------------------
+        self.output = QPlainTextEdit()
+        self.output.setReadOnly(True)
+        self.output.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.output.setMaximumBlockCount(10000)
+
+        splitter = QSplitter(Qt.Horizontal)
+        splitter.addWidget(self.runs)
+        splitter.addWidget(self.output)
+
+        # Controls -----------------------------------------------------------------------------------------------------
+        self.cancel = QPushButton("Cancel")
+        self.cancel.clicked.connect(self.cancelCurrent)
+
+        self.clear = QPushButton("Clear Finished")
+        self.clear.clicked.connect(self.clearFinished)
+
+        self.max_running = QSpinBox()
+        self.max_running.setRange(1, 64)
+        self.max_running.setToolTip("Number of experiments that can run at the same time")
+        self.max_running.valueChanged.connect(self._onMaxRunningChanged)
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.cancel)
+        controls.addWidget(self.clear)
+        controls.addStretch()
+        controls.addWidget(QLabel("Parallel runs:"))
+        controls.addWidget(self.max_running)
+
+        layout = QVBoxLayout()
+        layout.addLayout(controls)
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+
+        # Durations of running experiments are updated every second
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self.updateDurations)
+        self._timer.start()
+
+        self._updateButtons()
+
+    def manager(self) -> RunManager:
+        return self._manager
+
+    def setManager(self, manager: RunManager, /):
+        self._manager = manager
+        self.runs.clear()
+        self._items.clear()
+
+        manager.runAdded.connect(self._onRunAdded)
+        manager.runChanged.connect(self.updateRun)
+        manager.runRemoved.connect(self._onRunRemoved)
+        manager.outputReceived.connect(self._onOutputReceived)
+
+        self.max_running.setValue(manager.maxRunning())
+
+        for run in manager.runs():
+            self._onRunAdded(run)
+
+    def currentRun(self):
+        """Return the selected Run, or None."""
+        item = self.runs.currentItem()
+        return item.data(0, Qt.UserRole) if item is not None else None
+
+    # Actions ==========================================================================================================
+    def cancelCurrent(self):
+        run = self.currentRun()
+        if run is not None:
+            self._manager.cancel(run)
+
+    def clearFinished(self):
+        self._manager.removeFinished()
+
+    # Updating =========================================================================================================
+    def updateRun(self, run: Run):
+        item = self._items.get(run)
+        if item is None:
+            return
+
+        item.setText(0, run.name)
+        item.setText(1, run.status)
+        item.setText(2, str(run.exit_code) if run.exit_code is not None else "")
+        item.setText(3, time.strftime("%H:%M:%S", time.localtime(run.start_time)) if run.start_time else "")
+        item.setText(4, _formatDuration(run.duration()))
+
+        if run is self.currentRun():
+            self._updateButtons()
+
+    def updateDurations(self):
+        for run, item in self._items.items():
+            if run.status == Run.Running:
+                item.setText(4, _formatDuration(run.duration()))
+
+    def _updateButtons(self):
+        run = self.currentRun()
+        self.cancel.setEnabled(run is not None and run.isActive())
+
+    def _onRunAdded(self, run):
+        item = QTreeWidgetItem()
+        item.setData(0, Qt.UserRole, run)
+        self._items[run] = item
+        self.runs.addTopLevelItem(item)
+        self.updateRun(run)
+
+        self.runs.setCurrentItem(item)  # Follow the output of the latest run
+
+    def _onRunRemoved(self, run):
+        item = self._items.pop(run, None)
+        if item is not None:
+            self.runs.takeTopLevelItem(self.runs.indexOfTopLevelItem(item))
+
+    def _onOutputReceived(self, run, stream, text):
+        if run is self.currentRun():
+            self._appendOutput(text)
+
+    def _onCurrentItemChanged(self, current, previous):
+        self.output.clear()
+
+        run = self.currentRun()
+        if run is not None:
+            self._appendOutput(run.text())
+
+        self._updateButtons()
+
+    def _onMaxRunningChanged(self, value):
+        if self._manager is not None:
+            self._manager.setMaxRunning(value)
+
+    def _appendOutput(self, text):
+        self.output.moveCursor(QTextCursor.End)
+        self.output.insertPlainText(text)
+        self.output.ensureCursorVisible()
+
+
+def _formatDuration(seconds) -> str:
+    if seconds is None:
+        return ""
+
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return "{}:{:02d}:{:02d}".format(hours, minutes, seconds)
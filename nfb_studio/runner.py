@@ -0,0 +1,268 @@
+"""Running experiments in pynfb.
+
+Importing pynfb and its scientific stack takes seconds. `WarmRunner` keeps an idle worker process that has already
+imported pynfb and waits for a run request over a pipe. A request contains the exported experiment XML itself, not a
+path to it. When an experiment is started, the request is sent to the warm
+worker, which runs the experiment, and a new worker is started in the background for the next run. Every run gets its
+own process, since pynfb runs one experiment per process.
+
+While an experiment runs, the worker sends everything written to `sys.stdout` and `sys.stderr` back over the same pipe
+as ("stdout", text) and ("stderr", text) messages (see `RunManager`). Before that, it sends ("file", path) with the
+path of the XML file that pynfb reads. Output written directly to the file descriptors by
+C extensions is not captured; it still goes to the console of the application.
+
+pynfb reads experiments from files. Workers write the XML to an `ExperimentCache`, a directory where files are named by
+the hash of their contents, so that starting an unchanged experiment again reuses its file instead of writing a new one.
+"""
+import atexit
+import glob
+import hashlib
+import multiprocessing
+import os
+import sys
+import tempfile
+import traceback
+
+
+class ExperimentCache:
+    """Directory of experiment XML files, named by the SHA-256 hash of their contents.
+    When the files take more than `max_size` bytes, the least recently used ones are deleted. The cache can be passed
+    to other processes, and several processes can use the same directory.
+    """
+
+    default_max_size = 64 * 1024 * 1024
+
+    def __init__(self, directory: str = None, max_size: int = None):
+        """Create a cache in `directory` (by default, a directory in the system temporary folder)."""
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "nfb_studio", "experiments")
+        self.max_size = max_size if max_size is not None else self.default_max_size
+
+    def path(self, data: str) -> str:
+        """Return the path of a file with contents `data`, writing it if it is not in the cache."""
+        encoded = data.encode("utf-8")
+        path = os.path.join(self.directory, hashlib.sha256(encoded).hexdigest() + ".xml")
+
+        try:
+            os.utime(path)  # Mark as recently used
+            return path
+        except FileNotFoundError:
+            pass
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Write to a temporary file first, so that other processes never read a partially written file
+        descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(encoded)
+        os.replace(temp_path, path)
+
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: str = None):
+        """Delete least recently used files until the cache takes at most `max_size` bytes. File `keep` is not deleted.
+        """
+        files = []
+        for path in glob.glob(os.path.join(self.directory, "*.xml")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Deleted by another process
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+
+        for _, size, path in sorted(files):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+class WarmRunner:
+    """Runs experiments in pynfb worker processes that are started ahead of time.
+
+    Example:
+    ```python
+    runner = WarmRunner.instance()
+    runner.start()  # At application launch; returns immediately
+    ...
+    process, connection = runner.run(experiment.export(), "results/")
+    ```
+    """
+    def __init__(self, context=None, cache: ExperimentCache = None):
+        """Create a runner that starts workers with a multiprocessing `context`. Workers are spawned by default, since
+        forking a running Qt application is not safe. Experiment files are kept in `cache`.
+        """
+        self._context = context or multiprocessing.get_context("spawn")
+        self.cache = cache or ExperimentCache()
+
+        self._process = None
+        """Idle worker process, or None."""
+        self._connection = None
+        """Parent end of the pipe to the idle worker."""
+        self._ready = False
+        """True if the idle worker reported that pynfb is imported."""
+        self._exit_registered = False
+
+    @staticmethod
+    def instance() -> "WarmRunner":
+        """Return the runner shared by the application."""
+        global _instance
+
+        if _instance is None:
+            _instance = WarmRunner()
+        return _instance
+
+    def start(self):
+        """Start a warm worker in the background, if there is no idle worker. Returns immediately."""
+        if self._process is not None and self._process.is_alive():
+            return
+
+        self._discardWorker()
+
+        if not self._exit_registered:
+            # An idle worker waits for a request forever, and multiprocessing joins child processes at exit
+            atexit.register(self.shutdown)
+            self._exit_registered = True
+
+        connection, child_connection = self._context.Pipe()
+        self._process = self._context.Process(target=_work, args=(child_connection,), name="nfb_studio runner")
+        self._process.start()
+        child_connection.close()
+
+        self._connection = connection
+        self._ready = False
+
+    def isWarm(self) -> bool:
+        """Return True if an idle worker has finished importing pynfb. Does not block."""
+        if self._process is None or not self._process.is_alive():
+            return False
+
+        if not self._ready and self._connection.poll():
+            try:
+                self._ready = self._connection.recv() == "ready"
+            except EOFError:
+                return False
+
+        return self._ready
+
+    def run(self, data: str, results_path: str):
+        """Run the experiment from XML `data` in the warm worker, saving results in `results_path`, and start
+        a new worker for the next run. If there is no idle worker, one is started now, and the experiment starts after
+        pynfb is imported.
+        Returns the multiprocessing.Process that runs the experiment, and the end of the pipe from which its output is
+        received. The caller is responsible for closing the connection.
+        """
+        for _ in range(2):
+            self.start()
+            process, connection = self._process, self._connection
+            self._process = self._connection = None
+
+            try:
+                connection.send((data, results_path, self.cache))
+            except OSError:
+                connection.close()
+                continue  # The worker exited after it was checked, try a new one
+
+            break
+        else:
+            raise RuntimeError("experiment runner process could not be started")
+
+        self.start()
+        return process, connection
+
+    def shutdown(self):
+        """Stop the idle worker. Running experiments are not affected."""
+        if self._connection is not None:
+            try:
+                self._connection.send(None)
+            except OSError:
+                pass
+
+        self._discardWorker()
+
+    def _discardWorker(self):
+        if self._connection is not None:
+            self._connection.close()
+
+        if self._process is not None:
+            self._process.join(1)
+            if self._process.is_alive():
+                self._process.terminate()
+
+        self._process = self._connection = None
+        self._ready = False
+
+
+_instance = None
+"""The runner returned by `WarmRunner.instance`."""
+
+
+def _work(connection):
+    """Body of a worker process: import pynfb, wait for one request and run it."""
+    try:
+        from pynfb.main import run
+    except Exception:  # Reported when a run is requested, like any other error of the experiment
+        run = None
+        error = traceback.format_exc()
+
+    try:
+        connection.send("ready")
+        request = connection.recv()
+    except (OSError, EOFError):
+        return  # The application exited
+
+    if request is None:
+        return
+
+    sys.stdout = _ConnectionWriter(connection, "stdout", sys.stdout)
+    sys.stderr = _ConnectionWriter(connection, "stderr", sys.stderr)
+
+    if run is None:
+        sys.stderr.write(error)
+        sys.exit(1)
+
+    data, results_path, cache = request
+    file_path = cache.path(data)
+
+    try:
+        connection.send(("file", file_path))
+    except OSError:
+        pass
+
+    os.chdir(results_path)
+    run(file_path)
+
+
+class _ConnectionWriter:
+    """Text stream that sends what is written to it over a connection, and also writes it to another stream."""
+    def __init__(self, connection, name, stream):
+        self.connection = connection
+        self.name = name
+        self.stream = stream
+
+    def write(self, text):
+        if self.stream is not None:
+            self.stream.write(text)
+
+        if self.connection is not None and text:
+            try:
+                self.connection.send((self.name, text))
+            except OSError:
+                self.connection = None  # The application closed its end, keep writing to the console only
+
+        return len(text)
+
+    def flush(self):
+        if self.stream is not None:
+            self.stream.flush()
+
+    def isatty(self):
+        return False
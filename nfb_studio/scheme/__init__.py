@@ -5,6 +5,7 @@ classes related to the graphical node.
 from .editor import SchemeEditor
 from .toolbox import Toolbox
 from .scheme import Scheme
+from .overview import SchemeOverview
 
 from .node import Node, Edge, Connection, Input, Output, DataType, Message, InfoMessage, WarningMessage, ErrorMessage
 
@@ -3,13 +3,15 @@ from PySide2.QtWidgets import QMainWindow, QDockWidget, QWidget
 
 from .scheme import Scheme
 from .toolbox import Toolbox
+from .overview import SchemeOverview
 
 class SchemeEditor(QMainWindow):
     """Scheme editor is the widget responsible for the scheme editing experience.  
     As its main components, SchemeEditor contains the following widgets:
     - scheme - the canvas for dragging and connecting nodes to form signals;
     - toolbox - a list of draggable nodes to be put on the scheme;
-    - (optionally) config widget - a widget for manipulating properties of nodes.
+    - (optionally) config widget - a widget for manipulating properties of nodes;
+    - overview - a small map of the whole scheme for navigation.
     """
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -31,6 +33,15 @@ class SchemeEditor(QMainWindow):
         self.addDockWidget(Qt.RightDockWidgetArea, self.config_widget_dock)
         self.config_widget_dock.hide()
 
+        self._overview = SchemeOverview()
+        self._overview.setView(self._scheme_view)
+
+        self.overview_dock = QDockWidget("Overview", self)
+        self.overview_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
+        self.overview_dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable)
+        self.overview_dock.setWidget(self._overview)
+        self.addDockWidget(Qt.LeftDockWidgetArea, self.overview_dock)
+
     def scheme(self):
         return self._scheme
 
@@ -43,12 +54,16 @@ class SchemeEditor(QMainWindow):
     def toolboxView(self):
         return self.toolbox_dock.widget()
 
+    def overview(self):
+        return self._overview
+
     def setScheme(self, scheme: Scheme):
         if self._scheme is not None:
             self._scheme_view.configRequested.disconnect(self.showConfigWidget)
             self._scheme.setCustomDropEvent(self.toolbox().DragMimeType, None)
 
         self._scheme = scheme
+        self._overview.setScheme(scheme)
 
         if self._scheme is not None:
             self._scheme_view.setScene(self._scheme)
@@ -0,0 +1,69 @@
+"""Shared cache of font metrics and elided text geometry for scheme text items.
+
+Constructing QFontMetricsF and measuring text is comparatively expensive, and the scheme measures the same strings in
+the same fonts over and over (every node of a type has the same title, the same connection labels, and so on). This
+module keeps one QFontMetricsF per font and an LRU cache of elided text and its bounding rectangle.
+"""
+from functools import lru_cache
+from typing import Tuple, Union
+
+from PySide2.QtCore import QRectF
+from PySide2.QtGui import QFont, QFontMetricsF
+
+_metrics = {}
+"""QFontMetricsF objects, by font key (`QFont.key()`)."""
+
+
+def font_metrics(font: QFont) -> QFontMetricsF:
+    """Return a shared QFontMetricsF for `font`.
+    The returned object is shared between all callers and must not be modified.
+    """
+    key = font.key()
+
+    metrics = _metrics.get(key)
+    if metrics is None:
+        metrics = QFontMetricsF(font)
+        _metrics[key] = metrics
+
+    return metrics
+
+
+@lru_cache(maxsize=4096)
+def _elidedText(font_key: str, text: str, width: Union[float, None], mode) -> Tuple[str, tuple]:
+    """Compute elided text and its bounding rectangle.
+    This function is for internal use within this file. The metrics for `font_key` must already be in `_metrics`.
+    """
+    metrics = _metrics[font_key]
+
+    # Get bounding rectangle for full text, constrained by maximum width
+    rect = metrics.boundingRect(text)
+    if width is not None:
+        rect.setWidth(width)
+
+    elided = metrics.elidedText(text, mode, rect.width())
+    rect = metrics.boundingRect(elided)
+
+    return elided, (rect.x(), rect.y(), rect.width(), rect.height())
+
+
+def elided_text(font: QFont, text: str, width: Union[float, None], mode) -> Tuple[str, QRectF]:
+    """Return a tuple (elided text, bounding rectangle of elided text) for a line of text.
+    `width` is the maximum width of the text, or None if the width is unlimited. `mode` is a Qt.TextElideMode.
+    """
+    font_metrics(font)  # Make sure metrics for this font exist
+    elided, rect = _elidedText(font.key(), text, width, mode)
+
+    return elided, QRectF(*rect)
+
+
+def cache_info():
+    """Return statistics of the elided text cache, as returned by `functools.lru_cache`."""
+    return _elidedText.cache_info()
+
+
+def cache_clear():
+    """Clear all cached metrics and text geometry.
+    This should be called if fonts change meaning, for example if application fonts were added or removed.
+    """
+    _elidedText.cache_clear()
+    _metrics.clear()
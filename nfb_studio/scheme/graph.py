@@ -1,23 +1,51 @@
 """Classes representing the graph stucture in the node scheme."""
 from typing import Union
 
+from nfb_studio.serial.base import run_steps
+
 from .graphics_item_group import GraphicsItemGroup
-from .node import Node, Edge, Input, Output
+from .node import Node, Edge, Input, Output, WarningMessage
 
 
 class Graph(GraphicsItemGroup):
-    """A collection of nodes and edges connecting them."""
+    """A collection of nodes and edges connecting them.
+
+    The graph is kept acyclic. Nodes have positions in a topological order (every edge goes from a node to a node with
+    a higher position), which is updated when edges are added, using the dynamic topological sort algorithm of Pearce
+    and Kelly: only nodes between the ends of a new edge in the order are visited and moved. An edge that would create a
+    cycle is found during that visit and rejected with a ValueError.
+    """
+    cycle_message_key = "cycle"
+    """Key of the transient messages (see `Node.setTransientMessages`) about edges that were skipped on load."""
+
     def __init__(self):
         super().__init__()
 
         self.nodes = set()
         self.edges = set()
 
+        self._order = {}
+        """Position of each node in the topological order. Positions are unique, but not contiguous."""
+        self._next_order = 0
+        """Position given to the next added node (the end of the order)."""
+        self._sorted = None
+        """Cached result of `topologicalOrder`, or None if it needs recomputing."""
+
     # Core set methods =================================================================================================
     def add(self, item):
         if isinstance(item, Node):
+            if item not in self._order:
+                self._order[item] = self._next_order
+                self._next_order += 1
+                self._sorted = None
+
             self.nodes.add(item)
+
+            # Edges of the node that were added to the graph before the node itself
+            for edge in self.edgesOf(item):
+                self._insertEdge(edge.sourceNode(), edge.targetNode())
         elif isinstance(item, Edge):
+            self._insertEdge(item.sourceNode(), item.targetNode())
             self.edges.add(item)
         else:
             raise TypeError("Graph accepts only Node and Edge objects, not " + type(item).__name__)
@@ -29,28 +57,125 @@ class Graph(GraphicsItemGroup):
         
         if isinstance(item, Node):
             # If a node is removed, all edges to or from that node are also removed.
-            # Remove connected edges
-            to_remove = []
-            for edge in self.edges:
-                if edge.sourceNode() == item or edge.targetNode() == item:
-                    to_remove.append(edge)
-            
-            for edge in to_remove:
+            for edge in list(self.edgesOf(item)):
                 self.discard(edge)
 
-            # Remove the node
+            # Remove the node. Removing a node (or an edge) keeps the rest of the order valid.
             self.nodes.discard(item)
+            if self._order.pop(item, None) is not None:
+                self._sorted = None
         elif isinstance(item, Edge):
             # Disconnect from nodes that are still in this graph
             item.detachAll()
             self.edges.discard(item)
+
+    # Topological order ================================================================================================
+    def topologicalOrder(self) -> list:
+        """Return nodes of this graph in a topological order: every node comes after the nodes connected to its inputs.
+        The order is maintained as the graph changes, so this function only sorts by the stored positions. The result is
+        cached until nodes are added, removed or moved in the order.
+        """
+        if self._sorted is None:
+            self._sorted = sorted(self._order, key=self._order.__getitem__)
+
+        return list(self._sorted)
+
+    def createsCycle(self, source: Node, target: Node) -> bool:
+        """Return True if an edge from `source` to `target` would create a cycle in this graph.
+        If `source` is before `target` in the topological order, this is known immediately. Otherwise only nodes between
+        them in the order are visited.
+        """
+        if source not in self._order or target not in self._order:
+            return False
+        if source is target:
+            return True
+        if self._order[source] < self._order[target]:
+            return False
+
+        return self._reachable(target, source) is None
+
+    def edgesOf(self, node):
+        """Edges of this graph that have `node` as their source or target."""
+        for connection in node.inputs + node.outputs:
+            for edge in connection.edges:
+                if edge in self.edges:
+                    yield edge
+
+    def _successors(self, node):
+        for output in node.outputs:
+            for edge in output.edges:
+                target = edge.targetNode()
+                if target is not None and edge in self.edges and target in self._order:
+                    yield target
+
+    def _predecessors(self, node):
+        for input in node.inputs:
+            for edge in input.edges:
+                source = edge.sourceNode()
+                if source is not None and edge in self.edges and source in self._order:
+                    yield source
+
+    def _reachable(self, start, stop):
+        """Return nodes reachable from `start` that are not after `stop` in the order, or None if `stop` is reachable.
+        """
+        bound = self._order[stop]
+        visited = {start}
+        stack = [start]
+
+        while stack:
+            for successor in self._successors(stack.pop()):
+                if successor is stop:
+                    return None
+                if successor not in visited and self._order[successor] < bound:
+                    visited.add(successor)
+                    stack.append(successor)
+
+        return visited
+
+    def _insertEdge(self, source, target):
+        """Update the order for a new edge from `source` to `target`. Raises ValueError if the edge creates a cycle."""
+        if source not in self._order or target not in self._order:
+            return  # Dangling edge, or a node that is not in this graph (yet)
+
+        lower = self._order[target]
+        upper = self._order[source]
+        if source is not target and upper < lower:
+            return  # The order is still valid
+
+        forward = self._reachable(target, source) if source is not target else None
+        if forward is None:
+            raise ValueError("connecting \"{}\" to \"{}\" would create a cycle".format(source.title(), target.title()))
+
+        # Nodes that reach `source` and are after `target` in the order
+        backward = {source}
+        stack = [source]
+
+        while stack:
+            for predecessor in self._predecessors(stack.pop()):
+                if predecessor not in backward and self._order[predecessor] > lower:
+                    backward.add(predecessor)
+                    stack.append(predecessor)
+
+        # Move the backward set before the forward set, reusing the positions that both sets occupy
+        key = self._order.__getitem__
+        moved = sorted(backward, key=key) + sorted(forward, key=key)
+        positions = sorted(self._order[node] for node in moved)
+
+        for node, position in zip(moved, positions):
+            self._order[node] = position
+        self._sorted = None
     
     # Edge manipulation ================================================================================================
     def connect_nodes(self, source: Output, target: Input) -> Edge:
         """Connect an Output connection to an Input connection with an edge.
         
-        Returns the newly created edge.
+        Returns the newly created edge. Raises ValueError if the edge would create a cycle.
         """
+        if self.createsCycle(source.parentItem(), target.parentItem()):
+            raise ValueError("connecting \"{}\" to \"{}\" would create a cycle".format(
+                source.parentItem().title(), target.parentItem().title()
+            ))
+
         edge = Edge()
         edge.setSource(source)
         edge.setTarget(target)
@@ -58,6 +183,22 @@ class Graph(GraphicsItemGroup):
         self.add(edge)
         return edge
 
+    def loadEdge(self, source: Output, target: Input) -> Union[Edge, None]:
+        """Connect an Output connection to an Input connection with an edge that was read from a file.
+
+        Files saved before the graph was kept acyclic may contain cycles. An edge that would create a cycle is skipped
+        instead, and a warning is shown on its target node. Returns the new edge, or None if it was skipped.
+        """
+        try:
+            return self.connect_nodes(source, target)
+        except ValueError:
+            node = target.parentItem()
+            message = WarningMessage("Connection from \"{}\" to \"{}\" was removed: it created a cycle".format(
+                source.parentItem().title(), target.text()
+            ))
+            node.setTransientMessages(self.cycle_message_key, node.transientMessages(self.cycle_message_key) + [message])
+            return None
+
     def disconnect_nodes(self, source: Output, target: Input) -> Union[Edge, None]:
         """Remove a connection between a node output and an input.
         
@@ -181,11 +322,19 @@ class Graph(GraphicsItemGroup):
         Edges are not serialized as objects. Instead, only their connections are remembered and reconstructed during the
         deserialization.
         """
+        return run_steps(cls.deserialize_steps(data))
+
+    @classmethod
+    def deserialize_steps(cls, data: dict):
+        """Deserialize this object like `deserialize`, yielding after every node and edge that is added (see
+        `BaseDecoder.decode_steps`).
+        """
         obj = cls()
 
         # Deserialize nodes --------------------------------------------------------------------------------------------
         for node in data["nodes"]:
             obj.add(node)
+            yield
 
         # Deserialize edges --------------------------------------------------------------------------------------------
         for edge_data in data["edges"]:
@@ -195,6 +344,7 @@ class Graph(GraphicsItemGroup):
             source = source_node.outputs[edge_data["source"]["connection_index"]]
             target = target_node.inputs[edge_data["target"]["connection_index"]]
 
-            obj.connect_nodes(source, target)
+            obj.loadEdge(source, target)
+            yield
 
         return obj
@@ -1,8 +1,8 @@
-from PySide2.QtCore import QRectF
-from PySide2.QtGui import QPainter
+from PySide2.QtCore import Qt, QPointF, QRectF, QLineF
+from PySide2.QtGui import QPainter, QPen
 from PySide2.QtWidgets import QGraphicsItem, QGraphicsLineItem
 
-from ...text_line_item import TextLineItem
+from ...text_line_item import TextLineItem, text_line_geometry
 from ...style import Style
 from ...scheme_item import SchemeItem
 from .data_type import DataType
@@ -10,7 +10,13 @@ from .trigger import Trigger
 
 
 class Connection(SchemeItem):
-    """Connection is an input or output from a Node."""
+    """Connection is an input or output from a Node.
+
+    By default a connection draws itself using child items: a text label, a stem line and an invisible trigger that
+    handles edge drawing. In compact mode (see `setCompact`) these child items are not created. Instead, the parent
+    node draws stems and labels in its own paint pass and handles edge drawing using geometry computed by the
+    connection.
+    """
     EdgeDragMimeType = Trigger.DragMimeType
 
     def __init__(self, text=None, datatype: DataType = None, parent: QGraphicsItem = None):
@@ -18,16 +24,21 @@ class Connection(SchemeItem):
 
         self.setFlag(self.ItemSendsScenePositionChanges)  # To enable edge adjusting
         self.setFlag(self.ItemIsSelectable)
-        self.setFlag(self.ItemHasNoContents)  # Drawing occurs using child items
+        self.setFlag(self.ItemHasNoContents)  # Drawing occurs using child items or the parent node
 
         self.edges = set()
         """Edges attached to this connection. To change this set use `Connection`'s methods: attach, detach, detachAll.
         """
 
-        self._text_item = TextLineItem(text or "Connection", self)
-        self._stem_item = QGraphicsLineItem(self)
+        self._text = text or "Connection"
+        self._text_visible = True
+        self._compact = False
+        """If True, the connection has no child items and is drawn by the parent node."""
 
-        self._trigger_item = Trigger(self)
+        self._text_item = None
+        self._stem_item = None
+        self._trigger_item = None
+        self._createItems()
 
         self._datatype = datatype or DataType.Unknown
         self._is_multiple = False
@@ -60,14 +71,70 @@ class Connection(SchemeItem):
     
     # Operations =======================================================================================================
     def showText(self):
-        self._text_item.setVisible(True)
+        self._setTextVisible(True)
 
     def hideText(self):
-        self._text_item.setVisible(False)
+        self._setTextVisible(False)
+
+    def _setTextVisible(self, visible: bool):
+        self._text_visible = visible
+
+        if self._text_item is not None:
+            self._text_item.setVisible(visible)
+        self._compactGeometryChanged()
+
+    # Compact mode =====================================================================================================
+    def isCompact(self) -> bool:
+        """Return True if this connection is in compact mode and is drawn by its parent node."""
+        return self._compact
+
+    def setCompact(self, compact: bool):
+        """Enable or disable compact mode.
+        In compact mode the connection has no child items. Its stem and label are painted by the parent node, and edge
+        drawing is handled by the parent node using `triggerContains`.
+        """
+        if compact == self._compact:
+            return
+
+        self._compact = compact
+
+        if compact:
+            self._destroyItems()
+        else:
+            self._createItems()
+            self.styleChange()
+            self.paletteChange()
+
+        self._compactGeometryChanged()
+
+    def _createItems(self):
+        """Create child items that draw the connection."""
+        self._text_item = TextLineItem(self._text, self)
+        self._text_item.setVisible(self._text_visible)
+        self._stem_item = QGraphicsLineItem(self)
+        self._trigger_item = Trigger(self)
+
+    def _destroyItems(self):
+        """Remove child items that draw the connection."""
+        for item in (self._text_item, self._stem_item, self._trigger_item):
+            item.setParentItem(None)
+            if item.scene() is not None:
+                item.scene().removeItem(item)
+
+        self._text_item = None
+        self._stem_item = None
+        self._trigger_item = None
+
+    def _compactGeometryChanged(self):
+        """Notify the parent node that compact geometry has changed, if the connection is drawn by it."""
+        parent = self.parentItem()
+
+        if self.isCompact() and parent is not None and hasattr(parent, "connectionGeometryChange"):
+            parent.connectionGeometryChange()
 
     # Member access ====================================================================================================
     def text(self):
-        return self._text_item.text()
+        return self._text
 
     def dataType(self):
         return self._datatype
@@ -76,14 +143,22 @@ class Connection(SchemeItem):
         return self._is_multiple
 
     def setText(self, text):
-        self._text_item.setText(text)
+        self._text = text
+
+        if self._text_item is not None:
+            self._text_item.setText(text)
+        self._compactGeometryChanged()
 
     def setDataType(self, datatype):
+        """Set the data type of this connection.
+        Edges that are already attached are kept, even if their data types are no longer compatible. The nodes on their
+        target side are notified with `upstreamChange`, so that validation can report the mismatch.
+        """
         self._datatype = datatype
 
         for edge in self.edges:
-            # Verify that all edges are fine with changing the data type.
-            edge.checkDataType()
+            if edge.targetNode() is not None:
+                edge.targetNode().upstreamChange()
     
     def setMultiple(self, multiple: bool):
         self._is_multiple = multiple
@@ -96,6 +171,14 @@ class Connection(SchemeItem):
     def stemTip(self):
         """Return position of stem's root (where the stem connects to the edge) in local inches."""
         raise NotImplementedError
+
+    def textPos(self) -> QPointF:
+        """Return position of the text label's origin point in local coordinates."""
+        raise NotImplementedError
+
+    def textAlignment(self):
+        """Return horizontal alignment of the text label relative to its origin point."""
+        raise NotImplementedError
     
     def boundingRect(self):
         return QRectF()
@@ -103,25 +186,108 @@ class Connection(SchemeItem):
     def paint(self, painter: QPainter, option, widget=...) -> None:
         pass
 
+    def triggerContains(self, pos: QPointF) -> bool:
+        """Return True if `pos` (in local coordinates) is inside the area from which an edge can be drawn."""
+        radius = self.style().pixelMetric(Style.EdgeDragPrecisionRadius)
+
+        return QLineF(pos, self.stemTip()).length() <= radius
+
+    def _textGeometry(self):
+        """Elided text and its drawing rectangle in local coordinates, as drawn in compact mode."""
+        style = self.style()
+
+        elided, rect = text_line_geometry(
+            style.font(Style.ConnectionTextFont),
+            self.text(),
+            style.pixelMetric(Style.ConnectionTextLength),
+            Qt.ElideRight,
+            self.textAlignment()
+        )
+        rect.translate(self.textPos())
+
+        return elided, rect
+
+    def compactRect(self) -> QRectF:
+        """Return the rectangle (in local coordinates) that the parent node paints for this connection in compact mode.
+        This includes the stem, the edge drawing area and, if shown, the text label.
+        """
+        radius = self.style().pixelMetric(Style.EdgeDragPrecisionRadius)
+        result = QRectF(self.stemRoot(), self.stemTip()).normalized().adjusted(-radius, -radius, radius, radius)
+
+        if self._text_visible:
+            result |= self._textGeometry()[1]
+
+        return result
+
+    def paintCompact(self, painter: QPainter):
+        """Paint the stem and the text label in local coordinates. Used by the parent node in compact mode."""
+        style = self.style()
+        palette = self.palette()
+
+        painter.setPen(style.edgePen(palette))
+        painter.drawLine(QLineF(self.stemRoot(), self.stemTip()))
+
+        if self._text_visible:
+            elided, rect = self._textGeometry()
+
+            text_bg = palette.background().color()
+            text_bg.setAlpha(196)
+
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(text_bg)
+            painter.drawRect(rect)
+
+            painter.setPen(QPen(palette.text().color()))
+            painter.setFont(style.font(Style.ConnectionTextFont))
+            painter.drawText(rect, self.textAlignment(), elided)
+
     # Style and palette ================================================================================================
     def styleChange(self):
         super().styleChange()
         style = self.style()
 
-        self._text_item.setFont(style.font(Style.ConnectionTextFont))
-        self._text_item.setMaximumWidth(style.pixelMetric(Style.ConnectionTextLength))
+        if self._text_item is not None:
+            with self._text_item.batchUpdate():
+                self._text_item.setFont(style.font(Style.ConnectionTextFont))
+                self._text_item.setMaximumWidth(style.pixelMetric(Style.ConnectionTextLength))
+
+        if self._stem_item is not None:
+            self._stem_item.setPen(style.edgePen(self.palette()))
+
+    def _updateGeometry(self):
+        """Place child items, or notify the parent node in compact mode.
+        Geometry (`stemRoot`, `stemTip`, `textPos`, `textAlignment`) is defined by subclasses, which call this function
+        from their `styleChange`.
+        """
+        self.prepareGeometryChange()
+
+        if self._text_item is not None:
+            self._text_item.setAlignMode(self.textAlignment())
+            self._text_item.setPos(self.textPos())
+
+        if self._stem_item is not None:
+            self._stem_item.setLine(QLineF(self.stemRoot(), self.stemTip()))
+
+        if self._trigger_item is not None:
+            self._trigger_item.setPos(self.stemTip())
 
-        self._stem_item.setPen(style.edgePen(self.palette()))
+        self._compactGeometryChanged()
     
     def paletteChange(self):
         super().paletteChange()
-        text_bg = self.palette().background().color()
-        text_bg.setAlpha(196)
 
-        self._text_item.setBackgroundBrush(text_bg)
-        self._text_item.setBrush(self.palette().text())
+        if self._text_item is not None:
+            text_bg = self.palette().background().color()
+            text_bg.setAlpha(196)
 
-        self._stem_item.setPen(self.style().edgePen(self.palette()))
+            self._text_item.setBackgroundBrush(text_bg)
+            self._text_item.setBrush(self.palette().text())
+
+        if self._stem_item is not None:
+            self._stem_item.setPen(self.style().edgePen(self.palette()))
+
+        if self.isCompact() and self.parentItem() is not None:
+            self.parentItem().update()
 
     # Events ===========================================================================================================
     def itemChange(self, change, value):
@@ -169,7 +335,7 @@ class Connection(SchemeItem):
     def serialize(self) -> dict:
         return {
             "text": self.text(),
-            "datatype": self.dataType(),
+            "datatype": self.dataType().data_id,
             "is_multiple": self.isMultiple(),
         }
 
@@ -177,7 +343,12 @@ class Connection(SchemeItem):
     def deserialize(cls, data: dict):
         obj = cls()
         obj.setText(data["text"])
-        obj.setDataType(data["datatype"])
+
+        # Older files contain full DataType objects instead of ids
+        datatype = data["datatype"]
+        if not isinstance(datatype, DataType):
+            datatype = DataType(datatype)
+        obj.setDataType(datatype)
         obj.setMultiple(data["is_multiple"])
 
         return obj
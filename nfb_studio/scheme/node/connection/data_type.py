@@ -1,19 +1,54 @@
+_registry = {}
+"""All data types by data id."""
+
+_matrix = None
+"""Compatibility matrix of registered data types: `_matrix[a._index][b._index]` is True if a is convertible to b.
+None if it needs recomputing after a data type was registered or changed.
+"""
+
+
 class DataType:
-    def __init__(self, data_id=None, *, convertible_from=(), convertible_to=()):
+    """Type of data that passes through a node connection.
+
+    Data types are interned: there is one DataType object for each data id, and constructing a DataType with an id that
+    is already registered returns the registered object, adding the new conversions to it. This makes data types
+    hashable and cheap to compare, and lets connections serialize only the data id. Compatibility of registered types
+    is kept in a boolean matrix, so `convertible` is two lookups.
+
+    `data_id` is the defining attribute of a data type.
+    """
+    __slots__ = ("data_id", "_convertible_from", "_convertible_to", "_index")
+
+    def __new__(cls, data_id=None, *, convertible_from=(), convertible_to=()):
         """Constructs a DataType from two parameters.
-        
-        The parameters are:  
+
+        The parameters are:
         - data_id - the ID of the data type. Types compare equal when their IDs are the same;
         - convertible_from - an iterable of DataType instances or ids that this type can be converted from;
         - convertible_to - an iterable of DataType instances or ids that this type can be converted to;
         """
-        self.data_id = data_id or 0
-        """Data type's data id.  
-        Data id is the defining attribute of a data type. Data types with the same id compare equal.
-        """
+        global _matrix
+
+        data_id = data_id or 0
+        obj = _registry.get(data_id)
 
-        self.convertible_from = convertible_from
-        self.convertible_to = convertible_to
+        if obj is None:
+            obj = super().__new__(cls)
+            obj.data_id = data_id
+            obj._convertible_from = ()
+            obj._convertible_to = ()
+            obj._index = len(_registry)
+
+            _registry[data_id] = obj
+            _matrix = None
+
+        obj._addConversions(convertible_from, convertible_to)
+        return obj
+
+    @staticmethod
+    def get(data_id):
+        """Return the registered data type with id `data_id`. Raises KeyError if it is not registered."""
+        return _registry[data_id or 0]
 
     def serialize(self) -> dict:
         return {
@@ -24,48 +59,51 @@ class DataType:
 
     @classmethod
     def deserialize(cls, data: dict):
-        obj = cls()
-        obj.data_id = data["data_id"]
-        obj.convertible_from = data["convertible_from"]
-        obj.convertible_to = data["convertible_to"]
+        return cls(data["data_id"], convertible_from=data["convertible_from"], convertible_to=data["convertible_to"])
 
-        return obj
+    def __reduce__(self):
+        # Unpickled and copied data types are interned as well
+        state = {"convertible_from": self.convertible_from, "convertible_to": self.convertible_to}
+        return DataType, (self.data_id,), state
+
+    def __setstate__(self, state):
+        self._addConversions(state["convertible_from"], state["convertible_to"])
 
     def __repr__(self):
         return "DataType({})".format(self.data_id)
 
     def __eq__(self, other):
+        if not isinstance(other, DataType):
+            return NotImplemented
         return self.data_id == other.data_id
 
+    def __hash__(self):
+        return hash(self.data_id)
+
     @property
     def convertible_from(self):
-        return self._convertible_from
-    
-    @convertible_from.setter
-    def convertible_from(self, val):
-        self._convertible_from = []
-
-        # If the item is a datatype object, take its id. Otherwise assume the id is already the item
-        for item in val:
-            if isinstance(item, type(self)):
-                self._convertible_from.append(item.data_id)
-            else:
-                self._convertible_from.append(item)
+        """Ids of data types that this type can be converted from."""
+        return list(self._convertible_from)
 
     @property
     def convertible_to(self):
-        return self._convertible_to
-    
-    @convertible_to.setter
-    def convertible_to(self, val):
-        self._convertible_to = []
+        """Ids of data types that this type can be converted to."""
+        return list(self._convertible_to)
+
+    def _addConversions(self, convertible_from, convertible_to):
+        global _matrix
 
         # If the item is a datatype object, take its id. Otherwise assume the id is already the item
-        for item in val:
-            if isinstance(item, type(self)):
-                self._convertible_to.append(item.data_id)
-            else:
-                self._convertible_to.append(item)
+        ids_from = tuple(item.data_id if isinstance(item, DataType) else item for item in convertible_from)
+        ids_to = tuple(item.data_id if isinstance(item, DataType) else item for item in convertible_to)
+
+        new_from = tuple(i for i in dict.fromkeys(ids_from) if i not in self._convertible_from)
+        new_to = tuple(i for i in dict.fromkeys(ids_to) if i not in self._convertible_to)
+
+        if new_from or new_to:
+            self._convertible_from += new_from
+            self._convertible_to += new_to
+            _matrix = None
 
 DataType.Invalid = DataType()
 """Data type that results from default-constructing a DataType object."""
@@ -74,10 +112,29 @@ DataType.Unknown = DataType(1)
 """Data type that is assigned to default-constructed node connections."""
 
 
+def _compatibility():
+    """Return the compatibility matrix, computing it if needed."""
+    global _matrix
+
+    if _matrix is None:
+        types = list(_registry.values())
+        matrix = [[False] * len(types) for _ in types]
+
+        for a in types:
+            matrix[a._index][a._index] = True
+
+            for data_id in a._convertible_to:
+                if data_id in _registry:
+                    matrix[a._index][_registry[data_id]._index] = True
+            for data_id in a._convertible_from:
+                if data_id in _registry:
+                    matrix[_registry[data_id]._index][a._index] = True
+
+        _matrix = matrix
+
+    return _matrix
+
+
 def convertible(datatype_from: DataType, datatype_to: DataType):
     """Return True if an edge can be created between an output with type datatype_from and input datatype_to."""
-    return (
-        datatype_from == datatype_to
-        or datatype_from.data_id in datatype_to.convertible_from
-        or datatype_to.data_id in datatype_from.convertible_to
-    )
+    return _compatibility()[datatype_from._index][datatype_to._index]
@@ -1,6 +1,6 @@
-from PySide2.QtCore import Qt, QPointF, QLineF
-from PySide2.QtGui import QFontMetricsF
+from PySide2.QtCore import Qt, QPointF
 
+from ...font_metrics import font_metrics
 from ...style import Style
 from .data_type import DataType, convertible
 from .connection import Connection
@@ -12,13 +12,8 @@ class Input(Connection):
     def __init__(self, text=None, datatype: DataType = None):
         super().__init__(text or "Input", datatype)
 
-        self._text_item.setAlignMode(Qt.AlignRight)
-        self._trigger_item.setPos(self.stemTip())
-
         self.setMultiple(False)
 
-        self.styleChange()
-
     # Working with edges ===============================================================================================
     def attach(self, edge):
         """Attach an edge to this connection."""
@@ -42,14 +37,7 @@ class Input(Connection):
     # Style and palette ================================================================================================
     def styleChange(self):
         super().styleChange()
-        self.prepareGeometryChange()
-        style = self.style()
-
-        margin = style.pixelMetric(Style.ConnectionStemTextMargin)
-        metrics = QFontMetricsF(self._text_item.font())
-
-        self._stem_item.setLine(QLineF(self.stemRoot(), self.stemTip()))
-        self._text_item.setPos(self.stemTip().x() - margin, metrics.capHeight() / 2)
+        self._updateGeometry()
 
     # Geometry and drawing =============================================================================================
     def stemRoot(self):
@@ -62,16 +50,34 @@ class Input(Connection):
 
         return self.stemRoot() - QPointF(stem_length, 0)
 
+    def textPos(self):
+        """Return position of the text label's origin point in local coordinates."""
+        style = self.style()
+
+        margin = style.pixelMetric(Style.ConnectionStemTextMargin)
+        metrics = font_metrics(style.font(Style.ConnectionTextFont))
+
+        return QPointF(self.stemTip().x() - margin, metrics.capHeight() / 2)
+
+    def textAlignment(self):
+        """Return horizontal alignment of the text label relative to its origin point."""
+        return Qt.AlignRight
+
     # Drawing edges ====================================================================================================
     # The heavy lifting such as detecting when the edge started being drawn, mouse moving and data transfers are handled
-    # by a member item called self._trigger_item. Connection handles the logic.
+    # by a member item called self._trigger_item, or by the parent node in compact mode. Connection handles the logic.
     def edgeDragAccept(self):
         """Called when a new edge is being dragged into the drop zone.  
         Returns True or False depending on whether the dragged edge should be accepted or not.
         """
-        fake_edge = self.scene()._dragging_edge  # The edge being dragged as the mouse moves
+        scene = self.scene()
+        fake_edge = scene._dragging_edge  # The edge being dragged as the mouse moves
 
-        return fake_edge.target() is None and convertible(fake_edge.dataType(), self.dataType())
+        return (
+            fake_edge.target() is None
+            and convertible(fake_edge.dataType(), self.dataType())
+            and not scene.createsCycle(fake_edge.sourceNode(), self.parentItem())
+        )
 
     def edgeDragDrop(self):
         """Called when a new edge has been dragged and was dropped.  
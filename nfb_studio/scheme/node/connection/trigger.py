@@ -5,6 +5,23 @@ from PySide2.QtWidgets import QGraphicsSceneMouseEvent, QGraphicsSceneDragDropEv
 from ...scheme_item import SchemeItem
 from ...style import Style
 
+
+def exec_edge_drag(connection, widget):
+    """Run a drag and drop operation that draws an edge from `connection`.
+    This function blocks until the drag is finished, and concludes the edge drawing process regardless of the outcome.
+    """
+    connection.edgeDragStart()
+
+    package = QMimeData()
+    package.setData(Trigger.DragMimeType, bytes())
+
+    drag = QDrag(widget)
+    drag.setMimeData(package)
+    drag.exec_()
+
+    connection.edgeDragStop()
+
+
 class Trigger(SchemeItem):
     """Special invisible item that handles the area from which and to which the edge can be drawn."""
     DragMimeType = "application/x-nfb_studio-edge_drag"
@@ -43,16 +60,7 @@ class Trigger(SchemeItem):
             < QApplication.startDragDistance()):
             return
         
-        self.parentItem().edgeDragStart()
-
-        package = QMimeData()
-        package.setData(self.DragMimeType, bytes())
-
-        drag = QDrag(event.widget())
-        drag.setMimeData(package)
-        drag.exec_()
-
-        self.parentItem().edgeDragStop()
+        exec_edge_drag(self.parentItem(), event.widget())
 
     def dragEnterEvent(self, event: QGraphicsSceneDragDropEvent):
         package = event.mimeData()
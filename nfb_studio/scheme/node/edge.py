@@ -125,6 +125,8 @@ class Edge(SchemeItem):
         Unsetting the target sets the target position to None, which causes the edge to not be drawn, until another
         target (or target position) is supplied.
         """
+        old_target_node = self.targetNode()
+
         if (self._target is not None) and (self._target is not target):
             # Remove self direcly from self._target.edges instead of calling self._target.detach
             # to prevent infinite recursion.
@@ -139,6 +141,11 @@ class Edge(SchemeItem):
         self.checkDataType()
         self.adjust()
 
+        if old_target_node is not None and old_target_node is not self.targetNode():
+            old_target_node.upstreamChange()
+        if self.targetNode() is not None:
+            self.targetNode().upstreamChange()
+
     def setSource(self, source: Union[Output, None]):
         """Set (or unset) the source of this edge.
 
@@ -159,6 +166,9 @@ class Edge(SchemeItem):
         self.checkDataType()
         self.adjust()
 
+        if self.targetNode() is not None:
+            self.targetNode().upstreamChange()
+
     def setTargetPos(self, pos: QPointF):
         """Set target position not from a target connection, but to some static coordinates.
 
@@ -279,7 +289,7 @@ class Edge(SchemeItem):
         if change == self.ItemSelectedChange:
             scheme = self.scene()
 
-            if len(scheme.selection().nodes) != 0:
+            if scheme is not None and len(scheme.selection().nodes) != 0:
                 # If nodes are selected, edges are allowed to be selected only between two nodes. 
                 value = self._autoSelectValue()
         # ItemSelectedHasChanged ---------------------------------------------------------------------------------------
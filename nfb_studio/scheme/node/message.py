@@ -2,11 +2,12 @@ import os
 from functools import lru_cache
 
 from PySide2.QtCore import QRectF
-from PySide2.QtGui import QPainter, QFontMetricsF
+from PySide2.QtGui import QPainter
 from PySide2.QtWidgets import QGraphicsItem
 from PySide2.QtSvg import QGraphicsSvgItem, QSvgRenderer
 
 import nfb_studio
+from ..font_metrics import font_metrics
 from ..text_line_item import TextLineItem
 from ..scheme_item import SchemeItem
 from ..style import Style
@@ -67,11 +68,12 @@ class Message(SchemeItem):
         style = self.style()
 
         # Text item ----------------------------------------------------------------------------------------------------
-        self._text_item.setFont(style.font(Style.MessageTextFont))
-        self._text_item.setMaximumWidth(style.pixelMetric(Style.MessageTextLength))
+        with self._text_item.batchUpdate():
+            self._text_item.setFont(style.font(Style.MessageTextFont))
+            self._text_item.setMaximumWidth(style.pixelMetric(Style.MessageTextLength))
 
         # Position
-        text_metrics = QFontMetricsF(self._text_item.font())
+        text_metrics = font_metrics(self._text_item.font())
         icon_size = style.pixelMetric(Style.MessageIconSize)
         margin = style.pixelMetric(Style.MessageIconTextMargin)
 
@@ -1,14 +1,16 @@
-from PySide2.QtCore import QPointF, QSizeF, QRectF
-from PySide2.QtGui import QPainter, QPainterPath, QFontMetricsF
-from PySide2.QtWidgets import QGraphicsLineItem, QGraphicsPathItem
+from PySide2.QtCore import Qt, QPointF, QSizeF, QRectF, QLineF
+from PySide2.QtGui import QPainter, QPainterPath
+from PySide2.QtWidgets import QGraphicsLineItem, QGraphicsPathItem, QApplication
 from sortedcontainers import SortedList
 
+from ..font_metrics import font_metrics
 from ..text_line_item import TextLineItem
 from ..text_rect_item import TextRectItem
 from ..unitconv import inches_to_pixels as px, pixels_to_inches as inch
 from ..scheme_item import SchemeItem
 from ..style import Style
-from .connection import Input, Output
+from .connection import Input, Output, Connection
+from .connection.trigger import exec_edge_drag
 from .message import Message
 from .util import clamp
 
@@ -17,11 +19,16 @@ class Node(SchemeItem):
     """The main component of the graph scene.
 
     A node represents a single vertex of the graph, with its associated information and inputs/outputs.
+
+    If compact connections are enabled (see `setCompactConnections`), the node paints its inputs and outputs in its own
+    paint pass and handles edge drawing from them. This avoids creating several child items per connection, which
+    matters for schemes with many nodes.
     """
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFlag(self.ItemIsMovable)
         self.setFlag(self.ItemIsSelectable)
+        self.setFlag(self.ItemSendsGeometryChanges)  # To keep the index of a virtualized scheme up to date
 
         # Default size and text
         self._size = QSizeF(0, 115)
@@ -35,9 +42,23 @@ class Node(SchemeItem):
         self.inputs = []
         self.outputs = []
         self.messages = SortedList(key=lambda item: item.severity())
+        self._transient_messages = {}
+        """Messages produced by validation, by key. See `setTransientMessages`."""
 
         self._config_widget = None
 
+        # Compact connections
+        self._compact_connections = False
+        self._connections_rect = None
+        """Cached union of compact connection rectangles in local coordinates, or None if it needs recomputing."""
+        self._edge_drag_connection = None
+        """Connection under the mouse when the left button was pressed, from which an edge can be drawn."""
+
+        self._scheme = None
+        """Scheme that this node was added to. Unlike `scene()`, it is kept while the node is parked (see
+        `Scheme.setVirtualized`).
+        """
+
         # Set proper style and color for the item
         self.styleChange()
         self.paletteChange()
@@ -57,6 +78,48 @@ class Node(SchemeItem):
         for output in self.outputs:
             output.hideText() 
 
+    def setCompactConnections(self, compact: bool):
+        """Enable or disable compact connections.
+        When enabled, inputs and outputs have no child items and are painted by this node.
+        """
+        if compact == self._compact_connections:
+            return
+
+        self._compact_connections = compact
+
+        for connection in self.inputs + self.outputs:
+            connection.setCompact(compact)
+
+        self.setAcceptDrops(compact)
+        self.setAcceptHoverEvents(compact)
+        self.connectionGeometryChange()
+
+    def hasCompactConnections(self) -> bool:
+        return self._compact_connections
+
+    def connectionGeometryChange(self):
+        """Called when the geometry of compact connections has changed."""
+        self.prepareGeometryChange()
+        self._connections_rect = None
+        self.update()
+        self._notifyGeometryChange()
+
+    def _notifyGeometryChange(self):
+        """Tell the scheme that the position or the bounding rect of this node changed."""
+        if self._scheme is not None:
+            self._scheme.nodeGeometryChanged(self)
+
+    def connectionAt(self, pos: QPointF):
+        """Return a compact connection from which an edge can be drawn at `pos` (in local coordinates), or None."""
+        if not self._compact_connections:
+            return None
+
+        for connection in self.inputs + self.outputs:
+            if connection.triggerContains(pos - connection.pos()):
+                return connection
+
+        return None
+
     # Input/output management ==========================================================================================
     def addInput(self, obj: Input):
         self.insertInput(len(self.inputs), obj)
@@ -66,12 +129,14 @@ class Node(SchemeItem):
         self.inputs.insert(index, obj)
 
         obj.setParentItem(self)
+        obj.setCompact(self._compact_connections)
 
         self._updateInputPositions()
 
     def removeInput(self, index):
         removed = self.inputs.pop(index)
         removed.setParentItem(None)
+        removed.setCompact(False)
 
         self._updateInputPositions()
 
@@ -85,12 +150,14 @@ class Node(SchemeItem):
         self.outputs.insert(index, obj)
 
         obj.setParentItem(self)
+        obj.setCompact(self._compact_connections)
 
         self._updateOutputPositions()
 
     def removeOutput(self, index):
         removed = self.outputs.pop(index)
         removed.setParentItem(None)
+        removed.setCompact(False)
 
         self._updateOutputPositions()
 
@@ -107,10 +174,49 @@ class Node(SchemeItem):
         removed = self.messages.pop(index)
         removed.setParentItem(None)
 
+        for group in self._transient_messages.values():
+            if removed in group:
+                group.remove(removed)
+
         self._updateMessagePositions()
 
         return removed
 
+    def setTransientMessages(self, key, messages):
+        """Replace the group of transient messages identified by `key` with `messages`.
+        Transient messages describe the current state of the node (for example, validation results). They are not
+        serialized, and are recomputed instead of being restored. Passing an empty list removes the group. If the new
+        messages have the same types and texts as the current ones, nothing is changed.
+        """
+        messages = list(messages)
+        current = self._transient_messages.get(key, [])
+
+        if [(type(m), m.text()) for m in messages] == [(type(m), m.text()) for m in current]:
+            return
+
+        for message in self._transient_messages.pop(key, []):
+            self.messages.remove(message)
+            message.setParentItem(None)
+
+            if message.scene() is not None:
+                message.scene().removeItem(message)
+
+        if messages:
+            self._transient_messages[key] = messages
+
+            for message in messages:
+                self.messages.add(message)
+                message.setParentItem(self)
+
+        self._updateMessagePositions()
+
+    def transientMessages(self, key) -> list:
+        """Return the group of transient messages identified by `key`."""
+        return list(self._transient_messages.get(key, []))
+
+    def _isTransient(self, message) -> bool:
+        return any(message in group for group in self._transient_messages.values())
+
     # Member variables =================================================================================================
     def setTitle(self, title):
         self._title_item.setText(title)
@@ -134,6 +240,13 @@ class Node(SchemeItem):
         """Return a widget for configuring this node, or None if it does not exist."""
         return self._config_widget
 
+    def upstreamChange(self):
+        """Called when something upstream of this node has changed: an edge was attached to or detached from one of
+        the node's inputs, or a node connected to its inputs changed in a way that may affect this node.
+        Default implementation does nothing.
+        """
+        pass
+
     # Updating functions ===============================================================================================
     def _updateInputPositions(self):
         padding = self.style().pixelMetric(Style.NodeConnectionPadding)
@@ -143,6 +256,9 @@ class Node(SchemeItem):
             item.setPos(0, padding * (2 * i + 1))
             i += 1
 
+        if self._compact_connections:
+            self.connectionGeometryChange()
+
     def _updateOutputPositions(self):
         padding = self.style().pixelMetric(Style.NodeConnectionPadding)
 
@@ -151,6 +267,9 @@ class Node(SchemeItem):
             item.setPos(self.size().width(), padding * (2 * i + 1))
             i += 1
 
+        if self._compact_connections:
+            self.connectionGeometryChange()
+
     def _updateMessagePositions(self):
         padding = self.style().pixelMetric(Style.NodeMessagePadding)
         icon_size = self.style().pixelMetric(Style.MessageIconSize)
@@ -168,21 +287,49 @@ class Node(SchemeItem):
     def boundingRect(self) -> QRectF:
         frame_width = self.style().pixelMetric(Style.NodeFrameWidth)
 
-        return QRectF(
+        result = QRectF(
             QPointF(-frame_width/2, -frame_width/2),
             self.size() + QSizeF(frame_width, frame_width)
         )
 
+        if self._compact_connections:
+            result |= self._connectionsRect()
+
+        return result
+
     def shape(self):
         frame_corner_radius = self.style().pixelMetric(Style.NodeFrameCornerRadius)
 
         path = QPainterPath()
         path.addRoundedRect(QRectF(QPointF(0, 0), self.size()), frame_corner_radius, frame_corner_radius)
 
+        if self._compact_connections:
+            # Areas from which edges can be drawn are part of the node in compact mode
+            for connection in self.inputs + self.outputs:
+                radius = connection.style().pixelMetric(Style.EdgeDragPrecisionRadius)
+                path.addEllipse(connection.pos() + connection.stemTip(), radius, radius)
+
         return path
 
+    def _connectionsRect(self) -> QRectF:
+        """Union of compact connection rectangles in local coordinates. The result is cached."""
+        if self._connections_rect is None:
+            self._connections_rect = QRectF()
+
+            for connection in self.inputs + self.outputs:
+                self._connections_rect |= connection.compactRect().translated(connection.pos())
+
+        return self._connections_rect
+
     def paint(self, painter: QPainter, option, widget=...) -> None:
-        pass
+        if not self._compact_connections:
+            return
+
+        for connection in self.inputs + self.outputs:
+            painter.save()
+            painter.translate(connection.pos())
+            connection.paintCompact(painter)
+            painter.restore()
     
     # Event handlers ===================================================================================================
     def styleChange(self):
@@ -204,14 +351,14 @@ class Node(SchemeItem):
         
         # Title item
         title_font = style.font(Style.NodeTitleFont)
-        title_metrics = QFontMetricsF(title_font)
+        title_metrics = font_metrics(title_font)
 
         padding = style.pixelMetric(Style.NodeFrameTextPadding)
 
-        self._title_item.setFont(title_font)
-        self._title_item.setPos(padding, padding)
-        self._title_item.moveBy(0, title_metrics.capHeight())
-        self._title_item.setMaximumWidth(frame_width - padding * 2)
+        with self._title_item.batchUpdate():
+            self._title_item.setFont(title_font)
+            self._title_item.setMaximumWidth(frame_width - padding * 2)
+        self._title_item.setPos(padding, padding + title_metrics.capHeight())
 
         # Divider item
         div_margin = style.pixelMetric(Style.NodeDividerTextMargin)
@@ -233,6 +380,7 @@ class Node(SchemeItem):
                 )
             )
         )
+        self._notifyGeometryChange()
         
     def paletteChange(self):
         self._body_item.setPen(self.style().framePen(self.palette()))
@@ -245,10 +393,11 @@ class Node(SchemeItem):
 
     def itemChange(self, change, value):
         if change == self.ItemSelectedHasChanged:
-            selection = self.scene().selection()
-            if len(selection.nodes) == 1:
-                for edge in selection.edges:
-                    edge.autoSelect()
+            if self.scene() is not None:  # Node can be outside of the scene if the scheme is virtualized
+                selection = self.scene().selection()
+                if len(selection.nodes) == 1:
+                    for edge in selection.edges:
+                        edge.autoSelect()
 
             # Update selection status for all connections
             for input in self.inputs:
@@ -256,9 +405,68 @@ class Node(SchemeItem):
 
             for output in self.outputs:
                 output.autoSelect()
+        elif change == self.ItemPositionHasChanged:
+            self._notifyGeometryChange()
 
         return super().itemChange(change, value)
     
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._edge_drag_connection = self.connectionAt(event.pos())
+
+            if self._edge_drag_connection is not None:
+                event.accept()
+                return
+
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._edge_drag_connection is not None:
+            if (QLineF(event.screenPos(), event.buttonDownScreenPos(Qt.LeftButton)).length()
+                < QApplication.startDragDistance()):
+                return
+
+            connection = self._edge_drag_connection
+            self._edge_drag_connection = None
+
+            exec_edge_drag(connection, event.widget())
+            return
+
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self._edge_drag_connection is not None:
+            self._edge_drag_connection = None
+            return
+
+        super().mouseReleaseEvent(event)
+
+    def hoverMoveEvent(self, event):
+        if self.connectionAt(event.pos()) is not None:
+            self.setCursor(Qt.CrossCursor)
+        else:
+            self.unsetCursor()
+
+    def hoverLeaveEvent(self, event):
+        self.unsetCursor()
+
+    def dragEnterEvent(self, event):
+        self.dragMoveEvent(event)
+
+    def dragMoveEvent(self, event):
+        connection = self.connectionAt(event.pos())
+
+        if event.mimeData().hasFormat(Connection.EdgeDragMimeType) and connection is not None:
+            event.setAccepted(connection.edgeDragAccept())
+        else:
+            event.ignore()
+
+    def dropEvent(self, event):
+        connection = self.connectionAt(event.pos())
+
+        if connection is not None:
+            connection.edgeDragDrop()
+
     def mouseDoubleClickEvent(self, event):
         if self.configWidget() is not None:
             view = event.widget().parent()
@@ -271,7 +479,7 @@ class Node(SchemeItem):
             "description": self.description(),
             "inputs": self.inputs,
             "outputs": self.outputs,
-            "messages": list(self.messages),
+            "messages": [message for message in self.messages if not self._isTransient(message)],
             "position": inch(self.pos())
         }
 
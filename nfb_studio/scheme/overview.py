@@ -0,0 +1,309 @@
+"""A small overview of the whole scheme, for navigating large schemes."""
+import math
+
+from PySide2.QtCore import Qt, QPointF, QRectF, QTimer
+from PySide2.QtGui import QPainter, QPixmap, QPen, QTransform
+from PySide2.QtWidgets import QWidget, QSizePolicy
+
+from .node import Node, Edge
+from .record import NodeRecord
+
+
+class SchemeOverview(QWidget):
+    """A small overview of the whole scheme, for navigating large schemes.
+
+    The overview draws a simplified picture of the scheme: nodes as boxes and edges as straight lines. The picture is
+    split into square tiles that are cached as pixmaps. When something in the scheme changes, only the tiles that
+    cover the changed area are invalidated, and invalidations are collected for `update_interval` milliseconds before
+    they are redrawn. Items of a tile are found with `Scheme.itemsIn`, which includes nodes that are parked by a
+    virtualized scheme. Nodes that are not built yet are drawn as their approximate rects.
+
+    The visible area of the attached view is shown as a rectangle. Clicking or dragging on the overview centers the
+    view on that point.
+    """
+
+    tile_size = 128
+    """Size of a cached tile in widget pixels."""
+
+    update_interval = 250
+    """Time in milliseconds during which invalidations are collected before the overview is redrawn."""
+
+    scene_margin = 0.1
+    """Fraction of the scene rect that is added on each side when the scene is fitted into the overview, so that the
+    scene can grow a little without redrawing all tiles.
+    """
+
+    min_fill = 0.25
+    """If the scene shrinks to less than this fraction of the overview's width and height, it is fitted again."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setMinimumSize(120, 90)
+
+        self._scheme = None
+        self._view = None
+        self._viewport_rect = QRectF()
+        """Visible area of the view in scene coordinates."""
+
+        self._transform = QTransform()
+        """Transform from scene coordinates to widget coordinates."""
+        self._scene_rect = QRectF()
+        """Scene rect of the scheme when the tiles were last updated for it."""
+        self._tiles = {}
+        """Cached tile pixmaps, by (column, row)."""
+        self._dirty_tiles = set()
+        """Tiles that will be invalidated when the update timer fires."""
+
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self._flushDirtyTiles)
+
+    # Scheme and view ==================================================================================================
+    def scheme(self):
+        return self._scheme
+
+    def view(self):
+        return self._view
+
+    def setScheme(self, scheme):
+        if self._scheme is not None:
+            self._scheme.changed.disconnect(self._sceneChanged)
+            self._scheme.sceneRectChanged.disconnect(self._sceneRectChanged)
+            self._scheme.graphChanged.disconnect(self._graphChanged)
+
+        self._scheme = scheme
+
+        if self._scheme is not None:
+            self._scheme.changed.connect(self._sceneChanged)
+            self._scheme.sceneRectChanged.connect(self._sceneRectChanged)
+            self._scheme.graphChanged.connect(self._graphChanged)
+
+        self._fitSceneRect()
+
+    def setView(self, view):
+        """Set a Scheme.View whose visible area is displayed on the overview and which is moved by clicking."""
+        if self._view is not None:
+            self._view.viewportChanged.disconnect(self._viewportChanged)
+
+        self._view = view
+
+        if self._view is not None:
+            self._view.viewportChanged.connect(self._viewportChanged)
+
+    # Invalidation =====================================================================================================
+    def invalidate(self, rect: QRectF = None):
+        """Mark the part of the overview covering `rect` (in scene coordinates) as dirty.
+        If `rect` is None, the whole overview is dirty. Dirty tiles are redrawn after `update_interval` milliseconds.
+        """
+        if rect is None:
+            self._invalidateTiles(self._tiles.keys())
+        else:
+            self._invalidateTiles(self._tilesIn(self._transform.mapRect(rect)))
+
+    def _invalidateTiles(self, keys):
+        """Mark tiles as dirty. They are redrawn after `update_interval` milliseconds."""
+        self._dirty_tiles.update(keys)
+
+        if self._dirty_tiles and not self._update_timer.isActive():
+            self._update_timer.start(self.update_interval)
+
+    def _flushDirtyTiles(self):
+        for key in self._dirty_tiles:
+            if self._tiles.pop(key, None) is not None:
+                self.update(self._tileRect(key).toAlignedRect())
+
+        self._dirty_tiles.clear()
+
+    def _sceneChanged(self, rects):
+        for rect in rects:
+            self.invalidate(rect)
+
+    def _graphChanged(self, item):
+        # Items that are removed or parked by virtualization do not always produce a scene change
+        self.invalidate(item.sceneBoundingRect())
+
+    def _sceneRectChanged(self, *args):
+        """Update the mapping from scene to widget after the scene rect changed.
+        While the new scene rect fits into the widget with the current mapping and is not much smaller than the widget,
+        the mapping is kept, and only tiles over the area that the scene rect gained or lost are invalidated.
+        Otherwise the mapping is recomputed and all tiles are dropped.
+        """
+        if self._scheme is None or self._scene_rect.isEmpty():
+            self._fitSceneRect()
+            return
+
+        old = self._transform.mapRect(self._scene_rect)
+        new = self._transform.mapRect(self._scheme.sceneRect())
+
+        if (not QRectF(self.rect()).contains(new) or
+                new.width() < self.width() * self.min_fill and new.height() < self.height() * self.min_fill):
+            self._fitSceneRect()
+            return
+
+        self._scene_rect = self._scheme.sceneRect()
+
+        inside = old & new
+        self._invalidateTiles(key for key in self._tilesIn(old | new) if not inside.contains(self._tileRect(key)))
+
+    def _fitSceneRect(self):
+        """Recompute the mapping from scene to widget and drop all tiles.
+        The scene rect, enlarged by `scene_margin` on each side, is fitted into the widget.
+        """
+        self._transform = QTransform()
+        self._scene_rect = QRectF()
+
+        if self._scheme is not None:
+            self._scene_rect = self._scheme.sceneRect()
+            dx = self._scene_rect.width() * self.scene_margin
+            dy = self._scene_rect.height() * self.scene_margin
+            source = self._scene_rect.adjusted(-dx, -dy, dx, dy)
+
+            if source.width() > 0 and source.height() > 0:
+                scale = min(self.width() / source.width(), self.height() / source.height())
+                offset = QPointF(self.width() - source.width()*scale, self.height() - source.height()*scale) / 2
+
+                self._transform.translate(offset.x(), offset.y())
+                self._transform.scale(scale, scale)
+                self._transform.translate(-source.left(), -source.top())
+
+        self._tiles.clear()
+        self._dirty_tiles.clear()
+        self.update()
+
+    def _viewportChanged(self, rect: QRectF):
+        old = self._transform.mapRect(self._viewport_rect)
+        self._viewport_rect = QRectF(rect)
+        new = self._transform.mapRect(self._viewport_rect)
+
+        # Only the area under the old and new viewport rectangle needs repainting, and the tiles come from the cache
+        self.update((old | new).adjusted(-2, -2, 2, 2).toAlignedRect())
+
+    # Tiles ============================================================================================================
+    def _tileRect(self, key) -> QRectF:
+        return QRectF(key[0] * self.tile_size, key[1] * self.tile_size, self.tile_size, self.tile_size)
+
+    def _tilesIn(self, rect: QRectF):
+        """Return keys of all tiles that intersect `rect` in widget coordinates."""
+        if rect.isEmpty():
+            return []
+
+        first_col = math.floor(rect.left() / self.tile_size)
+        last_col = math.floor(rect.right() / self.tile_size)
+        first_row = math.floor(rect.top() / self.tile_size)
+        last_row = math.floor(rect.bottom() / self.tile_size)
+
+        return [(col, row) for col in range(first_col, last_col + 1) for row in range(first_row, last_row + 1)]
+
+    def _tile(self, key) -> QPixmap:
+        """Return a tile from the cache, rendering it if it is not there."""
+        pixmap = self._tiles.get(key)
+
+        if pixmap is None:
+            pixmap = self._renderTile(key)
+            self._tiles[key] = pixmap
+
+        return pixmap
+
+    def _renderTile(self, key) -> QPixmap:
+        tile_rect = self._tileRect(key)
+
+        pixmap = QPixmap(self.tile_size, self.tile_size)
+        pixmap.fill(self._scheme.schemePalette().background().color())
+
+        inverse, invertible = self._transform.inverted()
+        if not invertible:
+            return pixmap
+        scene_rect = inverse.mapRect(tile_rect)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.translate(-tile_rect.topLeft())
+        painter.setTransform(self._transform, True)
+
+        items = self._scheme.itemsIn(scene_rect)
+
+        # Edges are drawn under the nodes
+        for item in items:
+            if isinstance(item, Edge):
+                self._paintEdge(painter, item)
+        for item in items:
+            if isinstance(item, Node):
+                self._paintNode(painter, item)
+            elif isinstance(item, NodeRecord):
+                self._paintRecord(painter, item)
+
+        painter.end()
+        return pixmap
+
+    def _paintNode(self, painter: QPainter, node: Node):
+        palette = node.palette()
+
+        pen = QPen(palette.frame().color())
+        pen.setCosmetic(True)
+
+        painter.setPen(pen)
+        painter.setBrush(palette.base())
+        painter.drawRect(QRectF(node.pos(), node.size()))
+
+    def _paintRecord(self, painter: QPainter, record: NodeRecord):
+        """Paint a node that is not built yet, as its approximate bounding rect."""
+        palette = self._scheme.schemePalette()
+
+        pen = QPen(palette.frame().color())
+        pen.setCosmetic(True)
+
+        painter.setPen(pen)
+        painter.setBrush(palette.base())
+        painter.drawRect(record.rect)
+
+    def _paintEdge(self, painter: QPainter, edge: Edge):
+        if edge.sourcePos() is None or edge.targetPos() is None:
+            return
+
+        pen = QPen(edge.palette().edge().color())
+        pen.setCosmetic(True)
+
+        painter.setPen(pen)
+        painter.drawLine(edge.sourcePos(), edge.targetPos())
+
+    # Events ===========================================================================================================
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        exposed = QRectF(event.rect())
+
+        if self._scheme is None:
+            painter.fillRect(exposed, self.palette().window())
+            return
+
+        for key in self._tilesIn(exposed):
+            painter.drawPixmap(self._tileRect(key).topLeft(), self._tile(key))
+
+        if not self._viewport_rect.isNull():
+            pen = QPen(self.palette().highlight().color(), 2)
+            pen.setCosmetic(True)
+
+            painter.setPen(pen)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(self._transform.mapRect(self._viewport_rect))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._fitSceneRect()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._centerViewOn(event.pos())
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton:
+            self._centerViewOn(event.pos())
+
+    def _centerViewOn(self, pos):
+        """Center the view on a point of the overview."""
+        if self._view is None:
+            return
+
+        inverse, invertible = self._transform.inverted()
+        if invertible:
+            self._view.centerOn(inverse.map(QPointF(pos)))
@@ -0,0 +1,46 @@
+"""Placeholders for nodes and edges of a virtualized scheme that are not built yet."""
+from PySide2.QtCore import QRectF
+
+
+class NodeRecord:
+    """A node of a virtualized scheme that is not built yet.
+    Holds the data that the node is deserialized from, and the approximate area that the node takes in the scene.
+    See `Scheme.deserialize_raw_steps`.
+    """
+    __slots__ = ("data", "rect", "edges", "node", "selected")
+
+    def __init__(self, data: dict, rect: QRectF):
+        self.data = data
+        """Serialized node, with values that are not decoded."""
+        self.rect = rect
+        """Approximate bounding rect of the node in scene coordinates."""
+        self.edges = []
+        """EdgeRecords of this node that are not built yet."""
+        self.node = None
+        """The node built from this record, or None."""
+        self.selected = False
+        """True if the node is selected (it is built with this selection status)."""
+
+    def sceneBoundingRect(self) -> QRectF:
+        if self.node is not None:
+            return self.node.sceneBoundingRect()
+        return self.rect
+
+
+class EdgeRecord:
+    """An edge of a virtualized scheme that is not built yet, because one or both of its nodes are not built."""
+    __slots__ = ("source", "source_index", "target", "target_index")
+
+    def __init__(self, source: NodeRecord, source_index: int, target: NodeRecord, target_index: int):
+        self.source = source
+        self.source_index = source_index
+        """Index of the output of the source node."""
+        self.target = target
+        self.target_index = target_index
+        """Index of the input of the target node."""
+
+    def isBuilt(self) -> bool:
+        return self.source.node is not None and self.target.node is not None
+
+    def sceneBoundingRect(self) -> QRectF:
+        return self.source.sceneBoundingRect() | self.target.sceneBoundingRect()
@@ -1,12 +1,19 @@
 """A data model for the nfb experiment's system of signals and their components."""
-from PySide2.QtCore import Qt, QPointF, QMimeData, Signal
+import math
+from contextlib import contextmanager
+from typing import Union
+
+from PySide2.QtCore import Qt, QPointF, QRectF, QMimeData, QTimer, Signal
 from PySide2.QtGui import QPainter, QKeySequence
 from PySide2.QtWidgets import QGraphicsScene, QGraphicsView, QGraphicsItem, QShortcut, QApplication
 
 from nfb_studio.serial import mime, hooks
+from nfb_studio.serial.base import run_steps
 
 from .graph import Graph
 from .node import Node, Edge, Input, Output, Connection
+from .record import NodeRecord, EdgeRecord
+from .unitconv import inches_to_pixels as px
 from .style import Style
 from .palette import Palette
 
@@ -33,6 +40,9 @@ class Scheme(QGraphicsScene):
         configRequested = Signal(object)
         """Emitted when a config of a node was requested. Sends the node."""
 
+        viewportChanged = Signal(QRectF)
+        """Emitted when the visible area of the scene has changed. Sends the area in scene coordinates."""
+
         scale_factor = 1.25
         """Constant on which scaling by mouse is based."""
 
@@ -52,6 +62,11 @@ class Scheme(QGraphicsScene):
             self._pan_origin = None
             self._scale = 1
 
+            # Viewport changes are reported to a virtualized scheme at most once per event loop iteration
+            self._viewport_timer = QTimer(self)
+            self._viewport_timer.setSingleShot(True)
+            self._viewport_timer.timeout.connect(self._reportViewport)
+
         def setScene(self, scene):
             if not isinstance(scene, Scheme):
                 raise TypeError("Scheme.View can only have Scheme as it's scene, not " + type(scene).__name__)
@@ -70,6 +85,8 @@ class Scheme(QGraphicsScene):
 
             delete_shortcut = QShortcut(QKeySequence.Delete, self)
             delete_shortcut.activated.connect(scene.deleteEvent)
+
+            self._scheduleViewportReport()
         
         def setScheme(self, scheme):
             """Alias function for setScene."""
@@ -91,6 +108,7 @@ class Scheme(QGraphicsScene):
 
                 self.translate(translate.x(), translate.y())
                 self._pan_origin = event.pos()
+                self._scheduleViewportReport()
                 return
             
             super().mouseMoveEvent(event)
@@ -103,10 +121,35 @@ class Scheme(QGraphicsScene):
             self.setTransformationAnchor(self.AnchorUnderMouse)
             self.scale(scale, scale)
             self.setTransformationAnchor(self.NoAnchor)
+            self._scheduleViewportReport()
 
         def resizeEvent(self, event):
             super().resizeEvent(event)
             self._adjustSceneRect()
+            self._scheduleViewportReport()
+
+        def showEvent(self, event):
+            super().showEvent(event)
+            self._scheduleViewportReport()
+
+        def scrollContentsBy(self, dx, dy):
+            super().scrollContentsBy(dx, dy)
+            self._scheduleViewportReport()
+
+        def _scheduleViewportReport(self):
+            """Report the visible area to the scheme after pending events are processed."""
+            if not self._viewport_timer.isActive():
+                self._viewport_timer.start(0)
+
+        def _reportViewport(self):
+            """Tell the scheme which part of it is visible in this view."""
+            if self.scene() is None:
+                return
+
+            rect = self.mapToScene(self.viewport().rect()).boundingRect()
+
+            self.scene().setViewportRect(rect)
+            self.viewportChanged.emit(rect)
 
         def _adjustSceneRect(self):
             """Adjust the scene rect displayed in the view.
@@ -132,7 +175,7 @@ class Scheme(QGraphicsScene):
     def __init__(self, parent=None):
         """Constructs a Scheme with an optional `parent` parameter that is passed to the super()."""
         super().__init__(parent)
-        self.graph = Graph()
+        self._graph = Graph()
 
         self._custom_drop_events = {}
         """A dict mapping MIME types to custom functions to be executed when drag and drop operation finishes.  
@@ -148,6 +191,50 @@ class Scheme(QGraphicsScene):
         self.paste_pos = QPointF()
         """Position where the center of the pasted object will be located."""
 
+        # Compact connections ------------------------------------------------------------------------------------------
+        self._compact_connections = False
+        """If True, nodes in this scheme paint their connections themselves. See `setCompactConnections`."""
+
+        # Virtualization -----------------------------------------------------------------------------------------------
+        self._virtualized = False
+        """If True, only nodes and edges near the visible area are kept in the QGraphicsScene. See `setVirtualized`."""
+        self._viewport_rect = None
+        """Visible area of the scene, as reported by the view, or None if it is not known yet."""
+        self._parked = set()
+        """Nodes and edges that are in the graph, but not currently in the QGraphicsScene."""
+        self._grid = None
+        """Index of nodes and edges for virtualization: a dict of grid cell (column, row) to the set of items whose
+        bounding rects touch it (see `virtualization_cell_size`), or None if it needs to be built.
+        """
+        self._item_cells = {}
+        """Bounding rect in scene coordinates and list of grid cells of each indexed item."""
+        self._dirty = set()
+        """Items that were added or moved since the last `updateVirtualization`."""
+        self._near = set()
+        """Nodes that intersect `_area`."""
+        self._area = QRectF()
+        """Area around the visible rect used by the last `updateVirtualization`."""
+        self._graph_rect = None
+        """Bounding rect of all nodes, or None if it needs recomputing."""
+        self._virtualization_scheduled = False
+        """True if `updateVirtualization` is going to be called after pending events are processed."""
+        self._records = set()
+        """Records of nodes that are not built yet. See `deserialize_raw_steps`."""
+        self._node_records = {}
+        """Record of each built node that has edges that are not built yet."""
+        self._record_extents = {}
+        """Bounding rect of a default node of each class, relative to its position. Used to place records."""
+        self._decoder = None
+        """Decoder that builds nodes from their records."""
+
+        # Bulk loading -------------------------------------------------------------------------------------------------
+        self._explicit_scene_rect = False
+        """True if the scene rect was set using `setSceneRect`, False if Qt computes it from the items."""
+        self._bulk_depth = 0
+        """Number of nested `beginBulkLoad()` calls that are not yet finished."""
+        self._bulk_had_scene_rect = False
+        """True if the scene rect was set explicitly before the bulk load started."""
+
         # Style and palette --------------------------------------------------------------------------------------------
         self._style = Style()
         self._palette = Palette()
@@ -163,35 +250,179 @@ class Scheme(QGraphicsScene):
 
         return v
 
+    # Graph ============================================================================================================
+    @property
+    def graph(self) -> Graph:
+        """Graph of all nodes and edges of this scheme.
+        Nodes and edges of a virtualized scheme that are not built yet are built when this property is read. Code that
+        only needs the built part, like painting and validation, should use `builtGraph()`.
+        """
+        self.materialize()
+        return self._graph
+
+    def builtGraph(self) -> Graph:
+        """Graph of the nodes and edges of this scheme that are built. See `deserialize_raw_steps`."""
+        return self._graph
+
+    def pendingNodes(self) -> set:
+        """Return records (see `NodeRecord`) of nodes of this scheme that are not built yet."""
+        return set(self._records)
+
+    def materialize(self):
+        """Build all nodes and edges of this scheme that are not built yet."""
+        if not self._records:
+            return
+
+        for record in list(self._records):
+            self._build(record)
+        self._scheduleVirtualization()
+
+    def createsCycle(self, source: Node, target: Node) -> bool:
+        """Return True if an edge from `source` to `target` would create a cycle.
+        Unlike `graph.createsCycle`, this also follows edges that are not built yet, without building them.
+        """
+        if not self._records:
+            return self._graph.createsCycle(source, target)
+
+        visited = set()
+        stack = [target]
+
+        while stack:
+            item = stack.pop()  # A built node or a record
+            if item is source:
+                return True
+            if item in visited:
+                continue
+            visited.add(item)
+
+            if isinstance(item, Node):
+                for output in item.outputs:
+                    for edge in output.edges:
+                        if edge in self._graph.edges and edge.targetNode() is not None:
+                            stack.append(edge.targetNode())
+                item = self._node_records.get(item)
+                if item is None:
+                    continue
+
+            for edge_record in item.edges:
+                if edge_record.source is item:
+                    stack.append(edge_record.target.node or edge_record.target)
+
+        return False
+
+    def _build(self, record: NodeRecord) -> Node:
+        """Build a node from its record, and the edges to its neighbours that are built. The node starts parked and is
+        checked by the next `updateVirtualization`.
+        """
+        node = self._decoder.decode(record.data)
+        record.node = node
+        self._records.discard(record)
+        self._unindex(record)
+
+        node.setCompactConnections(self._compact_connections)
+        node._scheme = self
+        if record.selected:
+            node.setSelected(True)
+        self._graph.add(node)
+        self._parked.add(node)
+        if self._grid is not None:
+            self._dirty.add(node)
+        self.graphChanged.emit(node)
+
+        if record.edges:
+            self._node_records[node] = record
+
+        for edge_record in list(record.edges):
+            if edge_record.isBuilt():
+                self._buildEdge(edge_record)
+
+        return node
+
+    def _buildEdge(self, edge_record: EdgeRecord) -> Union[Edge, None]:
+        """Build an edge from its record. Returns None if the edge would create a cycle (see `Graph.loadEdge`)."""
+        for record in (edge_record.source, edge_record.target):
+            record.edges.remove(edge_record)
+            if not record.edges:
+                self._node_records.pop(record.node, None)
+        self._unindex(edge_record)
+
+        source = edge_record.source.node.outputs[edge_record.source_index]
+        target = edge_record.target.node.inputs[edge_record.target_index]
+
+        edge = self._graph.loadEdge(source, target)
+        if edge is None:
+            return None
+
+        self._parked.add(edge)
+        if self._grid is not None:
+            self._dirty.add(edge)
+        self.graphChanged.emit(edge)
+
+        return edge
+
+    def _dropEdgeRecords(self, node: Node):
+        """Forget edges that are not built yet of a node that is being removed."""
+        record = self._node_records.pop(node, None)
+        if record is None:
+            return
+
+        for edge_record in record.edges:
+            other = edge_record.target if edge_record.source is record else edge_record.source
+            other.edges.remove(edge_record)
+            if not other.edges and other.node is not None:
+                self._node_records.pop(other.node, None)
+            self._unindex(edge_record)
+
+        record.edges.clear()
+
+    def _edgeRecords(self) -> set:
+        """Return records of all edges that are not built yet."""
+        return {
+            edge_record for record in self._records | set(self._node_records.values())
+            for edge_record in record.edges
+        }
+
     # Element manipulation =============================================================================================
     def addItem(self, item: QGraphicsItem):
         """Add an item to the scene.
 
         An override of super().addItem method that detects when a node or edge was added.
         """
-        self.graph.add(item)
+        self._graph.add(item)
+        if isinstance(item, Node):
+            item.setCompactConnections(self._compact_connections)
+            item._scheme = self
+
         super().addItem(item)
         self.graphChanged.emit(item)
+        self._indexLater(item)
 
     def removeItem(self, item: QGraphicsItem):
-        """Add an item to the scene.
+        """Remove an item from the scene.
 
         An override of super().removeItem method that detects when a node or edge was removed.
         """
-        super().removeItem(item)
+        if item not in self._graph:
+            # Not a node or edge (for example, a child item that is being taken out of the scene)
+            super().removeItem(item)
+            return
+
+        self._removeFromScene(item)
 
         # Remove a Node ------------------------------------------------------------------------------------------------
         if isinstance(item, Node):
+            self._dropEdgeRecords(item)
+
             # Remove connected edges first
             to_remove = []
-            for edge in self.graph.edges:
+            for edge in self._graph.edges:
                 if edge.sourceNode() is item or edge.targetNode() is item:
                     to_remove.append(edge)
             
             for edge in to_remove:
                 self.removeItem(edge)
         
-        self.graph.remove(item)
+        self._graph.remove(item)
         self.graphChanged.emit(item)
 
     def connect_nodes(self, source: Output, target: Input):
@@ -199,9 +430,10 @@ class Scheme(QGraphicsScene):
         
         Returns the newly created edge.
         """
-        edge = self.graph.connect_nodes(source, target)
+        edge = self._graph.connect_nodes(source, target)
         super().addItem(edge)
         self.graphChanged.emit(edge)
+        self._indexLater(edge)
 
         return edge
 
@@ -211,9 +443,9 @@ class Scheme(QGraphicsScene):
         If output and input are connected more than once, only one edge is removed.
         Returns the edge that was removed, or None if no such edge was found.
         """
-        edge = self.graph.disconnect_nodes(source, target)
+        edge = self._graph.disconnect_nodes(source, target)
         if edge is not None:
-            super().removeItem(edge)
+            self._removeFromScene(edge)
             self.graphChanged.emit(edge)
 
         return edge
@@ -232,20 +464,502 @@ class Scheme(QGraphicsScene):
     def clear(self):
         """Clear the scheme."""
         super().clear()
-        self.graph.clear()
+        self._graph.clear()
+        self._parked.clear()
+        self._records.clear()
+        self._node_records.clear()
+        self._clearIndex()
+
+    def _removeFromScene(self, item: QGraphicsItem):
+        """Remove an item from the QGraphicsScene, or from the parked items if the scheme is virtualized."""
+        if item.scene() is self:
+            super().removeItem(item)
+        else:
+            self._parked.discard(item)
+
+        self._unindex(item)
+
+    # Compact connections ==============================================================================================
+    def setCompactConnections(self, compact: bool):
+        """Enable or disable compact connections for all nodes in this scheme, including nodes added later.
+        With compact connections, each node paints its inputs and outputs itself instead of using several child items
+        per connection. This greatly reduces the number of items in large schemes, at the cost of slightly less
+        granular repainting. Deserialized schemes of at least `virtualization_threshold` nodes enable it.
+        """
+        self._compact_connections = compact
+        self._record_extents.clear()
+
+        for node in self._graph.nodes:
+            node.setCompactConnections(compact)
+
+    def hasCompactConnections(self) -> bool:
+        return self._compact_connections
+
+    # Bulk loading =====================================================================================================
+    bsp_items_per_leaf = 8
+    """Average number of items in a leaf of the BSP index that `bspTreeDepthFor` aims for."""
+
+    @classmethod
+    def bspTreeDepthFor(cls, item_count: int) -> int:
+        """Return a BSP tree depth suitable for indexing `item_count` items."""
+        leaves = max(item_count / cls.bsp_items_per_leaf, 1)
+
+        return max(1, min(math.ceil(math.log2(leaves)), 16))
+
+    def beginBulkLoad(self):
+        """Start adding many items at once.
+        Until a matching `endBulkLoad()`, the scene does not maintain an item index and its scene rect is fixed, so
+        each added item costs no index update and no scene rect recalculation. Calls can be nested.
+        """
+        self._bulk_depth += 1
+        if self._bulk_depth > 1:
+            return
+
+        self._bulk_had_scene_rect = self._explicit_scene_rect
+        self.setSceneRect(self.sceneRect())  # Pin the current rect
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+
+    def endBulkLoad(self):
+        """Finish adding many items at once.
+        The BSP index is rebuilt once, with a depth chosen from the number of items, and the scene rect is computed once.
+        """
+        if self._bulk_depth == 0:
+            raise RuntimeError("endBulkLoad() called without a matching beginBulkLoad()")
+
+        self._bulk_depth -= 1
+        if self._bulk_depth > 0:
+            return
+
+        if self._virtualized:
+            self.updateVirtualization()  # Sets scene rect to cover the whole graph
+        elif not self._bulk_had_scene_rect:
+            self.setSceneRect(QRectF())  # Return to automatic scene rect
+            self.sceneRect()  # Compute it once now
+
+        self.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.setBspTreeDepth(self.bspTreeDepthFor(len(self.items())))  # Only applies to an active BSP index
+
+    @contextmanager
+    def bulkLoad(self):
+        """Context manager for `beginBulkLoad()` and `endBulkLoad()`.
+        ```python
+        with scheme.bulkLoad():
+            for node in nodes:
+                scheme.addItem(node)
+        ```
+        """
+        self.beginBulkLoad()
+        try:
+            yield self
+        finally:
+            self.endBulkLoad()
+
+    def isBulkLoading(self) -> bool:
+        return self._bulk_depth > 0
+
+    def setSceneRect(self, *args):
+        rect = QRectF(*args)
+        self._explicit_scene_rect = not rect.isNull()
+        super().setSceneRect(rect)
+
+    def indexStatistics(self) -> dict:
+        """Return diagnostic information about the scene item index.
+        Keys:
+        - "index_method": "bsp" or "none";
+        - "bsp_depth": depth of the BSP tree (0 means that Qt chooses it automatically);
+        - "bsp_leaves": number of leaves in the BSP tree at this depth;
+        - "scene_items": number of QGraphicsItems in the scene, including child items;
+        - "items_per_leaf": average number of items per BSP leaf;
+        - "nodes", "edges": number of nodes and edges in the graph;
+        - "parked": number of nodes and edges kept out of the scene by virtualization;
+        - "pending_nodes", "pending_edges": number of nodes and edges that are not built yet (see
+          `deserialize_raw_steps`), included in "nodes" and "edges";
+        - "bulk_loading": True if a bulk load is in progress.
+        """
+        scene_items = len(self.items())
+        pending_edges = self._edgeRecords()
+        depth = self.bspTreeDepth()
+        leaves = 2**depth if depth > 0 else None
+
+        return {
+            "index_method": "bsp" if self.itemIndexMethod() == QGraphicsScene.BspTreeIndex else "none",
+            "bsp_depth": depth,
+            "bsp_leaves": leaves,
+            "scene_items": scene_items,
+            "items_per_leaf": scene_items / leaves if leaves else None,
+            "nodes": len(self._graph.nodes) + len(self._records),
+            "edges": len(self._graph.edges) + len(pending_edges),
+            "parked": len(self._parked),
+            "pending_nodes": len(self._records),
+            "pending_edges": len(pending_edges),
+            "bulk_loading": self.isBulkLoading(),
+        }
+
+    # Virtualization ===================================================================================================
+    virtualization_threshold = 500
+    """Number of nodes from which a deserialized scheme is virtualized automatically."""
+
+    virtualization_margin = 0.5
+    """Area around the visible rect in which items are kept in the scene, as a fraction of visible rect size."""
+
+    virtualization_cell_size = 1000.0
+    """Size in scene pixels of the grid cells by which nodes and edges are indexed for virtualization."""
+
+    def setVirtualized(self, virtualized: bool):
+        """Enable or disable virtualization.
+        A virtualized scheme keeps only the nodes and edges that are near the visible area in the QGraphicsScene. Other
+        nodes and edges stay in `self.graph` and keep all their data, but are not indexed, drawn or hit-tested by Qt.
+        Serialization, selection and export work on the graph and are unaffected. The visible area is reported by
+        Scheme.View.
+        Disabling virtualization builds the nodes and edges that are not built yet (see `deserialize_raw_steps`).
+        """
+        if virtualized == self._virtualized:
+            return
+
+        self._virtualized = virtualized
+
+        if virtualized:
+            self.updateVirtualization()
+        else:
+            self.materialize()
+            for item in list(self._parked):
+                self._unpark(item)
+            self._clearIndex()
+            self.setSceneRect(QRectF())  # Return to automatic scene rect
+
+    def isVirtualized(self) -> bool:
+        return self._virtualized
+
+    def setViewportRect(self, rect: QRectF):
+        """Set the area of the scene that is visible to the user. Called by Scheme.View."""
+        self._viewport_rect = QRectF(rect)
+        self.updateVirtualization()
+
+    def viewportRect(self):
+        """Area of the scene that is visible to the user, or None if it is not known."""
+        return self._viewport_rect
+
+    def parkedItems(self) -> set:
+        """Return the set of nodes and edges that are in the graph, but are currently kept out of the scene."""
+        return set(self._parked)
+
+    def itemsIn(self, rect: QRectF) -> set:
+        """Return nodes and edges of the graph that are built, and records of nodes that are not built yet (see
+        `pendingNodes`), whose bounding rects intersect `rect` in scene coordinates. Unlike `items`, parked items are
+        included. Items are found with the virtualization index, or with the scene's own index if there is none.
+        """
+        if self._grid is None:
+            # Nothing is parked, so all built items are in the scene
+            result = {
+                item for item in self.items(rect, Qt.IntersectsItemBoundingRect)
+                if item in self._graph.nodes or item in self._graph.edges
+            }
+            result.update(record for record in self._records if rect.intersects(record.rect))
+            return result
+
+        span = self._cellSpan(rect)
+        candidates = self._cellItems([span] if span is not None else [])
+        candidates.update(self._dirty)  # Items that were added or moved since they were indexed
+
+        return {
+            item for item in candidates
+            if not isinstance(item, EdgeRecord) and rect.intersects(item.sceneBoundingRect())
+        }
+
+    def nodeGeometryChanged(self, node: Node):
+        """Called by a node of this scheme after its position or size changed."""
+        if self._grid is None or node not in self._graph.nodes:
+            return
+
+        self._dirty.add(node)
+        self._dirty.update(self._graph.edgesOf(node))
+        if node in self._node_records:
+            self._dirty.update(self._node_records[node].edges)
+        self._scheduleVirtualization()
+
+    def _scheduleVirtualization(self):
+        """Update virtualization after pending events are processed. Items added in a row are processed together."""
+        if self._virtualized and not self._virtualization_scheduled:
+            self._virtualization_scheduled = True
+            QTimer.singleShot(0, self.updateVirtualization)
+
+    def updateVirtualization(self):
+        """Move nodes and edges into or out of the scene depending on whether they are near the visible area.
+        Items are found with a grid index. Only the items in grid cells that the border of the area crosses, before or
+        after the change, and the items that were added or moved since the last update are checked: every other item
+        is either inside or outside of both the old and the new area.
+        Nodes that are not built yet are built when they, or an edge to them, come near the area, together with their
+        neighbours, so that edges of nodes near the area are always built. Built nodes stay built.
+        """
+        self._virtualization_scheduled = False
+        if not self._virtualized:
+            return
+
+        if self._viewport_rect is None:
+            # Nothing is known about the visible area. Keep only the items that are already in the scene.
+            area = QRectF()
+        else:
+            dx = self._viewport_rect.width() * self.virtualization_margin
+            dy = self._viewport_rect.height() * self.virtualization_margin
+            area = self._viewport_rect.adjusted(-dx, -dy, dx, dy)
+
+        if self._grid is None:
+            self._buildIndex()
+
+        # Find items that may have moved into or out of the area -------------------------------------------------------
+        candidates = self._dirty
+        self._dirty = set()
+
+        for item in candidates:
+            self._index(item)
+
+        # Cells that are inside of both areas hold items that stay in the scene
+        inside = _intersectSpans(self._cellSpan(self._area, inside=True), self._cellSpan(area, inside=True))
+        spans = [
+            part for span in (self._cellSpan(self._area), self._cellSpan(area)) if span is not None
+            for part in _subtractSpan(span, inside)
+        ]
+
+        candidates.update(self._cellItems(spans))
+        self._area = area
+
+        # Records ------------------------------------------------------------------------------------------------------
+        if self._records or self._node_records:
+            self._buildNear(area, candidates)
+
+            built = self._dirty
+            self._dirty = set()
+            for item in built:
+                self._index(item)
+            candidates |= built
+
+        # Nodes --------------------------------------------------------------------------------------------------------
+        edges = set()
+
+        for item in candidates:
+            if isinstance(item, Edge):
+                edges.add(item)
+            if not isinstance(item, Node):
+                continue
+
+            rect = item.sceneBoundingRect()
+            if rect != self._item_cells[item][0]:
+                self._index(item)  # Node changed size
+
+            near = area.intersects(rect)
+            if near != (item in self._near):
+                edges.update(self._graph.edgesOf(item))
+
+            if near:
+                self._near.add(item)
+                self._unpark(item)
+            else:
+                self._near.discard(item)
+                self._park(item)
+
+        # Edges --------------------------------------------------------------------------------------------------------
+        for edge in edges:
+            if (edge.sourceNode() in self._near or
+                edge.targetNode() in self._near or
+                area.intersects(self._item_cells[edge][0])):
+                self._unpark(edge)
+            else:
+                self._park(edge)
+
+        # Scene rect is computed by Qt from items in the scene. It needs to include parked items too, otherwise the view
+        # does not allow to scroll to them.
+        if self._graph_rect is None:
+            self._graph_rect = QRectF()
+            for node in self._graph.nodes | self._records:
+                self._graph_rect |= self._item_cells[node][0]
+        else:
+            for item in candidates:
+                if isinstance(item, (Node, NodeRecord)) and item in self._item_cells:
+                    self._graph_rect |= self._item_cells[item][0]
+
+        if not self._explicit_scene_rect or self.sceneRect() != self._graph_rect:
+            self.setSceneRect(self._graph_rect)
+
+    def _buildNear(self, area: QRectF, candidates: set):
+        """Build the nodes that are not built yet and that `area` requires, looking at the checked `candidates`."""
+        stack = list(candidates)
+
+        while stack:
+            item = stack.pop()
+
+            if isinstance(item, NodeRecord):
+                required = [item] if area.intersects(item.rect) else []
+            elif isinstance(item, EdgeRecord):
+                required = [item.source, item.target] if area.intersects(item.sceneBoundingRect()) else []
+            elif isinstance(item, Node) and item in self._node_records and area.intersects(item.sceneBoundingRect()):
+                # Build the neighbours, so that all edges of the node are built
+                record = self._node_records[item]
+                required = [
+                    edge_record.target if edge_record.source is record else edge_record.source
+                    for edge_record in record.edges
+                ]
+            else:
+                continue
+
+            for record in required:
+                if record.node is None:
+                    stack.append(self._build(record))  # Built nodes are checked by the caller
+
+    def _buildIndex(self):
+        """Start a new virtualization index, in which all nodes and edges are yet to be checked."""
+        self._clearIndex()
+        self._grid = {}
+        self._dirty = set(self._graph) | self._records | self._edgeRecords()
+
+        for node in self._graph.nodes:
+            node._scheme = self
+
+    def _clearIndex(self):
+        self._grid = None
+        self._item_cells = {}
+        self._dirty = set()
+        self._near = set()
+        self._area = QRectF()
+        self._graph_rect = None
+
+    def _indexLater(self, item: QGraphicsItem):
+        """Add an item to the virtualization index during the next update."""
+        if self._grid is not None:
+            self._dirty.add(item)
+        self._scheduleVirtualization()
+
+    def _index(self, item: QGraphicsItem):
+        """Put an item into the grid cells of its current bounding rect."""
+        self._removeFromCells(item)
+
+        rect = item.sceneBoundingRect()  # Edges are at position 0, their bounding rects are in scene coordinates
+        left, top, right, bottom = self._cellSpan(rect)
+        cells = [(column, row) for column in range(left, right + 1) for row in range(top, bottom + 1)]
+
+        for cell in cells:
+            self._grid.setdefault(cell, set()).add(item)
+        self._item_cells[item] = (rect, cells)
+
+    def _unindex(self, item: QGraphicsItem):
+        """Remove an item that is being removed from the scheme from the virtualization index."""
+        if self._grid is None:
+            return
+
+        self._removeFromCells(item)
+        self._dirty.discard(item)
+        self._near.discard(item)
+
+        if isinstance(item, Node):
+            self._graph_rect = None  # Bounds can not be shrunk without recomputing them
+
+    def _removeFromCells(self, item: QGraphicsItem):
+        _, cells = self._item_cells.pop(item, (None, ()))
+
+        for cell in cells:
+            items = self._grid[cell]
+            items.discard(item)
+            if not items:
+                del self._grid[cell]
+
+    def _cellItems(self, spans) -> set:
+        """Return the items in the grid cells of `spans`."""
+        result = set()
+
+        if sum(_spanSize(span) for span in spans) <= len(self._grid):
+            for left, top, right, bottom in spans:
+                for column in range(left, right + 1):
+                    for row in range(top, bottom + 1):
+                        result.update(self._grid.get((column, row), ()))
+        else:
+            # The spans are large (for example, the view was zoomed out). Checking occupied cells is faster.
+            for cell, items in self._grid.items():
+                if any(_spanContains(span, cell) for span in spans):
+                    result.update(items)
+
+        return result
+
+    def _cellSpan(self, rect: QRectF, inside=False):
+        """Return the grid cells that `rect` touches as (left, top, right, bottom) column and row numbers, inclusive.
+        If `inside` is True, returns only the cells that lie inside of `rect`. Returns None if there are no such cells.
+        """
+        if rect.isNull():
+            return None
+
+        size = self.virtualization_cell_size
+        if inside:
+            span = (
+                math.ceil(rect.left() / size), math.ceil(rect.top() / size),
+                math.floor(rect.right() / size) - 1, math.floor(rect.bottom() / size) - 1
+            )
+        else:
+            span = (
+                math.floor(rect.left() / size), math.floor(rect.top() / size),
+                math.floor(rect.right() / size), math.floor(rect.bottom() / size)
+            )
+
+        if span[0] > span[2] or span[1] > span[3]:
+            return None
+        return span
+
+    def _park(self, item: QGraphicsItem):
+        """Take an item out of the scene, keeping it in the graph."""
+        if item.scene() is not self or item is self.mouseGrabberItem():
+            return
+
+        selected = item.isSelected()
+        super().removeItem(item)
+        if item.isSelected() != selected:
+            item.setSelected(selected)
+
+        self._parked.add(item)
+
+    def _unpark(self, item: QGraphicsItem):
+        """Bring a parked item back into the scene."""
+        if item not in self._parked:
+            return
+
+        self._parked.discard(item)
+
+        selected = item.isSelected()
+        super().addItem(item)
+        if item.isSelected() != selected:
+            item.setSelected(selected)
 
     # Selection ========================================================================================================
     def selectAll(self):
-        self.graph.selectAll()
+        self._graph.selectAll()
+
+        for record in self._records:
+            record.selected = True
+
+    def clearSelection(self):
+        super().clearSelection()
+
+        for item in self._parked:
+            item.setSelected(False)
+        for record in self._records:
+            record.selected = False
 
     def selection(self) -> Graph:
-        return self.graph.selection()
+        self._buildSelected()
+        return self._graph.selection()
     
     def clipboardSelection(self) -> Graph:
-        return self.graph.clipboardSelection()
+        self._buildSelected()
+        return self._graph.clipboardSelection()
     
     def wideSelection(self) -> Graph:
-        return self.graph.wideSelection()
+        self._buildSelected()
+        return self._graph.wideSelection()
+
+    def _buildSelected(self):
+        """Build selected nodes that are not built yet, so that the selection can be taken from the graph."""
+        selected = [record for record in self._records if record.selected]
+
+        for record in selected:
+            self._build(record)
+        if selected:
+            self._scheduleVirtualization()
 
     # User actions =====================================================================================================
     def cutEvent(self):
@@ -276,10 +990,11 @@ class Scheme(QGraphicsScene):
         if package.hasFormat(self.ClipboardMimeType):
             graph = mime.load(package, self.ClipboardMimeType, hooks=hooks.qt)
             
-            for node in graph.nodes:
-                self.addItem(node)
-            for edge in graph.edges:
-                self.addItem(edge)           
+            with self.bulkLoad():
+                for node in graph.nodes:
+                    self.addItem(node)
+                for edge in graph.edges:
+                    self.addItem(edge)
 
             self.clearSelection()  # Clear old selection
             graph.selectAll()  # Create new selection (pasted items)
@@ -397,7 +1112,7 @@ class Scheme(QGraphicsScene):
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Alt:
             event.accept()
-            for node in self.graph.nodes:
+            for node in self._graph.nodes:
                 node.showConnectionText()
             return
         
@@ -406,7 +1121,7 @@ class Scheme(QGraphicsScene):
     def keyReleaseEvent(self, event):
         if event.key() == Qt.Key_Alt:
             event.accept()
-            for node in self.graph.nodes:
+            for node in self._graph.nodes:
                 node.hideConnectionText()
             return
 
@@ -414,21 +1129,151 @@ class Scheme(QGraphicsScene):
 
     # Serialization ====================================================================================================
     def serialize(self) -> dict:
-        return self.graph.serialize()
+        data = self._graph.serialize()
+        if not self._records:
+            return data
+
+        # Nodes that are not built yet are stored as they were read
+        index = {node: i for i, node in enumerate(data["nodes"])}
+        for record in self._records:
+            index[record] = len(data["nodes"])
+            data["nodes"].append(record.data)
+
+        for edge_record in self._edgeRecords():
+            data["edges"].append({
+                "source": {
+                    "node_index": index[edge_record.source.node or edge_record.source],
+                    "connection_index": edge_record.source_index
+                },
+                "target": {
+                    "node_index": index[edge_record.target.node or edge_record.target],
+                    "connection_index": edge_record.target_index
+                }
+            })
+
+        return data
 
     @classmethod
     def deserialize(cls, data: dict):
         """Deserialize this object from a dict of data."""
+        return run_steps(cls.deserialize_steps(data))
+
+    @classmethod
+    def deserialize_steps(cls, data: dict):
+        """Deserialize this object like `deserialize`, yielding after every node and edge that is added to the graph
+        and to the scene (see `BaseDecoder.decode_steps`).
+        """
         obj = cls()
 
         # Deserialize the graph ----------------------------------------------------------------------------------------
-        obj.graph = Graph.deserialize(data)
+        obj._graph = yield from Graph.deserialize_steps(data)
 
         # Bring the scene up to speed ----------------------------------------------------------------------------------
-        for node in obj.graph.nodes:
-            super(Scheme, obj).addItem(node)
-
-        for edge in obj.graph.edges:
-            super(Scheme, obj).addItem(edge)
+        if len(obj._graph.nodes) >= cls.virtualization_threshold:
+            # Large schemes start with all items parked. Items near the visible area are added to the scene as soon as a
+            # view reports it.
+            obj.setCompactConnections(True)
+            obj._virtualized = True
+            obj._parked = set(obj._graph)
+            obj.updateVirtualization()
+            return obj
+
+        with obj.bulkLoad():
+            for node in obj._graph.nodes:
+                super(Scheme, obj).addItem(node)
+                yield
+
+            for edge in obj._graph.edges:
+                super(Scheme, obj).addItem(edge)
+                yield
         
         return obj
+
+    @classmethod
+    def deserialize_raw_steps(cls, data: dict, decoder):
+        """Deserialize this object from data that is not decoded yet (see `BaseDecoder.decode_steps`).
+        A scheme with fewer than `virtualization_threshold` nodes is decoded as usual. A larger scheme is virtualized,
+        and its nodes and edges are kept as records (see `NodeRecord`) that are built only when they come near the
+        visible area, so opening it costs little more than reading the file. Its nodes use compact connections.
+        """
+        if len(data["nodes"]) < cls.virtualization_threshold:
+            decoded = yield from decoder.decode_steps({key: value for key, value in data.items() if key != "__class__"})
+            return (yield from cls.deserialize_steps(decoded))
+
+        obj = cls()
+        obj.setCompactConnections(True)
+        obj._virtualized = True
+        obj._decoder = decoder
+
+        records = [NodeRecord(node_data, obj._recordRect(node_data)) for node_data in data["nodes"]]
+
+        for edge_data in data["edges"]:
+            source = records[edge_data["source"]["node_index"]]
+            target = records[edge_data["target"]["node_index"]]
+            edge_record = EdgeRecord(
+                source, edge_data["source"]["connection_index"], target, edge_data["target"]["connection_index"]
+            )
+
+            source.edges.append(edge_record)
+            target.edges.append(edge_record)
+
+        obj._records = set(records)
+        obj.updateVirtualization()  # Sets scene rect to cover the whole graph
+        return obj
+
+    def _recordRect(self, data: dict) -> QRectF:
+        """Estimate the bounding rect of a node from its serialized data, using a default node of the same class."""
+        cls = self._decoder.custom_class(data)
+
+        extent = self._record_extents.get(cls)
+        if extent is None:
+            node = cls()
+            node.setCompactConnections(self._compact_connections)
+            extent = self._record_extents[cls] = node.boundingRect()
+
+        return extent.translated(px(self._decoder.decode(data["position"])))
+
+
+# Grid cell spans ======================================================================================================
+# A span is a rectangle of grid cells (left, top, right, bottom), given by inclusive column and row numbers, or None
+# if it has no cells. See `Scheme._cellSpan`.
+def _spanSize(span) -> int:
+    left, top, right, bottom = span
+    return (right - left + 1) * (bottom - top + 1)
+
+
+def _spanContains(span, cell) -> bool:
+    left, top, right, bottom = span
+    return left <= cell[0] <= right and top <= cell[1] <= bottom
+
+
+def _intersectSpans(a, b):
+    if a is None or b is None:
+        return None
+
+    span = (max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3]))
+    if span[0] > span[2] or span[1] > span[3]:
+        return None
+    return span
+
+
+def _subtractSpan(span, hole) -> list:
+    """Return the cells of `span` that are not in `hole`, as at most four spans."""
+    hole = _intersectSpans(span, hole)
+    if hole is None:
+        return [span]
+
+    left, top, right, bottom = span
+    hole_left, hole_top, hole_right, hole_bottom = hole
+    parts = []
+
+    if top < hole_top:
+        parts.append((left, top, right, hole_top - 1))
+    if hole_bottom < bottom:
+        parts.append((left, hole_bottom + 1, right, bottom))
+    if left < hole_left:
+        parts.append((left, hole_top, hole_left - 1, hole_bottom))
+    if hole_right < right:
+        parts.append((hole_right + 1, hole_top, right, hole_bottom))
+
+    return parts
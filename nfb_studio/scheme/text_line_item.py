@@ -1,16 +1,51 @@
+from contextlib import contextmanager
+from typing import Tuple
+
 from PySide2.QtCore import Qt, QRectF
-from PySide2.QtGui import QFont, QFontMetricsF, QBrush, QPainter
+from PySide2.QtGui import QFont, QBrush, QPainter
 from PySide2.QtWidgets import QGraphicsItem, QAbstractGraphicsShapeItem, QGraphicsRectItem
 
+from .font_metrics import elided_text
 from .unitconv import inches_to_pixels as px
 
 
+def text_line_geometry(font: QFont, text: str, max_width, elide_mode, align_mode) -> Tuple[str, QRectF]:
+    """Compute the elided text and drawing rectangle of a line of text, relative to the origin point.
+    This is the geometry that TextLineItem uses. It is also used by items that draw text lines without a child item.
+    """
+    # Compute elided text and its bounding rectangle. Results are shared between all text items.
+    elided, rect = elided_text(font, text, max_width, elide_mode)
+
+    # It seems that for small characters like "..." the bounding rect returned is too small. Adjust it by a small
+    # value.
+    metrics_correction = px(1/72)
+    rect.adjust(-metrics_correction, 0, metrics_correction, 0)
+
+    # Move origin point according to the alignment
+    if align_mode & Qt.AlignLeft:
+        rect.moveLeft(0)
+    elif align_mode & Qt.AlignRight:
+        rect.moveRight(0)
+    else:
+        rect.moveLeft(-rect.width()/2)
+
+    return elided, rect
+
+
 class TextLineItem(QAbstractGraphicsShapeItem):
     """A one-line text item.
 
     Default origin point is at the left side of the baseline. This can change if setAlignMode is called. TextLineItem
     also supports drawing text background. Its brush can be set using setBackgroundBrush(). Text must not contain
     newline characters.
+
+    Geometry is recomputed after every setter. To change several properties at once and only recompute the geometry
+    once, use `batchUpdate()`:
+    ```python
+    with item.batchUpdate():
+        item.setFont(font)
+        item.setMaximumWidth(width)
+    ```
     """
     def __init__(self, text=None, parent=None):
         super().__init__(parent)
@@ -24,6 +59,11 @@ class TextLineItem(QAbstractGraphicsShapeItem):
         self._bounding_rect = QRectF()
         """Bounding and drawing rectangle. Determined automatically."""
 
+        self._batch_depth = 0
+        """Number of nested `batchUpdate()` blocks that are currently active."""
+        self._adjust_pending = False
+        """True if a setter was called inside `batchUpdate()` and geometry needs to be adjusted at the end."""
+
         self.background = QGraphicsRectItem(self)
         self.background.setPen(Qt.NoPen)
         self.background.setFlag(QGraphicsItem.ItemStacksBehindParent)
@@ -33,18 +73,21 @@ class TextLineItem(QAbstractGraphicsShapeItem):
     def setText(self, text: str, /) -> None:
         if '\n' in text:
             raise ValueError("text must not contain newline characters")
+        if text == self._text:
+            return
 
-        self.prepareGeometryChange()
         self._text = text
-        self.adjust()
+        self._requestAdjust()
 
     def setElideMode(self, mode: int, /) -> None:
         """Elide mode specifies where the ellipsis should be located when the text is elided. Default value is 
         Qt.ElideRight.
         """
-        self.prepareGeometryChange()
+        if mode == self._elide_mode:
+            return
+
         self._elide_mode = mode
-        self.adjust()
+        self._requestAdjust()
 
     def setAlignMode(self, mode: int, /) -> None:
         """Align mode specifies text alignment.
@@ -56,20 +99,26 @@ class TextLineItem(QAbstractGraphicsShapeItem):
 
         Vertical alignment has no meaning for one line of text and should not be set. Default value is Qt.AlignLeft.
         """
-        self.prepareGeometryChange()
+        if mode == self._align_mode:
+            return
+
         self._align_mode = mode
-        self.adjust()
+        self._requestAdjust()
 
     def setMaximumWidth(self, width, /):
         """Set the maximum width the text is allowed to be. `None` represents unlimited width."""
-        self.prepareGeometryChange()
+        if width == self._max_width:
+            return
+
         self._max_width = width
-        self.adjust()
+        self._requestAdjust()
 
     def setFont(self, font: QFont, /) -> None:
-        self.prepareGeometryChange()
-        self._font = font
-        self.adjust()
+        if font == self._font:
+            return
+
+        self._font = QFont(font)
+        self._requestAdjust()
 
     def setBackgroundBrush(self, brush: QBrush, /):
         self.background.setBrush(brush)
@@ -96,34 +145,36 @@ class TextLineItem(QAbstractGraphicsShapeItem):
     def backgroundBrush(self):
         return self.background.brush()
 
+    @contextmanager
+    def batchUpdate(self):
+        """Context manager that defers geometry adjustment until the end of the `with` block.
+        Blocks can be nested; geometry is adjusted once, when the outermost block exits, and only if something changed.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+
+            if self._batch_depth == 0 and self._adjust_pending:
+                self._adjust_pending = False
+                self.prepareGeometryChange()
+                self.adjust()
+
+    def _requestAdjust(self):
+        """Adjust geometry now, or at the end of the current `batchUpdate()` block."""
+        if self._batch_depth > 0:
+            self._adjust_pending = True
+            return
+
+        self.prepareGeometryChange()
+        self.adjust()
+
     def adjust(self):
         """Adjust the item's geometry in response to changes."""
-        metrics = QFontMetricsF(self.font())
-
-        # Get bounding rectangle for full text
-        self._bounding_rect = metrics.boundingRect(self.text())
-
-        # Constrain by maximum width
-        if self.maximumWidth() is not None:
-            self._bounding_rect.setWidth(self.maximumWidth())
-
-        # Compute elided text
-        self._elided_text = metrics.elidedText(self.text(), self.elideMode(), self.boundingRect().width())
-
-        # Get bounding rectangle for elided text
-        self._bounding_rect = metrics.boundingRect(self.elidedText())
-        # It seems that for small characters like "..." the bounding rect returned is too small. Adjust it by a small
-        # value.
-        metrics_correction = px(1/72)
-        self._bounding_rect.adjust(-metrics_correction, 0, metrics_correction, 0)
-
-        # Move origin point according to the alignment
-        if self.alignMode() & Qt.AlignLeft:
-            self._bounding_rect.moveLeft(0)
-        elif self.alignMode() & Qt.AlignRight:
-            self._bounding_rect.moveRight(0)
-        else:
-            self._bounding_rect.moveLeft(-self._bounding_rect.width()/2)
+        self._elided_text, self._bounding_rect = text_line_geometry(
+            self.font(), self.text(), self.maximumWidth(), self.elideMode(), self.alignMode()
+        )
 
         # Set background rect
         self.background.setRect(self.boundingRect())
@@ -1,7 +1,7 @@
 from typing import Union
 
 from PySide2.QtCore import Qt, QRectF
-from PySide2.QtGui import QPainter
+from PySide2.QtGui import QPainter, QFont
 from PySide2.QtWidgets import QGraphicsSimpleTextItem
 
 
@@ -9,6 +9,7 @@ class TextRectItem(QGraphicsSimpleTextItem):
     """A block of text.
     
     Text can be confined to a certain rectangular frame. Parts of text that do not fit will be cut off.
+    Setting the same text or font again is a no-op, so that repeated updates do not trigger a new text layout.
     """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -16,6 +17,18 @@ class TextRectItem(QGraphicsSimpleTextItem):
         self._frame: Union[QRectF, None] = None
         self._alignment = Qt.AlignLeft
 
+    def setText(self, text: str):
+        if text == self.text():
+            return
+
+        super().setText(text)
+
+    def setFont(self, font: QFont):
+        if font == self.font():
+            return
+
+        super().setFont(font)
+
     def setFrame(self, frame: Union[QRectF, None]):
         """Set the frame to which the text must be confined.
         If frame is None, text will be displayed with no limitations.
@@ -45,15 +45,30 @@ class Toolbox(QAbstractListModel):
         return None
 
     def addItem(self, name, item):
+        """Add an item with a specified name to the toolbox.
+        Instead of an item, a function without arguments that returns it can be passed. The function is called when the
+        item is first needed, so that adding many items is fast.
+        """
         i = self._items.bisect_right(name)
 
         self.beginInsertRows(QModelIndex(), i, i)
         self._items[name] = item
         self.endInsertRows()
 
+    def item(self, name):
+        """Return an item with a specified name, or None if it does not exist."""
+        if name not in self._items:
+            return None
+
+        item = self._items[name]
+        if callable(item):
+            item = self._items[name] = item()  # Create an item that was added as a function
+        return item
+
     def removeItem(self, name):
         """Remove an item with a specified name from a toolbox.
-        If an item with such a name does not exist, does nothing.
+        If an item with such a name does not exist, does nothing. Returns the item, or the function that was passed to
+        `addItem` if the item has not been created.
         """
         if name not in self._items:
             return None
@@ -81,7 +96,7 @@ class Toolbox(QAbstractListModel):
         i = indexes[0].row()
 
         package = QMimeData()
-        mime.dump(self._items.peekitem(i)[1], package, self.DragMimeType, hooks=hooks.qt)
+        mime.dump(self.item(self._items.peekitem(i)[0]), package, self.DragMimeType, hooks=hooks.qt)
 
         return package
     
@@ -102,6 +117,8 @@ class Toolbox(QAbstractListModel):
 
     # Serialization ====================================================================================================
     def serialize(self) -> dict:
+        for name in self._items:
+            self.item(name)
         return self._items
     
     @classmethod
@@ -1,7 +1,7 @@
 """Converts units in inches to units in pixels using logical dpi of the application."""
 from typing import Union
 from PySide2.QtCore import QPoint, QPointF, QSize, QSizeF, QRect, QRectF
-from PySide2.QtWidgets import QApplication, QWidget
+from PySide2.QtWidgets import QApplication
 
 
 def dpi():
@@ -10,7 +10,8 @@ def dpi():
     if QApplication.instance() is None:
         raise RuntimeError("dpi(): Must construct a QApplication before measuring dpi")
 
-    return QWidget().logicalDpiX()
+    # Same value as QWidget().logicalDpiX(), without creating a widget on every call
+    return int(QApplication.primaryScreen().logicalDotsPerInchX() + 0.5)
 
 
 def inches_to_pixels(value: Union[int, float, QPoint, QPointF, QSize, QSizeF, QRect, QRectF]):
@@ -1,3 +1,3 @@
 """Base encoder and decoder provide the backbone of the serialization engine."""
 from .encoder import BaseEncoder
-from .decoder import BaseDecoder
+from .decoder import BaseDecoder, run_steps
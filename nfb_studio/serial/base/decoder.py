@@ -12,6 +12,15 @@ def deepgetattr(obj, attr):
     return reduce(getattr, attr.split('.'), obj)
 
 
+def run_steps(steps):
+    """Run a generator of steps (see `BaseDecoder.decode_steps`) to the end and return its result."""
+    try:
+        while True:
+            next(steps)
+    except StopIteration as e:
+        return e.value
+
+
 class BaseDecoder:
     """Backend class managing decoding raw dicts of objects to proper dicts of objects."""
 
@@ -36,6 +45,10 @@ class BaseDecoder:
         """Decode a dict object.
         If dict has metadata, this function will call decode_custom after decoding the internal values.
         """
+        cls = self.raw_class(data)
+        if cls is not None:
+            return run_steps(cls.deserialize_raw_steps(data, self))
+
         result = {}
         for key, value in data.items():
             result[key] = self.decode(value)
@@ -46,7 +59,57 @@ class BaseDecoder:
         
         return result
 
-    def decode_custom(self, data):
+    def decode_steps(self, data):
+        """Decode data like `decode`, in steps.
+        This function is a generator that yields each custom object after it is decoded, and returns the decoded data
+        (as the value of StopIteration). It allows decoding big documents in parts, for example between events of a GUI.
+        Classes that take long to deserialize can define a generator `deserialize_steps(data: dict)` that yields None
+        between parts of their work and returns the object; it is used instead of `deserialize`.
+        Classes that decode parts of their data only when needed can define a generator
+        `deserialize_raw_steps(data: dict, decoder)` instead. It receives the data before any of its values are decoded,
+        and this decoder to decode them with.
+        """
+        if isinstance(data, dict):
+            cls = self.raw_class(data)
+            if cls is not None:
+                result = yield from cls.deserialize_raw_steps(data, self)
+                yield result
+                return result
+
+            result = {}
+            for key, value in data.items():
+                result[key] = (yield from self.decode_steps(value)) if isinstance(value, (dict, list)) else value
+
+            if "__class__" in result:
+                cls = self.custom_class(result)
+                if cls not in self.hooks and callable(getattr(cls, "deserialize_steps", None)):
+                    result = yield from cls.deserialize_steps(result)
+                else:
+                    result = self.decode_custom(result)
+                yield result
+
+            return result
+        if isinstance(data, list):
+            result = []
+            for item in data:
+                result.append((yield from self.decode_steps(item)) if isinstance(item, (dict, list)) else item)
+
+            return result
+
+        return data
+
+    def raw_class(self, data):
+        """Return the class of a custom object if it deserializes from data that is not decoded yet, otherwise None."""
+        if "__class__" not in data:
+            return None
+
+        cls = self.custom_class(data)
+        if cls in self.hooks or not callable(getattr(cls, "deserialize_raw_steps", None)):
+            return None
+        return cls
+
+    def custom_class(self, data):
+        """Return the class of a custom object from its metadata."""
         # The following code is adapted from django.utils.module_loading module.
         module_path = data["__class__"]["__module__"]
         class_name = data["__class__"]["__qualname__"]
@@ -64,6 +127,11 @@ class BaseDecoder:
         if not isclass(cls):
             raise TypeError("{}.{} is not a class".format(module_path, class_name))
 
+        return cls
+
+    def decode_custom(self, data):
+        cls = self.custom_class(data)
+
         # Load the json data into the object
         if cls in self.hooks:
             return self.hooks[cls](data)
@@ -71,7 +139,7 @@ class BaseDecoder:
             return cls.deserialize(data)
         
         message = "{}.{} does not have a callable \"deserialize\" attribute" \
-            .format(module_path, class_name)
+            .format(data["__class__"]["__module__"], data["__class__"]["__qualname__"])
         raise AttributeError(message)
 
     @property
@@ -74,5 +74,48 @@ class XMLEncoder:
 
         return data_xml
 
+    # Fragments ========================================================================================================
+    # A document can be assembled from separately encoded fragments, so that fragments can be cached and reused. For
+    # any data, `join(key, [encode_element(k, v, 1) for k, v in data.items()])` is the same as `encode({key: data})`.
+    def encode_element(self, key: str, obj, depth: int) -> str:
+        """Encode `obj` as the element `key` (or several elements, if `obj` is a list) nested at `depth` > 0."""
+        data = self.base_encoder.encode({key: obj})
+
+        if self.metadata:
+            self._convert_metadata(data)
+
+        self._prepare_data(data)
+
+        return xd.unparse(
+            data,
+            encoding=self.encoding,
+            full_document=False,
+            attr_prefix=self.attr_prefix,
+            cdata_key=self.cdata_key,
+            pretty=True,
+            newl=self.separator,
+            indent=self.indent,
+            depth=depth
+        )
+
+    def join(self, key: str, fragments, depth: int = 0) -> str:
+        """Encode the element `key` nested at `depth`, with already encoded `fragments` as its children.
+        At depth 0, returns a complete document.
+        """
+        children = "".join(fragments)
+
+        if depth == 0:
+            empty = xd.unparse({key: None}, encoding=self.encoding)  # XML declaration and an empty root element
+            header = empty[:-len("<{0}></{0}>".format(key))]
+
+            if children == "":
+                return empty
+            return header + "<" + key + ">" + self.separator + children + "</" + key + ">"
+
+        indent = self.indent * depth
+        if children == "":
+            return indent + "<" + key + "></" + key + ">" + self.separator
+        return indent + "<" + key + ">" + self.separator + children + indent + "</" + key + ">" + self.separator
+
 expose_property(XMLEncoder, "base_encoder", "hooks")
 expose_property(XMLEncoder, "base_encoder", "metadata")
@@ -1,4 +1,4 @@
-from .lsl_input import LSLInput
+from .lsl_input import LSLInput, LSLDataSource, RecordingDataSource, RecordingRegistry
 from .spatial_filter import SpatialFilter
 from .bandpass_filter import BandpassFilter
 from .envelope_detector import EnvelopeDetector
@@ -6,6 +6,8 @@ from .standardise import Standardise
 from .derived_signal_export import DerivedSignalExport
 from .composite_signal_export import CompositeSignalExport
 from .artificial_delay import ArtificialDelay
+from .export_plan import ExportPlan, ExportError, ChainError
+from .validator import SchemeValidator
 
 node_types = {
     "LSL Input": LSLInput,
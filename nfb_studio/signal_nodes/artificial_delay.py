@@ -64,6 +64,7 @@ class ArtificialDelay(SignalNode):
     def _adjust(self):
         """Adjust visuals in response to changes."""
         self.updateView()
+        self.parameterChange()
 
         self.setDescription(f"{self.delay()} ms")
 
@@ -4,6 +4,7 @@ from PySide2.QtWidgets import QSpinBox, QWidget, QComboBox, QLabel, QFormLayout,
 from ..scheme import Node, Input, Output, DataType
 from .signal_node import SignalNode
 from .spatial_filter import SpatialFilter
+from .response_plot import FrequencyResponsePlot
 
 
 class BandpassFilter(SignalNode):
@@ -69,6 +70,9 @@ class BandpassFilter(SignalNode):
             self.filter_order.setRange(1, 4)
             self.filter_order.valueChanged.connect(self.updateModel)
 
+            # Frequency response ---------------------------------------------------------------------------------------
+            self.response = FrequencyResponsePlot()
+
             # ----------------------------------------------------------------------------------------------------------
             layout = QFormLayout()
             layout.addRow("Lower bound:", lower_bound_widget)
@@ -76,6 +80,7 @@ class BandpassFilter(SignalNode):
             layout.addRow("Filter type:", self.filter_type)
             layout.addRow("Filter order:", self.filter_order)
             layout.addRow("Filter length:", self.filter_length)
+            layout.addRow(self.response)
             self.setLayout(layout)
 
         def updateModel(self):
@@ -161,6 +166,16 @@ class BandpassFilter(SignalNode):
             else:
                 self.filter_order.setEnabled(False)
 
+            # Plot the response of the node's filter
+            n = self.node()
+            if n is not None:
+                data_source = n.dataSourceInfo()
+                fs = data_source.frequency if data_source is not None else None
+
+                self.response.setParameters(
+                    n.filterType(), n.lowerBound(), n.upperBound(), fs, n.filterOrder(), n.filterLength()
+                )
+
     default_lower_bound = 0.0
     default_upper_bound = 250.0
     default_filter_type = "butter"
@@ -225,6 +240,7 @@ class BandpassFilter(SignalNode):
     def _adjust(self):
         """Adjust visuals in response to changes."""
         self.updateView()
+        self.parameterChange()
 
         lower_bound = self.lowerBound()
         if self.lowerBound() is None:
@@ -246,6 +262,10 @@ class BandpassFilter(SignalNode):
             f"Length: {self.filterLength()}"
         )
 
+    def upstreamUpdate(self):
+        self.updateView()  # The sampling frequency of the data source may have changed
+        super().upstreamUpdate()
+
     # Serialization ====================================================================================================
     def add_nfb_export_data(self, signal: dict):
         """Add this node's data to the dict representation of the signal."""
@@ -1,7 +1,8 @@
 """NFB main source signal."""
 from PySide2.QtWidgets import QWidget, QFormLayout, QLineEdit
 
-from ..scheme import Node, Input, Output, DataType
+from ..scheme import Node, Input, Output, DataType, ErrorMessage, WarningMessage
+from ..engine.expression import compile_expression, ExpressionError
 from .signal_node import SignalNode
 from .derived_signal_export import DerivedSignalExport
 
@@ -79,12 +80,61 @@ class CompositeSignalExport(SignalNode):
     def _adjust(self):
         """Adjust visuals in response to changes."""
         self.updateView()
+        self.parameterChange()
 
         self.setDescription("{} =\n{}".format(
                 self.signalName(),
                 self.expression(),
             )
         )
+        self.updateExpressionMessages()
+
+    def upstreamUpdate(self):
+        self.updateExpressionMessages()
+        super().upstreamUpdate()
+
+    # Expression =======================================================================================================
+    def compiledExpression(self):
+        """Return the expression compiled for evaluation (see `nfb_studio.engine.expression`), or None if the expression
+        is empty or invalid. Compiled expressions are cached, so this function is cheap to call repeatedly.
+        """
+        if self.expression().strip() == "":
+            return None
+
+        try:
+            return compile_expression(self.expression())
+        except ExpressionError:
+            return None
+
+    def derivedSignalNames(self) -> set:
+        """Names of derived signals connected to this node's input."""
+        names = set()
+
+        for edge in self.inputs[0].edges:
+            source = edge.sourceNode()
+            if source is not None and hasattr(source, "signalName"):
+                names.add(source.signalName())
+
+        return names
+
+    def updateExpressionMessages(self):
+        """Check the expression and show problems as messages on the node.
+        An invalid expression produces an error message, and names that are not connected derived signals produce a
+        warning message.
+        """
+        messages = []
+
+        if self.expression().strip() != "":
+            try:
+                compiled = compile_expression(self.expression())
+            except ExpressionError as e:
+                messages.append(ErrorMessage(str(e)))
+            else:
+                unknown = compiled.unknown_names(self.derivedSignalNames())
+                if unknown:
+                    messages.append(WarningMessage("Unknown signal: " + ", ".join(sorted(unknown))))
+
+        self.setTransientMessages("expression", messages)
 
     # Serialization ====================================================================================================
     def add_nfb_export_data(self, signal: dict):
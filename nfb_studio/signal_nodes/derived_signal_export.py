@@ -1,7 +1,8 @@
 """NFB main source signal."""
 from PySide2.QtWidgets import QWidget, QFormLayout, QLineEdit
 
-from ..scheme import Node, Input, Output, DataType
+from ..scheme import Node, Input, Output, DataType, InfoMessage
+from ..engine.latency import signal_latency
 from .signal_node import SignalNode
 from .spatial_filter import SpatialFilter
 from .bandpass_filter import BandpassFilter
@@ -63,14 +64,43 @@ class DerivedSignalExport(SignalNode):
 
     def setSignalName(self, name: str, /):
         self._signal_name = name
-        self._adjust()
+        self._adjust()  # Nodes that use this signal by name (such as composite signals) are updated
 
     def _adjust(self):
         """Adjust visuals in response to changes."""
         self.updateView()
+        self.parameterChange()
 
         self.setDescription(self.signalName())
 
+    def upstreamUpdate(self):
+        self.updateLatencyMessage()
+        super().upstreamUpdate()
+
+    # Latency ==========================================================================================================
+    def latency(self):
+        """Compute the latency of this signal (see `nfb_studio.engine.latency`).
+        Returns a LatencyBudget, or None if the signal is not connected to a data source or a filter is invalid.
+        Latencies of stages are cached, so this function is cheap to call repeatedly.
+        """
+        data_source = self.dataSourceInfo()
+        if data_source is None:
+            return None
+
+        signal = {}
+        for node in self.chainNodes():
+            node.add_nfb_export_data(signal)
+
+        try:
+            return signal_latency(signal, data_source.frequency)
+        except ValueError:
+            return None
+
+    def updateLatencyMessage(self):
+        """Show the latency of this signal as a message on the node."""
+        budget = self.latency()
+        self.setTransientMessages("latency", [InfoMessage(str(budget))] if budget is not None else [])
+
     # Serialization ====================================================================================================
     def add_nfb_export_data(self, signal: dict):
         """Add this node's data to the dict representation of the signal."""
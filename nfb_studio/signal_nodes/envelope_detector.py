@@ -118,6 +118,7 @@ class EnvelopeDetector(SignalNode):
     def _adjust(self):
         """Adjust visuals in response to changes."""
         self.updateView()
+        self.parameterChange()
 
         self.setDescription(
             f"Smoothing Factor: x{self.smoothingFactor()}\n"
@@ -0,0 +1,159 @@
+"""Planning the export of derived signals.
+
+Every DerivedSignalExport node is exported as a signal dict, made of the data of the nodes in its chain (see
+`add_nfb_export_data`), from the export node up to the LSLInput. Chains often share nodes: several export nodes can be
+connected to the same LSLInput or SpatialFilter. `ExportPlan` visits every node upstream of an export node once, and
+computes for it the upstream chain and the partial signal dict of that chain. Results of shared nodes are reused, so
+planning is linear in the size of the scheme.
+
+Chains that can not be exported (an input that is not connected, a cycle, a chain that does not start with an
+LSLInput) are reported as ChainError objects instead of exceptions.
+"""
+from typing import List
+
+from .lsl_input import LSLInput
+from .bandpass_filter import BandpassFilter
+from .envelope_detector import EnvelopeDetector
+from .derived_signal_export import DerivedSignalExport
+
+
+class ChainError:
+    """A problem that prevents a derived signal from being exported."""
+    def __init__(self, signal_node, node, text):
+        self.signal_node = signal_node
+        """The DerivedSignalExport node of the signal."""
+        self.node = node
+        """The node where the problem is."""
+        self.text = text
+
+    def __str__(self):
+        return "Derived signal \"{}\": {}".format(self.signal_node.signalName(), self.text)
+
+
+class ExportError(ValueError):
+    """Raised when an experiment can not be exported. `errors` is a list of ChainError."""
+    def __init__(self, errors):
+        super().__init__("\n".join(str(error) for error in errors))
+        self.errors = list(errors)
+
+
+class _Upstream:
+    """Result of planning for one node: its upstream chain and partial signal dict, or the problem with its chain."""
+    __slots__ = ("node", "parent", "data", "error")
+
+    def __init__(self, node, parent, data, error):
+        self.node = node
+        self.parent = parent
+        """_Upstream of the node connected to this node's input, or None at the start of the chain."""
+        self.data = data
+        """Data of this node and all nodes upstream of it, in the order of `add_nfb_export_data` calls."""
+        self.error = error
+        """(node, text) of a problem upstream, or None."""
+
+
+class ExportPlan:
+    """Chains and signal dicts of all derived signals in a signal scheme graph.
+
+    Example:
+    ```python
+    plan = ExportPlan(scheme.graph)
+    plan.raise_errors()
+    signals = [plan.signal_data(chain) for chain in plan.signals]
+    ```
+    """
+    def __init__(self, graph):
+        self.signals = []
+        """Chains of the derived signals that can be exported, as lists of nodes from the DerivedSignalExport to the
+        LSLInput. Signals are in the topological order of the graph, which does not depend on hashing of the nodes.
+        """
+        self.errors = []
+        """ChainError for every derived signal that can not be exported."""
+
+        self._upstream = {}
+        """_Upstream for every visited node."""
+
+        for node in graph.topologicalOrder():
+            if isinstance(node, DerivedSignalExport):
+                upstream = self._plan(node)
+
+                if upstream.error is not None:
+                    self.errors.append(ChainError(node, *upstream.error))
+                    continue
+
+                chain = []
+                while upstream is not None:
+                    chain.append(upstream.node)
+                    upstream = upstream.parent
+                self.signals.append(chain)
+
+    def signal_data(self, chain: List) -> dict:
+        """Return the signal dict of a derived signal, given its chain from `signals`."""
+        data = dict(self._upstream[chain[0]].data)
+        data["sTemporalType"] = temporal_type(chain)
+        return data
+
+    def raise_errors(self):
+        """Raise ExportError if some derived signals can not be exported."""
+        if self.errors:
+            raise ExportError(self.errors)
+
+    def _plan(self, signal_node) -> _Upstream:
+        # Walk upstream until a node that was already planned, or the start of the chain
+        path = []
+        on_path = set()
+        node = signal_node
+        base = None
+        error = None
+
+        while node not in self._upstream:
+            if node in on_path:
+                error = (node, "the chain has a cycle at \"{}\"".format(node.title()))
+                break
+
+            path.append(node)
+            on_path.add(node)
+
+            if len(node.inputs) == 0:
+                if not isinstance(node, LSLInput):
+                    error = (node, "the chain does not start with an LSL Input")
+                break
+
+            edges = node.inputs[0].edges
+            if len(edges) > 1:
+                error = (node, "input of \"{}\" has more than one connection".format(node.title()))
+                break
+
+            source = next(iter(edges)).sourceNode() if len(edges) == 1 else None
+            if source is None:
+                error = (node, "input of \"{}\" is not connected".format(node.title()))
+                break
+
+            node = source
+        else:
+            base = self._upstream[node]
+            error = base.error
+
+        # Fill in results from the start of the chain down to the signal node
+        for node in reversed(path):
+            if error is not None:
+                base = _Upstream(node, None, None, error)
+            else:
+                data = {}
+                node.add_nfb_export_data(data)
+                if base is not None:
+                    data.update(base.data)  # Upstream nodes are added later, so their values win
+
+                base = _Upstream(node, base, data, None)
+
+            self._upstream[node] = base
+
+        return base
+
+
+def temporal_type(chain: List) -> str:
+    """Return the "sTemporalType" of a derived signal's chain, which depends on the node before the export node."""
+    if isinstance(chain[1], EnvelopeDetector):
+        return "envdetector"
+    if isinstance(chain[1], BandpassFilter):
+        return "filter"
+    return "identity"
@@ -1,16 +1,85 @@
 """NFB main source signal."""
+import os
+
 from PySide2.QtCore import Qt
-from PySide2.QtWidgets import QWidget, QComboBox, QLabel, QFormLayout, QFrame
+from PySide2.QtWidgets import (QWidget, QComboBox, QLabel, QFormLayout, QFrame, QPushButton, QFileDialog, QInputDialog,
+    QMessageBox)
 
-from ..scheme import Node, Output, DataType
+from ..scheme import Node, Output, DataType, WarningMessage
+from ..engine.recording import open_recording
+from ..stream_registry import StreamRegistry
 from .signal_node import SignalNode
 
 
 class LSLDataSource:
-    def __init__(self, name=None, channel_count=None, frequency=None):
+    def __init__(self, name=None, channel_count=None, frequency=None, channel_names=None):
         self.name = name
         self.channel_count = channel_count
         self.frequency = frequency
+        self.channel_names = channel_names
+        """Names of the channels, in order, or None if they are not known in advance."""
+
+    def recording(self):
+        """Return the Recording that this data source reads, or None if it is a live stream."""
+        return None
+
+
+class RecordingDataSource(LSLDataSource):
+    """A data source that reads a recorded file instead of a live stream, like the "LSL file stream" inlet.
+    Creating the data source opens the file, which only reads its header: samples are read lazily, in chunks (see
+    `nfb_studio.engine.recording`). `frequency` and `channel_names` are used if the file does not store them.
+    """
+    def __init__(self, path, frequency=None, channel_names=None):
+        recording = open_recording(path, frequency, channel_names)
+        super().__init__(os.path.basename(path), recording.channel_count, recording.fs, recording.channel_names)
+
+        self.path = path
+        self._recording = recording
+
+    def recording(self):
+        return self._recording
+
+
+class RecordingRegistry:
+    """Recordings opened as data sources by the LSL Input nodes of one experiment.
+    Recordings keep their files open, so the registry must be closed when its experiment is no longer used.
+    """
+    def __init__(self):
+        self._data_sources = []
+
+    def dataSources(self) -> list:
+        """Return data sources of the opened recordings, in the order they were opened."""
+        return list(self._data_sources)
+
+    def add(self, path: str, frequency=None, channel_names=None) -> RecordingDataSource:
+        """Open a recorded file and return its data source.
+        If the file is already open, returns the existing data source. Raises OSError or ValueError if the file can not
+        be opened (see `RecordingDataSource`).
+        """
+        path = os.path.abspath(path)
+
+        for data_source in self._data_sources:
+            if data_source.path == path:
+                return data_source
+
+        data_source = RecordingDataSource(path, frequency, channel_names)
+
+        # Recordings with the same file name get a number
+        names = {x.name for x in self._data_sources}
+        name = data_source.name
+        i = 2
+        while data_source.name in names:
+            data_source.name = "{} ({})".format(name, i)
+            i += 1
+
+        self._data_sources.append(data_source)
+        return data_source
+
+    def close(self):
+        """Close all recordings and remove them from the registry."""
+        for data_source in self._data_sources:
+            data_source.recording().close()
+        self._data_sources.clear()
 
 
 class LSLInput(SignalNode):
@@ -19,6 +88,7 @@ class LSLInput(SignalNode):
         LSLDataSource("NVX136_Data", 32, 500),
         LSLDataSource("Mitsar", 30, 250),
     ]
+    """Known data sources. Streams found on the network and opened recordings are added by `dataSources`."""
 
     output_type = DataType(100)
 
@@ -32,6 +102,12 @@ class LSLInput(SignalNode):
                 self.data_source.addItem(source.name)
             self.data_source.currentTextChanged.connect(self._adjust)
 
+            # Streams are discovered in the background; the list is updated when they are found
+            StreamRegistry.instance().streamsChanged.connect(self.updateView)
+
+            self.open_recording = QPushButton("Open Recording...")
+            self.open_recording.clicked.connect(self.openRecording)
+
             self.channel_count = QLabel()
             self.channel_count.setFrameStyle(QFrame.Panel | QFrame.Sunken)
             self.channel_count.setAlignment(Qt.AlignCenter)
@@ -46,6 +122,7 @@ class LSLInput(SignalNode):
             self.setLayout(layout)
 
             layout.addRow("Data source:", self.data_source)
+            layout.addRow("", self.open_recording)
             layout.addRow("Channel count:", self.channel_count)
             layout.addRow("Frequency:", self.frequency)
 
@@ -53,19 +130,33 @@ class LSLInput(SignalNode):
 
         def _adjust(self):
             """Adjust displayed values after a change."""
-            # Sync changes with the node
+            # Sync changes with the node, which updates the displays
             self.updateModel()
 
-            # Find the data_source with the selected name
-            for data_source in LSLInput.data_sources:
-                if data_source.name == self.data_source.currentText():
-                    break
-            else:
-                data_source = None
-            
-            # Update displays to show new information
-            self.channel_count.setText(str(data_source.channel_count))
-            self.frequency.setText(str(data_source.frequency) + " Hz")
+        def openRecording(self):
+            """Prompt the user to open a recorded file and select it as the data source."""
+            n = self.node()
+            if n is None or n.recordings() is None:
+                return
+
+            path = QFileDialog.getOpenFileName(self, "Open Recording", filter="Recordings (*.npy *.h5 *.hdf5 *.xdf)")[0]
+            if path == "":
+                return
+
+            frequency = None
+            if os.path.splitext(path)[1].lower() == ".npy":
+                # NumPy files do not store the sampling frequency
+                frequency, ok = QInputDialog.getDouble(self, "Open Recording", "Sampling frequency (Hz):", 500, 1, 1e6)
+                if not ok:
+                    return
+
+            try:
+                data_source = n.recordings().add(path, frequency)
+            except (OSError, ValueError, ImportError) as e:
+                QMessageBox.warning(self, "Unable to open the recording", str(e))
+                return
+
+            n.setDataSource(data_source.name)
 
         def updateModel(self):
             n = self.node()
@@ -80,9 +171,26 @@ class LSLInput(SignalNode):
                 return
             
             self.data_source.blockSignals(True)
+
+            # Recordings and streams may have been added since the list was filled
+            names = [data_source.name for data_source in n.dataSources()]
+            if n.dataSource() not in names:
+                names.append(n.dataSource())  # A stream that has not been found (yet)
+            if names != [self.data_source.itemText(i) for i in range(self.data_source.count())]:
+                self.data_source.clear()
+                self.data_source.addItems(names)
+
             self.data_source.setCurrentText(n.dataSource())
             self.data_source.blockSignals(False)
 
+            # Update displays to show information about the data source
+            self.channel_count.setText("")
+            self.frequency.setText("")
+            data_source = n.dataSourceInfo()
+            if data_source is not None:
+                self.channel_count.setText(str(data_source.channel_count))
+                self.frequency.setText(str(data_source.frequency) + " Hz")
+
     def __init__(self, parent=None):
         super().__init__(parent=parent)
 
@@ -90,21 +198,81 @@ class LSLInput(SignalNode):
         self.addOutput(Output("LSL data stream", self.output_type))
         
         self._data_source = self.data_sources[0].name
+        self._recordings = None
+        """RecordingRegistry of the experiment that contains this node, or None."""
+        self._pending_recording = None
+        """Serialized recording (path and frequency) that is opened when the node gets a RecordingRegistry, or None."""
         self._adjust()
 
     def dataSource(self):
         return self._data_source
     
     def setDataSource(self, source: str, /):
-        # TODO: Perform a check that this data source exists
         self._data_source = source
+        self._pending_recording = None
+        self.refreshDataSource()
+
+    def refreshDataSource(self):
+        """Update the node after information about its data source changed, for example when a stream was found."""
         self._adjust()
 
+        # Spatial filters depend on the channels of the data source, and filters on its sampling frequency
+        self.notifyDownstream()
+
+    def recordings(self):
+        """Return the RecordingRegistry in which this node opens recordings, or None."""
+        return self._recordings
+
+    def setRecordings(self, recordings: RecordingRegistry, /):
+        """Set the RecordingRegistry in which this node opens recordings. Called by the experiment that contains the
+        node. A recording that the node was deserialized with is opened now.
+        """
+        self._recordings = recordings
+
+        if recordings is not None and self._pending_recording is not None:
+            try:
+                data_source = recordings.add(self._pending_recording["path"], self._pending_recording["frequency"])
+            except (OSError, ValueError, ImportError):
+                pass  # The recording is missing, shown as a warning on the node. It is kept when the node is saved.
+            else:
+                self._data_source = data_source.name
+                self._pending_recording = None
+
+        self.refreshDataSource()
+
+    def dataSourceInfo(self) -> LSLDataSource:
+        """Return the LSLDataSource with the selected name, or None if there is no such data source."""
+        for data_source in self.dataSources():
+            if data_source.name == self.dataSource():
+                return data_source
+        return None
+
+    def dataSources(self) -> list:
+        """Return all data sources: `data_sources`, recordings opened in `recordings` and LSL streams found on the
+        network. A stream with the name of a known data source replaces it, since it describes the actual device. Never
+        blocks: streams are taken from the cache of `StreamRegistry`, which is refreshed in the background.
+        """
+        streams = {
+            info.name: LSLDataSource(info.name, info.channel_count, info.frequency, info.channel_names)
+            for info in StreamRegistry.instance().streams()
+        }
+
+        result = [streams.pop(data_source.name, data_source) for data_source in self.data_sources]
+        if self._recordings is not None:
+            result.extend(self._recordings.dataSources())
+
+        return result + list(streams.values())
+
     def _adjust(self):
         """Adjust visuals in response to changes."""
         self.updateView()
 
-        ds = [x for x in self.data_sources if x.name == self.dataSource()][0]
+        ds = self.dataSourceInfo()
+        if ds is None:
+            self.setDescription(self.dataSource())
+            self.setTransientMessages("data_source", [WarningMessage("Data source not found")])
+            return
+
         self.setDescription(
             "{}\n{} channels\n{} Hz".format(
                 ds.name,
@@ -112,6 +280,7 @@ class LSLInput(SignalNode):
                 ds.frequency,
             )
         )
+        self.setTransientMessages("data_source", [])
 
     # Serialization ====================================================================================================
     def add_nfb_export_data(self, signal: dict):
@@ -122,11 +291,23 @@ class LSLInput(SignalNode):
         data = super().serialize()
 
         data["data_source"] = self.dataSource()
+
+        ds = self.dataSourceInfo()
+        if isinstance(ds, RecordingDataSource):
+            data["recording"] = {
+                "path": ds.path,
+                "frequency": ds.frequency,
+            }
+        elif self._pending_recording is not None:
+            data["recording"] = self._pending_recording
         return data
     
     @classmethod
     def deserialize(cls, data: dict):
         obj = super().deserialize(data)
+
         obj.setDataSource(data["data_source"])
+        # The recording is opened when the node is added to an experiment (see `setRecordings`)
+        obj._pending_recording = data.get("recording")
 
         return obj
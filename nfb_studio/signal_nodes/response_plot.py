@@ -0,0 +1,176 @@
+"""Plot of a bandpass filter's frequency response, computed in the background."""
+import numpy as np
+from PySide2.QtCore import Qt, QObject, QPointF, QRectF, QRunnable, QThreadPool, QTimer, Signal
+from PySide2.QtGui import QPainter, QPainterPath, QPen, QPalette
+from PySide2.QtWidgets import QWidget, QSizePolicy
+
+from ..engine.filter_design import frequency_response
+
+
+class FrequencyResponsePlot(QWidget):
+    """Plot of a filter's magnitude and phase response.
+
+    Responses are computed in a thread pool, so that changing the parameters never blocks the GUI thread. Parameter
+    changes are collected for `update_delay` milliseconds, and only the newest parameters are computed: while a
+    response is being computed, further changes replace each other instead of queuing up.
+    """
+
+    update_delay = 50
+    """Time in milliseconds during which parameter changes are collected before a response is computed."""
+
+    min_magnitude = -60
+    """Lowest gain shown on the plot, in dB."""
+
+    max_magnitude = 5
+    """Highest gain shown on the plot, in dB."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setMinimumSize(200, 120)
+
+        self._parameters = None
+        """Newest requested parameters, as arguments to `frequency_response`."""
+        self._response = None
+        self._message = "No data source"
+        """Text displayed instead of the plot, or None."""
+
+        self._task = None
+        """Running computation, or None."""
+
+        self._results = _Results()
+        self._results.finished.connect(self._finished)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._start)
+
+    def setParameters(self, filter_type, lower, upper, fs, order, length):
+        """Request a plot of the response for a filter with these parameters (see `filter_coefficients`).
+        If `fs` is None, the plot shows that there is no data source.
+        """
+        parameters = (filter_type, lower, upper, fs, int(order), int(length))
+        if parameters == self._parameters:
+            return
+
+        self._parameters = parameters
+
+        if fs is None:
+            self._timer.stop()
+            self._response = None
+            self._message = "No data source"
+            self.update()
+            return
+
+        self._timer.start(self.update_delay)
+
+    def _start(self):
+        if self._task is not None:
+            return  # The newest parameters will be computed when this task finishes
+
+        self._task = _ResponseTask(self._parameters, self._results)
+        QThreadPool.globalInstance().start(self._task)
+
+    def _finished(self, parameters, response, error):
+        self._task = None
+
+        if parameters != self._parameters:
+            # Parameters changed during the computation. Compute the newest ones, unless the timer will do it anyway
+            if self._parameters[3] is not None and not self._timer.isActive():
+                self._start()
+            return
+
+        self._response = response
+        self._message = error
+        self.update()
+
+    # Painting =========================================================================================================
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        palette = self.palette()
+        rect = QRectF(self.rect()).adjusted(1, 1, -1, -1)
+
+        painter.fillRect(rect, palette.color(QPalette.Base))
+        painter.setPen(QPen(palette.color(QPalette.Mid)))
+        painter.drawRect(rect)
+
+        if self._response is None:
+            painter.setPen(QPen(palette.color(QPalette.Text)))
+            painter.drawText(rect, Qt.AlignCenter, self._message or "")
+            return
+
+        plot = rect.adjusted(4, 4, -4, -18)
+        response = self._response
+        _, lower, upper, fs, _, _ = self._parameters
+
+        def x(frequency):
+            return plot.left() + plot.width() * frequency / (fs / 2)
+
+        # Passband
+        if lower is not None or upper is not None:
+            band = QRectF(QPointF(x(lower or 0), plot.top()), QPointF(x(min(upper or fs / 2, fs / 2)), plot.bottom()))
+            painter.fillRect(band, palette.color(QPalette.AlternateBase))
+
+        # 0 dB line
+        zero = plot.top() + plot.height() * self.max_magnitude / (self.max_magnitude - self.min_magnitude)
+        painter.setPen(QPen(palette.color(QPalette.Mid), 1, Qt.DashLine))
+        painter.drawLine(QPointF(plot.left(), zero), QPointF(plot.right(), zero))
+
+        xs = plot.left() + plot.width() * response.frequencies / (fs / 2)
+
+        # Phase, scaled to the height of the plot
+        phase = response.phase
+        span = np.ptp(phase)
+        if span > 0:
+            ys = plot.bottom() - plot.height() * (phase - phase.min()) / span
+            painter.setPen(QPen(palette.color(QPalette.Mid), 1))
+            painter.drawPath(_polyline(xs, ys))
+
+        # Magnitude
+        magnitude = np.clip(response.magnitude, self.min_magnitude, self.max_magnitude)
+        ys = plot.top() + plot.height() * (self.max_magnitude - magnitude) / (self.max_magnitude - self.min_magnitude)
+        painter.setPen(QPen(palette.color(QPalette.Highlight), 1.5))
+        painter.drawPath(_polyline(xs, ys))
+
+        # Frequency axis labels
+        painter.setPen(QPen(palette.color(QPalette.Text)))
+        labels = QRectF(plot.left(), plot.bottom() + 2, plot.width(), 14)
+        painter.drawText(labels, Qt.AlignLeft | Qt.AlignVCenter, "0 Hz")
+        painter.drawText(labels, Qt.AlignRight | Qt.AlignVCenter, "{:g} Hz".format(fs / 2))
+        painter.drawText(labels, Qt.AlignHCenter | Qt.AlignVCenter, "{} dB ... {} dB".format(
+            self.min_magnitude, self.max_magnitude
+        ))
+
+
+def _polyline(xs, ys) -> QPainterPath:
+    path = QPainterPath()
+    path.moveTo(xs[0], ys[0])
+
+    for x, y in zip(xs[1:], ys[1:]):
+        path.lineTo(x, y)
+
+    return path
+
+
+class _Results(QObject):
+    """Carries results from a _ResponseTask to the GUI thread."""
+    finished = Signal(object, object, object)
+    """Emitted with (parameters, response, error). Either response or error is None."""
+
+
+class _ResponseTask(QRunnable):
+    """Compute a frequency response in a thread pool."""
+    def __init__(self, parameters, results: _Results):
+        super().__init__()
+        self.parameters = parameters
+        self.results = results
+
+    def run(self):
+        try:
+            response = frequency_response(*self.parameters)
+        except ValueError as e:
+            self.results.finished.emit(self.parameters, None, str(e))
+        else:
+            self.results.finished.emit(self.parameters, response, None)
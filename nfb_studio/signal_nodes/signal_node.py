@@ -2,6 +2,7 @@
 from PySide2.QtWidgets import QWidget, QComboBox, QLabel, QFormLayout, QLineEdit, QCheckBox, QDoubleSpinBox, QHBoxLayout
 
 from ..scheme import Node, Input, Output, DataType
+from ..util import ExportCache
 
 
 class SignalNode(Node):
@@ -36,7 +37,15 @@ class SignalNode(Node):
 
     def __init__(self, parent=None):
         super().__init__(parent=parent)
-        
+
+        self.export_cache = ExportCache()
+        """Encoded XML fragment of the data that this node adds to its signal (see `add_nfb_export_data`).
+        Invalidated by `parameterChange`.
+        """
+
+        self._validator = None
+        """SchemeValidator of the scheme that contains this node, or None."""
+
     def configWidget(self):
         w = super().configWidget()
 
@@ -54,6 +63,93 @@ class SignalNode(Node):
         """
         return super().configWidget() is not None
 
+    # Upstream and downstream ==========================================================================================
+    def dataSourceInfo(self):
+        """Return the LSLDataSource that this node's data comes from, or None if no data source is connected.
+        The default implementation follows the edges of the node's inputs upstream.
+        """
+        for input in self.inputs:
+            for edge in input.edges:
+                source = edge.sourceNode()
+                if isinstance(source, SignalNode):
+                    data_source = source.dataSourceInfo()
+                    if data_source is not None:
+                        return data_source
+
+        return None
+
+    def chainNodes(self) -> list:
+        """Return the nodes of the signal's chain, from this node up to the source, following the first input.
+        The chain ends early if an input is not connected.
+        """
+        nodes = []
+        node = self
+
+        while node is not None:
+            nodes.append(node)
+
+            if len(node.inputs) == 0 or len(node.inputs[0].edges) == 0:
+                break
+            node = next(iter(node.inputs[0].edges)).sourceNode()
+
+        return nodes
+
+    def upstreamChange(self):
+        """Called when something upstream of this node has changed.
+        Updates this node and every node downstream of it (see `upstreamUpdate`).
+        """
+        self.upstreamUpdate()
+        self.notifyDownstream()
+
+    def upstreamUpdate(self):
+        """Update this node after something upstream of it has changed.
+        Called once per change for each node downstream of the change. Subclasses extend it to refresh what depends on
+        upstream nodes, such as messages and latency. The default implementation marks the node for validation.
+        """
+        if self._validator is not None:
+            self._validator.markDirty(self)
+
+    def parameterChange(self):
+        """Called by nodes in `_adjust`, after their parameters changed.
+        Invalidates `export_cache`, marks the node for validation and updates the nodes downstream, which may depend on
+        the parameters (for example, derived signals compute their latency from them).
+        """
+        self.export_cache.invalidate()
+
+        if self._validator is not None:
+            self._validator.markDirty(self)
+
+        self.notifyDownstream()
+
+    def validator(self):
+        """Return the SchemeValidator that validates this node, or None."""
+        return self._validator
+
+    def setValidator(self, validator, /):
+        self._validator = validator
+
+    def notifyDownstream(self):
+        """Call `upstreamUpdate` once on every node downstream of this node.
+        Nodes that are reachable by several paths are visited once, so the cost is linear in the size of the downstream
+        graph.
+        """
+        visited = {self}
+        stack = [self]
+
+        while stack:
+            node = stack.pop()
+
+            for output in node.outputs:
+                for edge in output.edges:
+                    target = edge.targetNode()
+                    if target is None or target in visited:
+                        continue
+
+                    visited.add(target)
+                    stack.append(target)
+                    if isinstance(target, SignalNode):
+                        target.upstreamUpdate()
+
     # Model-view interactions ==========================================================================================
     def updateView(self):
         """Update the view (config widget), based on the model (self) data.
@@ -1,7 +1,8 @@
 """NFB main source signal."""
 from PySide2.QtWidgets import QWidget, QComboBox, QLabel, QFormLayout, QLineEdit, QRadioButton, QFileDialog
 
-from ..scheme import Node, Input, Output, DataType
+from ..scheme import Node, Input, Output, DataType, ErrorMessage, WarningMessage
+from ..engine.spatial import compile_vector
 from .signal_node import SignalNode
 from .lsl_input import LSLInput
 from nfb_studio.pathedit import PathEdit
@@ -104,6 +105,7 @@ class SpatialFilter(SignalNode):
     def _adjust(self):
         """Adjust visuals in response to changes."""
         self.updateView()
+        self.parameterChange()
 
         if self.vector() is not None:
             if self.vector() == "":
@@ -116,6 +118,41 @@ class SpatialFilter(SignalNode):
             else:
                 self.setDescription(self.vectorPath())
 
+        self.updateChannelMessages()
+
+    def upstreamUpdate(self):
+        self.updateChannelMessages()
+        super().upstreamUpdate()
+
+    # Channels =========================================================================================================
+    def channelNames(self):
+        """Names of the channels of the LSL data source connected to this node's input, as a tuple.
+        Returns None if no data source is connected, or if its channel names are not known.
+        """
+        data_source = self.dataSourceInfo()
+
+        if data_source is None or data_source.channel_names is None:
+            return None
+        return tuple(data_source.channel_names)
+
+    def updateChannelMessages(self):
+        """Check the filter vector against the channels of the connected data source and show problems as messages on
+        the node. Channels that the data source does not have produce a warning message, and a vector that can not be
+        parsed or read produces an error message. The vector is interpreted like the engine does (see `compile_vector`).
+        """
+        messages = []
+        channel_names = self.channelNames()
+
+        if channel_names is not None and self.vector() is not None:
+            try:
+                _, unknown = compile_vector(self.vector(), channel_names)
+            except (OSError, ValueError) as e:
+                messages.append(ErrorMessage(str(e)))
+            else:
+                if unknown:
+                    messages.append(WarningMessage("Unknown channel: " + ", ".join(unknown)))
+
+        self.setTransientMessages("channels", messages)
 
     # Serialization ====================================================================================================
     def add_nfb_export_data(self, signal: dict):
@@ -93,6 +93,7 @@ class Standardise(SignalNode):
     def _adjust(self):
         """Adjust visuals in response to changes."""
         self.updateView()
+        self.parameterChange()
 
         self.setDescription(
             "Average: x{}\nStd. Dev.: {}".format(
@@ -101,6 +102,22 @@ class Standardise(SignalNode):
             )
         )
 
+    # Calibration ======================================================================================================
+    def calibrationSignal(self) -> dict:
+        """Return the part of the signal before this node, in the NFB Lab export format.
+        This is the signal whose average and standard deviation this node removes (see `nfb_studio.engine.calibration`).
+        """
+        signal = {}
+        for node in self.chainNodes()[1:]:
+            node.add_nfb_export_data(signal)
+
+        return signal
+
+    def setCalibration(self, average: float, standard_deviation: float):
+        """Set the average and standard deviation, as computed by calibration."""
+        self.setAverage(average)
+        self.setStandardDeviation(standard_deviation)
+
     # Serialization ====================================================================================================
     def add_nfb_export_data(self, signal: dict):
         """Add this node's data to the dict representation of the signal."""
@@ -0,0 +1,265 @@
+"""Validation of signal schemes.
+
+`SchemeValidator` checks every node of a signal scheme with a set of rules and shows the problems it finds as
+messages on the nodes. Rules of a node depend only on the node itself and on the nodes upstream of it, except for
+signal names, which must be unique in the scheme. When a node changes (its parameters, or an edge on its input), the
+node and all nodes downstream of it are marked dirty, and only dirty nodes are checked again. Nodes that share a
+signal name are marked dirty together. Validating after an edit therefore costs time proportional to the number of
+affected nodes, not to the size of the scheme.
+
+Signal nodes mark themselves dirty through `SignalNode.parameterChange` and `SignalNode.upstreamChange`.
+"""
+from PySide2.QtCore import QObject, QTimer
+
+from ..scheme.node import Node
+from ..scheme.node.message import WarningMessage, ErrorMessage
+from ..scheme.node.connection.data_type import convertible
+from .lsl_input import LSLInput
+from .spatial_filter import SpatialFilter
+from .derived_signal_export import DerivedSignalExport
+from .composite_signal_export import CompositeSignalExport
+
+
+class SchemeValidator(QObject):
+    """Incremental validator of a signal scheme.
+    Dirty nodes are checked in the event loop after the change that made them dirty, so that a series of changes is
+    validated once. Call `validate` to check them immediately.
+
+    Example:
+    ```python
+    validator = SchemeValidator()
+    validator.setScheme(experiment.signal_scheme)
+    node.setSignalName("Alpha")  # Marks the node and nodes that use the same signal name as dirty
+    validator.validate()
+    ```
+    """
+
+    message_key = "validation"
+    """Key of the transient messages (see `Node.setTransientMessages`) that the validator shows on nodes."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._scheme = None
+
+        self._dirty = {}
+        """Nodes that need to be checked, in the order they were marked (a dict is used as an ordered set)."""
+        self._scheduled = False
+        """True if `validate` will be called by the event loop."""
+
+        self._names = {}
+        """Signal export nodes by signal name, as sets of nodes."""
+        self._node_names = {}
+        """Signal name under which each signal export node is registered in `_names`."""
+
+        self._chain_errors = {}
+        """Memoized result of `_chainError` for nodes that are not dirty."""
+
+    # Scheme ===========================================================================================================
+    def scheme(self):
+        return self._scheme
+
+    def setScheme(self, scheme, /):
+        """Validate nodes of `scheme`, or stop validating if `scheme` is None.
+        All nodes of the new scheme are marked dirty.
+        """
+        if self._scheme is not None:
+            self._scheme.graphChanged.disconnect(self._onGraphChanged)
+
+            for node in self._scheme.builtGraph().nodes:
+                self._forget(node)
+
+        self._scheme = scheme
+        self._dirty.clear()
+        self._names.clear()
+        self._node_names.clear()
+        self._chain_errors.clear()
+
+        if scheme is not None:
+            scheme.graphChanged.connect(self._onGraphChanged)
+
+            for node in scheme.builtGraph().nodes:
+                self._register(node)
+
+    def _onGraphChanged(self, item):
+        if not isinstance(item, Node):
+            return  # Edges notify their target nodes through upstreamChange
+
+        if item in self._scheme.builtGraph().nodes:
+            self._register(item)
+        else:
+            self._forget(item)
+
+    def _register(self, node):
+        if hasattr(node, "setValidator"):
+            node.setValidator(self)
+        self.markDirty(node)
+
+    def _forget(self, node):
+        if hasattr(node, "setValidator") and node.validator() is self:
+            node.setValidator(None)
+
+        self._dirty.pop(node, None)
+        self._chain_errors.pop(node, None)
+        self._setName(node, None)
+        node.setTransientMessages(self.message_key, [])
+
+    # Dirty tracking ===================================================================================================
+    def markDirty(self, node):
+        """Mark `node` and all nodes downstream of it as needing to be checked, and schedule validation.
+        Nodes that are already dirty are not followed again, so marking is proportional to the number of nodes that
+        become dirty.
+        """
+        if self._scheme is None:
+            return
+
+        nodes = self._scheme.builtGraph().nodes
+        stack = [node]
+
+        while stack:
+            node = stack.pop()
+
+            if node in self._dirty or node not in nodes:
+                continue
+
+            self._dirty[node] = None
+            self._chain_errors.pop(node, None)
+
+            for output in node.outputs:
+                for edge in output.edges:
+                    target = edge.targetNode()
+                    if target is not None:
+                        stack.append(target)
+
+        if self._dirty and not self._scheduled:
+            self._scheduled = True
+            QTimer.singleShot(0, self._onTimeout)
+
+    def dirtyNodes(self) -> set:
+        """Return the nodes that will be checked by the next `validate` call."""
+        return set(self._dirty)
+
+    def _onTimeout(self):
+        self._scheduled = False
+        self.validate()
+
+    # Validation =======================================================================================================
+    def validate(self):
+        """Check all dirty nodes and update their messages."""
+        while self._dirty:
+            node = next(iter(self._dirty))
+            del self._dirty[node]
+
+            self._updateName(node)
+            self._show(node, self.check(node))
+
+    def check(self, node) -> list:
+        """Return problems of `node` as a list of (Message subclass, text) pairs."""
+        problems = []
+
+        # Connections --------------------------------------------------------------------------------------------------
+        for input in node.inputs:
+            if len(input.edges) == 0:
+                problems.append((WarningMessage, "Input \"{}\" is not connected".format(input.text())))
+            elif len(input.edges) > 1 and not input.isMultiple():
+                problems.append((ErrorMessage, "Input \"{}\" has more than one connection".format(input.text())))
+
+            for edge in input.edges:
+                if edge.source() is not None and not convertible(edge.source().dataType(), input.dataType()):
+                    problems.append((ErrorMessage, "Input \"{}\" is connected to \"{}\" of a different type".format(
+                        input.text(), edge.source().text()
+                    )))
+
+        # Node parameters ----------------------------------------------------------------------------------------------
+        if isinstance(node, SpatialFilter):
+            if not node.vector() and not node.vectorPath():
+                problems.append((WarningMessage, "Spatial filter vector is empty"))
+
+        if isinstance(node, (DerivedSignalExport, CompositeSignalExport)):
+            name = node.signalName()
+
+            if name == "":
+                problems.append((ErrorMessage, "Signal name is empty"))
+            elif len(self._names.get(name, ())) > 1:
+                problems.append((ErrorMessage, "Signal name \"{}\" is used by another signal".format(name)))
+
+        # Signal chain -------------------------------------------------------------------------------------------------
+        if isinstance(node, DerivedSignalExport):
+            error = self._chainError(node)
+            if error is not None:
+                problems.append((ErrorMessage, error))
+
+        return problems
+
+    def _show(self, node, problems):
+        current = [(type(m), m.text()) for m in node.transientMessages(self.message_key)]
+
+        if problems != current:
+            node.setTransientMessages(self.message_key, [cls(text) for cls, text in problems])
+
+    # Signal names =====================================================================================================
+    def _updateName(self, node):
+        if isinstance(node, (DerivedSignalExport, CompositeSignalExport)):
+            self._setName(node, node.signalName())
+
+    def _setName(self, node, name):
+        """Register `node` under signal name `name` (or unregister it if name is None). Nodes that had the old or have
+        the new name are marked dirty, since their uniqueness may have changed.
+        """
+        old = self._node_names.get(node)
+        if old == name:
+            return
+
+        if old is not None:
+            del self._node_names[node]
+            group = self._names[old]
+            group.discard(node)
+
+            if not group:
+                del self._names[old]
+            for other in group:
+                self.markDirty(other)
+
+        if name is not None:
+            self._node_names[node] = name
+            group = self._names.setdefault(name, set())
+
+            for other in group:
+                self.markDirty(other)
+            group.add(node)
+
+    # Signal chain =====================================================================================================
+    def _chainError(self, node):
+        """Return why the chain of `node` (following first inputs up to the source) does not start with an LSL Input,
+        or None if it does. Unconnected inputs are not reported here, since those nodes show their own warnings.
+        Results are memoized until a node is marked dirty, so chains that share nodes are walked once.
+        """
+        path = []
+        on_path = set()
+        error = None
+
+        while node not in self._chain_errors:
+            if node in on_path:
+                error = "The signal chain has a cycle at \"{}\"".format(node.title())
+                break
+
+            path.append(node)
+            on_path.add(node)
+
+            if len(node.inputs) == 0:
+                if not isinstance(node, LSLInput):
+                    error = "The signal chain does not start with an LSL Input"
+                break
+
+            edges = node.inputs[0].edges
+            source = next(iter(edges)).sourceNode() if len(edges) > 0 else None
+            if source is None:
+                break
+
+            node = source
+        else:
+            error = self._chain_errors[node]
+
+        for node in path:
+            self._chain_errors[node] = error
+
+        return error
@@ -0,0 +1,221 @@
+"""Discovery of LSL streams on the network.
+
+Resolving LSL streams takes time: pylsl waits for streams to answer a broadcast query, and reading a stream's channel
+names requires opening an inlet to it. `StreamRegistry` keeps a cache of discovered streams and refreshes it in a
+thread pool, so that widgets can ask for the list of streams at any time without blocking the GUI thread. A refresh
+is started when the cache is older than `StreamRegistry.ttl` seconds, and `streamsChanged` is emitted when it
+finishes. Streams that stop answering are kept for a while, so that one slow answer does not make a stream disappear
+from the lists.
+
+pylsl is an optional dependency. Without it, the registry is always empty and `isAvailable` returns False.
+"""
+import threading
+import time
+from typing import List, NamedTuple, Optional, Sequence
+
+from PySide2.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class StreamInfo(NamedTuple):
+    """Description of a discovered LSL stream."""
+    name: str
+    type: str
+    channel_count: int
+    frequency: float
+    """Nominal sampling frequency in Hz, or 0 for irregular streams."""
+    channel_names: Optional[Sequence[str]] = None
+    """Names of the channels, or None if the stream does not describe them."""
+    uid: str = ""
+    """Unique identifier of the stream. Differs between runs of the same outlet."""
+
+
+_channel_names = {}
+"""Channel names of streams by uid, so that an inlet is opened only once for each stream."""
+
+
+def resolve_streams(timeout: float = 1.0) -> List[StreamInfo]:
+    """Find LSL streams on the network, waiting `timeout` seconds for answers. Blocks.
+    Raises ImportError if pylsl is not installed.
+    """
+    import pylsl
+
+    streams = []
+
+    for info in pylsl.resolve_streams(wait_time=timeout):
+        uid = info.uid()
+
+        if uid not in _channel_names:
+            _channel_names[uid] = _read_channel_names(pylsl, info, timeout)
+
+        streams.append(StreamInfo(
+            name=info.name(),
+            type=info.type(),
+            channel_count=info.channel_count(),
+            frequency=info.nominal_srate(),
+            channel_names=_channel_names[uid],
+            uid=uid,
+        ))
+
+    return streams
+
+
+def _read_channel_names(pylsl, info, timeout):
+    """Read channel labels from the full description of a stream, or return None if it has none."""
+    try:
+        inlet = pylsl.StreamInlet(info)
+        description = inlet.info(timeout=timeout).desc()
+        inlet.close_stream()
+    except Exception:  # Timeouts and lost streams: the stream is still usable, just without names
+        return None
+
+    names = []
+    channel = description.child("channels").child("channel")
+    while not channel.empty():
+        names.append(channel.child_value("label"))
+        channel = channel.next_sibling()
+
+    if len(names) != info.channel_count() or not all(names):
+        return None
+    return tuple(names)
+
+
+class StreamRegistry(QObject):
+    """Cache of LSL streams on the network, refreshed in the background.
+    Methods of the registry never block. `streams` returns the cached list immediately, starting a refresh if the
+    cache is stale; widgets should update their lists when `streamsChanged` is emitted.
+
+    Example:
+    ```python
+    registry = StreamRegistry.instance()
+    registry.streamsChanged.connect(self.updateStreamNames)
+    names = [stream.name for stream in registry.streams()]
+    ```
+    """
+
+    ttl = 5.0
+    """Time in seconds after which the cache is refreshed."""
+
+    expiry = 15.0
+    """Time in seconds after which a stream that stopped answering is removed."""
+
+    resolve_timeout = 1.0
+    """Time in seconds that a refresh waits for streams to answer."""
+
+    streamsChanged = Signal()
+    """Emitted after a refresh that changed the list of streams. May be emitted from a thread pool, so slots of
+    objects in the GUI thread are called through its event loop.
+    """
+
+    def __init__(self, resolver=resolve_streams, clock=time.monotonic, parent=None):
+        """Create a registry that finds streams with `resolver`, a function of the timeout that returns a list of
+        StreamInfo. `clock` returns the time in seconds.
+        """
+        super().__init__(parent)
+        self._resolver = resolver
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._streams = {}
+        """Discovered streams by name, as (StreamInfo, time when it was last seen)."""
+        self._updated = None
+        """Time of the last finished refresh, or None."""
+        self._available = True
+
+        self._task = None
+        """Running refresh, or None."""
+        self._done = threading.Event()
+        self._done.set()
+
+    @staticmethod
+    def instance() -> "StreamRegistry":
+        """Return the registry shared by the application."""
+        global _instance
+
+        if _instance is None:
+            _instance = StreamRegistry()
+        return _instance
+
+    def streams(self) -> List[StreamInfo]:
+        """Return the cached list of streams, sorted by name. Starts a refresh if the cache is stale."""
+        self.refresh()
+
+        with self._lock:
+            return [info for _, (info, _) in sorted(self._streams.items())]
+
+    def find(self, name: str) -> Optional[StreamInfo]:
+        """Return the cached stream named `name`, or None. Starts a refresh if the cache is stale."""
+        for info in self.streams():
+            if info.name == name:
+                return info
+        return None
+
+    def isAvailable(self) -> bool:
+        """Return False if streams can not be discovered because pylsl is not installed."""
+        return self._available
+
+    def isStale(self) -> bool:
+        """Return True if the cache is older than `ttl` seconds."""
+        return self._updated is None or self._clock() - self._updated >= self.ttl
+
+    def refresh(self, force=False):
+        """Start refreshing the cache in the background, if it is stale or if `force` is True.
+        Does nothing if pylsl is not installed, or if a refresh is already running.
+        """
+        with self._lock:
+            if not self._available or self._task is not None or not (force or self.isStale()):
+                return
+
+            self._done.clear()
+            self._task = _RefreshTask(self)
+
+        QThreadPool.globalInstance().start(self._task)
+
+    def waitForRefresh(self, timeout: float = None) -> bool:
+        """Block until the running refresh finishes. Returns False on timeout. Meant for scripts and tests."""
+        return self._done.wait(timeout)
+
+    def _refresh(self):
+        """Body of a refresh, run in the thread pool."""
+        changed = False
+
+        try:
+            found = self._resolver(self.resolve_timeout)
+        except ImportError:
+            found = []
+            self._available = False
+        except Exception:  # Network errors: keep the cache, try again after ttl
+            found = []
+
+        with self._lock:
+            now = self._clock()
+
+            for info in found:
+                old = self._streams.get(info.name)
+                changed = changed or old is None or old[0] != info
+                self._streams[info.name] = (info, now)
+
+            for name, (_, seen) in list(self._streams.items()):
+                if now - seen >= self.expiry:
+                    del self._streams[name]
+                    changed = True
+
+            self._updated = now
+            self._task = None
+            self._done.set()
+
+        if changed:
+            self.streamsChanged.emit()
+
+
+_instance = None
+"""The registry returned by `StreamRegistry.instance`."""
+
+
+class _RefreshTask(QRunnable):
+    """Refresh a StreamRegistry in a thread pool."""
+    def __init__(self, registry: StreamRegistry):
+        super().__init__()
+        self.registry = registry
+
+    def run(self):
+        self.registry._refresh()
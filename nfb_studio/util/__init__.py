@@ -2,4 +2,5 @@
 from .enum_manip import import_enum
 from .expose_property import expose_property
 from .stacked_dict_widget import StackedDictWidget
-from .file_select import FileSelect
\ No newline at end of file
+from .file_select import FileSelect
+from .export_cache import ExportCache, ExportCacheMixin
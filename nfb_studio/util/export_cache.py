@@ -0,0 +1,57 @@
+class ExportCache:
+    """A value computed from an object's data, kept until the data changes.
+    Used to keep encoded XML fragments between exports. The owner of the cache calls `invalidate` whenever its data
+    changes. `get` returns the cached value if it was computed with the same key (for example, the same encoder and the
+    same block name), and computes it otherwise.
+
+    Example
+    -------
+    ```python
+    cache = ExportCache()
+    fragment = cache.get((encoder, name), lambda: encoder.encode_element("FeedbackProtocol", data(), 2))
+    cache.invalidate()  # After the data changed
+    ```
+    """
+    def __init__(self):
+        self._key = None
+        self._value = None
+        self._valid = False
+
+    def isValid(self) -> bool:
+        return self._valid
+
+    def get(self, key, compute):
+        """Return the value cached for `key`, or compute it by calling `compute()` and cache it."""
+        if not self._valid or self._key != key:
+            self._value = compute()
+            self._key = key
+            self._valid = True
+
+        return self._value
+
+    def invalidate(self):
+        self._valid = False
+        self._value = None
+
+
+class ExportCacheMixin:
+    """Adds an ExportCache `export_cache` that is invalidated when a public attribute is assigned a different value.
+    Assigning an equal value (like a view writing unchanged values back to its model) keeps the cache. Note that
+    mutable members can change their contents without an assignment; methods that do so must call
+    `self.export_cache.invalidate()` themselves.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.export_cache = ExportCache()
+
+    def __setattr__(self, key, value):
+        if not key.startswith("_") and key != "export_cache" and "export_cache" in self.__dict__:
+            try:
+                changed = getattr(self, key) != value
+            except AttributeError:
+                changed = True
+
+            if changed:
+                self.export_cache.invalidate()
+
+        super().__setattr__(key, value)
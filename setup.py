@@ -6,6 +6,8 @@ install_requires = [
     "sortedcontainers",
     "xmltodict",
     "sympy",
+    "numpy",
+    "scipy",
     "pynfb @ https://github.com/bioelectric-interfaces/nfb/archive/0.1.1.zip",
 ]
 
@@ -1,5 +1,12 @@
 import unittest
 from .serial import TestBaseEncoder, TestBaseDecoder, TestXMLEncoder
+from .engine import (TestSignalChain, TestExpression, TestSpatialFilters, TestFilterDesign, TestLatency, TestCalibration,
+    TestRecording, TestSyntheticStream, TestParallelSimulator)
+from .scheme import TestDataType, TestGraph, TestVirtualization, TestCompactConnections, TestSchemeOverview
+from .signal_nodes import (TestExportPlan, TestRecordingRegistry, TestSignalNode, TestSpatialFilter,
+    TestSchemeValidator)
+from .stream_registry import TestStreamRegistry
+from .runner import TestExperimentCache
 
 if __name__ == "__main__":
     unittest.main()
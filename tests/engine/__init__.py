@@ -0,0 +1,9 @@
+from .chain import TestSignalChain
+from .expression import TestExpression
+from .spatial import TestSpatialFilters
+from .filter_design import TestFilterDesign
+from .latency import TestLatency
+from .calibration import TestCalibration
+from .recording import TestRecording
+from .synthetic import TestSyntheticStream
+from .parallel import TestParallelSimulator
@@ -0,0 +1,41 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from nfb_studio.engine import Welford, calibrate, calibrate_file, open_recording
+
+
+class TestCalibration(TestCase):
+    def setUp(self):
+        self.data = np.random.default_rng(0).normal(3, 2, (5000, 2))
+
+    def test_welford(self):
+        statistics = Welford()
+        for i in range(0, len(self.data), 700):
+            statistics.update(self.data[i:i + 700, 0])
+
+        self.assertAlmostEqual(statistics.mean, self.data[:, 0].mean())
+        self.assertAlmostEqual(statistics.std(), self.data[:, 0].std())
+
+    def test_calibrate_file(self):
+        signals = [
+            {"SpatialFilterMatrix": "A=1", "fAverage": 10, "iDelayMs": 100},
+            {"SpatialFilterMatrix": "A=1;B=1"},
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "recording.npy")
+            np.save(path, self.data)
+
+            with open_recording(path, fs=250, channel_names=["A", "B"]) as recording:
+                self.assertEqual(len(recording), len(self.data))
+                average, standard_deviation = calibrate(signals[0], recording, chunk_size=999)
+
+            self.assertAlmostEqual(average, self.data[:, 0].mean())
+            self.assertAlmostEqual(standard_deviation, self.data[:, 0].std())
+
+            parallel = calibrate_file(signals, path, 250, ["A", "B"], chunk_size=999, processes=2)
+            self.assertTrue(np.allclose(parallel[0], (average, standard_deviation)))
+            self.assertAlmostEqual(parallel[1][0], self.data.sum(axis=1).mean())
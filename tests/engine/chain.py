@@ -0,0 +1,91 @@
+from unittest import TestCase
+
+import numpy as np
+
+from nfb_studio.engine import Simulator, build_chain, parse_spatial_filter
+
+
+class TestSignalChain(TestCase):
+    channel_names = ["Fp1", "Fp2", "Cz", "Pz"]
+    fs = 250
+
+    signal = {
+        "sSignalName": "Alpha",
+        "SpatialFilterMatrix": "Cz=1;Pz=-0.5",
+        "fBandpassLowHz": 8.0,
+        "fBandpassHighHz": 12.0,
+        "fFFTWindowSize": 500.0,
+        "sTemporalFilterType": "butter",
+        "fTemporalFilterButterOrder": 2,
+        "fSmoothingFactor": 0.9,
+        "method": "Rectification",
+        "sTemporalSmootherType": "exp",
+        "fAverage": 1.0,
+        "fStdDev": 2.0,
+        "iDelayMs": 40,
+    }
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.data = rng.standard_normal((2000, len(self.channel_names)))
+
+    def test_chunk_size_invariance(self):
+        chain = build_chain(self.signal, self.fs, self.channel_names)
+        whole = chain.run(self.data, chunk_size=len(self.data))
+
+        for chunk_size in (1, 7, 256):
+            chain.reset()
+            self.assertTrue(np.allclose(chain.run(self.data, chunk_size), whole))
+
+    def test_delay(self):
+        signal = {"SpatialFilterMatrix": "Fp1=1", "iDelayMs": 40}
+        chain = build_chain(signal, self.fs, self.channel_names)
+        result = chain.run(self.data, chunk_size=3)[:, 0]
+
+        self.assertTrue(np.allclose(result[:10], 0))
+        self.assertTrue(np.allclose(result[10:], self.data[:-10, 0]))
+
+    def test_spatial_filter(self):
+        weights = parse_spatial_filter("cz=2; Fp1=-1", self.channel_names)
+        self.assertTrue(np.array_equal(weights, [-1, 0, 2, 0]))
+
+        with self.assertRaises(ValueError):
+            parse_spatial_filter("O1=1", self.channel_names)
+
+    def test_simulator(self):
+        sim = Simulator([self.signal], self.fs, self.channel_names, chunk_size=100)
+        result = sim.run(self.data)
+
+        self.assertEqual(list(result.keys()), ["Alpha"])
+        self.assertEqual(result["Alpha"].shape, (len(self.data),))
+
+        with self.assertRaises(ValueError):
+            sim.run(self.data[:, :2])
+
+    def test_composite(self):
+        signals = [
+            {"sSignalName": "A", "SpatialFilterMatrix": "Fp1=1"},
+            {"sSignalName": "B", "SpatialFilterMatrix": "Cz=1"},
+        ]
+        composites = [{"sSignalName": "C", "sExpression": "A - 2*B"}]
+
+        sim = Simulator(signals, self.fs, self.channel_names, composite_signals=composites)
+        result = sim.run(self.data)
+
+        self.assertTrue(np.allclose(result["C"], self.data[:, 0] - 2 * self.data[:, 2]))
+
+        with self.assertRaises(ValueError):
+            composites = [{"sSignalName": "D", "sExpression": "E"}]
+            Simulator(signals, self.fs, self.channel_names, composite_signals=composites)
+
+    def test_duplicate_names(self):
+        signals = [
+            {"sSignalName": "A", "SpatialFilterMatrix": "Fp1=1"},
+            {"sSignalName": "A", "SpatialFilterMatrix": "Cz=1"},
+        ]
+
+        with self.assertRaises(ValueError):
+            Simulator(signals, self.fs, self.channel_names)
+        with self.assertRaises(ValueError):
+            composites = [{"sSignalName": "A", "sExpression": "A"}]
+            Simulator(signals[:1], self.fs, self.channel_names, composite_signals=composites)
@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+import numpy as np
+
+from nfb_studio.engine import ExpressionError, compile_expression
+
+
+class TestExpression(TestCase):
+    def test_evaluate(self):
+        alpha = np.array([1.0, 2.0, 4.0])
+        beta = np.array([1.0, 1.0, 2.0])
+
+        compiled = compile_expression("Alpha / (Alpha + Beta) - 2^2 + sqrt(abs(-Beta))")
+        expected = alpha / (alpha + beta) - 4 + np.sqrt(beta)
+
+        self.assertEqual(compiled.names, {"Alpha", "Beta"})
+        self.assertTrue(np.allclose(compiled.evaluate({"Alpha": alpha, "Beta": beta}), expected))
+
+    def test_cache(self):
+        self.assertIs(compile_expression("A + B"), compile_expression("A + B"))
+
+    def test_unknown_names(self):
+        compiled = compile_expression("A * B + pi")
+
+        self.assertEqual(compiled.unknown_names({"A"}), {"B"})
+        with self.assertRaises(ExpressionError):
+            compiled.evaluate({"A": np.zeros(3)})
+
+    def test_rejected(self):
+        for expression in ("__import__('os')", "A.real", "A[0]", "lambda: 1", "'text'", "A +", "open(A)"):
+            with self.assertRaises(ExpressionError, msg=expression):
+                compile_expression(expression)
@@ -0,0 +1,26 @@
+from unittest import TestCase
+
+import numpy as np
+
+from nfb_studio.engine import filter_coefficients, frequency_response
+
+
+class TestFilterDesign(TestCase):
+    def test_frequency_response(self):
+        for filter_type in ("butter", "cfir"):
+            response = frequency_response(filter_type, 8.0, 12.0, 250, 2, 251)
+
+            self.assertEqual(response.frequencies.shape, (512,))
+            self.assertLess(abs(response.magnitude[np.searchsorted(response.frequencies, 10)]), 1)
+            self.assertLess(response.magnitude[np.searchsorted(response.frequencies, 50)], -20)
+
+            # Results are cached and read-only
+            self.assertIs(frequency_response(filter_type, 8.0, 12.0, 250, 2, 251), response)
+            self.assertFalse(response.magnitude.flags.writeable)
+
+    def test_passthrough(self):
+        self.assertIsNone(filter_coefficients("butter", None, 250.0, 500, 2, 1000))
+        self.assertTrue(np.allclose(frequency_response("butter", None, None, 500, 2, 1000).magnitude, 0))
+
+        with self.assertRaises(ValueError):
+            frequency_response("butter", 12.0, 8.0, 500, 2, 1000)
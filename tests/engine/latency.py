@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+import numpy as np
+
+from nfb_studio.engine import build_chain, signal_latency
+
+
+class TestLatency(TestCase):
+    fs = 500
+
+    def test_budget(self):
+        signal = {"fBandpassLowHz": 0.0, "fBandpassHighHz": 250.0, "fSmoothingFactor": 0.9, "iDelayMs": 40}
+        budget = signal_latency(signal, self.fs)
+
+        self.assertEqual([name for name, _ in budget.stages], ["smoother", "delay"])
+        self.assertAlmostEqual(budget.total(), 9 / self.fs * 1000 + 40)
+
+    def test_fir_matches_chain(self):
+        # A delayed impulse in the passband of a linear-phase FIR filter peaks after the analytic latency
+        signal = {"fBandpassLowHz": None, "fBandpassHighHz": 20.0, "sTemporalFilterType": "fir", "fFFTWindowSize": 101}
+        latency_ms = signal_latency(signal, self.fs).total()
+
+        data = np.zeros((400, 1))
+        data[100] = 1
+        result = build_chain(signal, self.fs, ["Cz"]).run(data)[:, 0]
+
+        self.assertEqual((np.argmax(result) - 100) / self.fs * 1000, latency_ms)
@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+import numpy as np
+
+from nfb_studio.engine import ParallelSimulator, Simulator, StageTree, partition, stage_specs
+
+
+class TestParallelSimulator(TestCase):
+    channel_names = ["Fp1", "Fp2", "Cz", "Pz"]
+    fs = 250
+
+    def setUp(self):
+        self.signals = [
+            {
+                "sSignalName": "S{}".format(i),
+                "SpatialFilterMatrix": "Cz=1;Pz=-{}".format(i % 2),
+                "fBandpassLowHz": 8.0,
+                "fBandpassHighHz": 12.0,
+                "method": "Rectification",
+                "fSmoothingFactor": 0.9 + i / 100,
+            }
+            for i in range(6)
+        ]
+        self.data = np.random.default_rng(0).standard_normal((2000, len(self.channel_names)))
+
+    def test_shared_stages(self):
+        tree = StageTree()
+        for i, signal in enumerate(self.signals):
+            tree.add(i % 2, stage_specs(signal, self.fs), i)
+
+        # Two spatial filters share bandpass filters and rectification, smoothers are separate
+        self.assertEqual(tree.stage_count, 2 + 2 + 6)
+
+    def test_matches_simulator(self):
+        expected = Simulator(self.signals, self.fs, self.channel_names).run(self.data)
+
+        for processes in (1, 2):
+            with ParallelSimulator(self.signals, self.fs, self.channel_names, processes, chunk_size=300) as sim:
+                result = sim.run(self.data)
+
+            for name in expected:
+                self.assertTrue(np.allclose(result[name], expected[name]))
+
+    def test_worker_error(self):
+        expected = Simulator(self.signals, self.fs, self.channel_names).run(self.data[:300])
+
+        with ParallelSimulator(self.signals, self.fs, self.channel_names, 2, chunk_size=300) as sim:
+            # A command fails in the first worker only. Replies of all workers must be received before the error is
+            # raised, or the next call reads the stale reply of the second worker.
+            sim._connections[0].send(("process", "invalid"))
+            for connection in sim._connections[1:]:
+                connection.send(("process", 0))
+
+            with self.assertRaises(RuntimeError):
+                sim._receiveAll()
+
+            result = sim.process(self.data[:300])
+            for name in expected:
+                self.assertTrue(np.allclose(result[name], expected[name]))
+
+    def test_no_signals(self):
+        self.assertEqual(partition([], 4), [])
+
+        with ParallelSimulator([], self.fs, self.channel_names, 2) as sim:
+            self.assertEqual(sim.run(self.data), Simulator([], self.fs, self.channel_names).run(self.data))
@@ -0,0 +1,42 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import h5py
+import numpy as np
+
+from nfb_studio.engine import open_recording
+
+
+class TestRecording(TestCase):
+    def test_nfb_lab_hdf5(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "experiment_data.h5")
+
+            with h5py.File(path, "w") as file:
+                file["fs"] = np.array(250)
+                file["channels"] = np.array([b"Fp1", b"Cz"])
+                file.create_group("protocol10")["raw_data"] = np.full((3, 2), 10.0)
+                file.create_group("protocol2")["raw_data"] = np.full((4, 2), 2.0)
+
+            with open_recording(path) as recording:
+                self.assertEqual(recording.fs, 250)
+                self.assertEqual(recording.channel_names, ["Fp1", "Cz"])
+                self.assertEqual(len(recording), 7)
+
+                data = np.concatenate(list(recording.chunks(chunk_size=3)))
+                self.assertEqual(data[:, 0].tolist(), [2, 2, 2, 2, 10, 10, 10])
+
+    def test_npy(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "recording.npy")
+            np.save(path, np.zeros((10, 3)))
+
+            with self.assertRaises(ValueError):
+                open_recording(path)  # The sampling frequency is not known
+
+            with self.assertRaises(ValueError):
+                open_recording(path, fs=500, channel_names=["A", "B"])
+
+            recording = open_recording(path, fs=500)
+            self.assertIsInstance(recording.segments[0], np.memmap)
@@ -0,0 +1,60 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from nfb_studio.engine import Simulator, compile_spatial_filters, compile_vector, parse_spatial_filter, parse_vector
+
+
+class TestSpatialFilters(TestCase):
+    channel_names = ["Fp1", "Fp2", "Cz", "Pz"]
+
+    def test_stacking(self):
+        vectors = ["Cz=1;Pz=-0.5", "", "fp2=3"]
+        stacked = compile_spatial_filters(vectors, self.channel_names)
+
+        self.assertEqual(stacked.matrix.shape, (4, 3))
+        self.assertTrue(np.array_equal(stacked.matrix[:, 0], parse_spatial_filter(vectors[0], self.channel_names)))
+        self.assertTrue(np.allclose(stacked.matrix[:, 1], 0.25))
+
+        data = np.random.default_rng(0).standard_normal((100, 4))
+        self.assertTrue(np.allclose(stacked.apply(data)[:, 2], 3 * data[:, 1]))
+
+        # Compiled filters are cached
+        self.assertIs(compile_spatial_filters(list(vectors), list(self.channel_names)), stacked)
+
+    def test_unknown_channels(self):
+        stacked = compile_spatial_filters(["Cz=1;O1=1;O2=1", "Fp1=1"], self.channel_names)
+        self.assertEqual(stacked.unknown, (("O1", "O2"), ()))
+
+        with self.assertRaises(ValueError):
+            Simulator([{"sSignalName": "A", "SpatialFilterMatrix": "O1=1"}], 250, self.channel_names)
+
+    def test_inline_vectors(self):
+        channel_names = tuple(self.channel_names)
+
+        # A channel name alone is an inline vector with weight 1, not a file path
+        weights, unknown = parse_vector("Cz", channel_names)
+        self.assertEqual(list(weights), [0, 0, 1, 0])
+        self.assertEqual(unknown, ())
+        self.assertEqual(parse_vector("O1", channel_names)[1], ("O1",))
+
+        with self.assertRaises(ValueError):
+            compile_vector("", ())
+
+    def test_file_vectors(self):
+        signal = {"sSignalName": "A", "SpatialFilterMatrix": "Cz"}
+        data = np.random.default_rng(0).standard_normal((100, 4))
+
+        # A channel name runs through the engine as an inline vector
+        result = Simulator([signal], 250, self.channel_names).run(data)
+        self.assertTrue(np.allclose(result["A"], data[:, 2]))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "filter.txt")
+            np.savetxt(path, [0, 1, 0, -1])
+
+            weights, unknown = compile_vector(path, tuple(self.channel_names))
+            self.assertEqual(list(weights), [0, 1, 0, -1])
+            self.assertEqual(unknown, ())
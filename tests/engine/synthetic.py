@@ -0,0 +1,23 @@
+from unittest import TestCase
+
+import numpy as np
+import scipy.signal
+
+from nfb_studio.engine import SyntheticStream
+
+
+class TestSyntheticStream(TestCase):
+    def test_stream(self):
+        stream = SyntheticStream(channel_count=4, fs=250, seconds=4)
+        self.assertEqual(stream.channel_names, ["Ch1", "Ch2", "Ch3", "Ch4"])
+
+        # Reading loops over the buffer
+        data = np.concatenate(list(stream.chunks(300, count=5)))
+        self.assertTrue(np.array_equal(data[:1000], stream.buffer))
+        self.assertTrue(np.array_equal(data[1000:], stream.buffer[:500]))
+
+        # Alpha bursts stand out above the background noise
+        frequencies, power = scipy.signal.welch(stream.buffer, 250, nperseg=500, axis=0)
+        alpha = power[(frequencies >= 9) & (frequencies <= 11)].mean(axis=0)
+        beta = power[(frequencies >= 13) & (frequencies <= 30)].mean(axis=0)
+        self.assertTrue(np.all(alpha > 3 * beta))
@@ -0,0 +1,35 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from nfb_studio.runner import ExperimentCache
+
+
+class TestExperimentCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ExperimentCache(self.directory.name, max_size=350)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reuse(self):
+        path = self.cache.path("<NeurofeedbackSignalSpecs/>")
+        with open(path, encoding="utf-8") as file:
+            self.assertEqual(file.read(), "<NeurofeedbackSignalSpecs/>")
+
+        # Unchanged experiments reuse their file, changed ones get a new one
+        os.utime(path, (0, 0))
+        self.assertEqual(self.cache.path("<NeurofeedbackSignalSpecs/>"), path)
+        self.assertGreater(os.stat(path).st_mtime, 0)
+        self.assertNotEqual(self.cache.path("<NeurofeedbackSignalSpecs></NeurofeedbackSignalSpecs>"), path)
+
+    def test_eviction(self):
+        paths = []
+        for i in range(3):
+            paths.append(self.cache.path(str(i) * 100))
+            os.utime(paths[-1], (i, i))
+
+        # The least recently used file is deleted to keep the cache under max_size
+        self.cache.path("3" * 100)
+        self.assertEqual([os.path.exists(path) for path in paths], [False, True, True])
@@ -0,0 +1,5 @@
+from .data_type import TestDataType
+from .compact_connections import TestCompactConnections
+from .graph import TestGraph
+from .overview import TestSchemeOverview
+from .virtualization import TestVirtualization
@@ -0,0 +1,134 @@
+import json
+from unittest import TestCase
+
+from PySide2.QtCore import QMimeData, QPointF, QRectF
+from PySide2.QtGui import QColor, QImage, QPainter
+from PySide2.QtWidgets import QApplication
+
+from nfb_studio.scheme import Scheme, Connection, Input, Output
+from nfb_studio.scheme.style import Style
+from nfb_studio.serial import base, hooks
+from nfb_studio.signal_nodes import LSLInput, SpatialFilter
+
+
+class SmallScheme(Scheme):
+    virtualization_threshold = 10
+
+
+class DragEvent:
+    """Stand-in for QGraphicsSceneDragDropEvent, whose mime data can not be set from Python."""
+    def __init__(self, mime_data: QMimeData, pos: QPointF):
+        self._mime_data = mime_data
+        self._pos = pos
+        self._accepted = False
+
+    def mimeData(self):
+        return self._mime_data
+
+    def pos(self):
+        return self._pos
+
+    def setAccepted(self, accepted):
+        self._accepted = accepted
+
+    def ignore(self):
+        self._accepted = False
+
+    def isAccepted(self):
+        return self._accepted
+
+
+class TestCompactConnections(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.scheme = Scheme()
+        self.scheme.setCompactConnections(True)
+
+        self.source = LSLInput()
+        self.target = SpatialFilter()
+        self.target.setPos(400, 0)
+
+        self.scheme.addItem(self.source)
+        self.scheme.addItem(self.target)
+
+    def stemTip(self, connection):
+        """Position of the tip of a connection's stem in scene coordinates."""
+        return connection.mapToScene(connection.stemTip())
+
+    def test_construction(self):
+        for connection in (Connection(), Input(), Output()):
+            self.assertFalse(connection.isCompact())
+
+    def test_large_scheme(self):
+        for i in range(5):
+            source, target = LSLInput(), SpatialFilter()
+            source.setPos(0, 300 * i)
+            target.setPos(400, 300 * i)
+            self.scheme.addItem(source)
+            self.scheme.addItem(target)
+            self.scheme.connect_nodes(source.outputs[0], target.inputs[0])
+
+        data = json.loads(json.dumps(base.BaseEncoder(hooks=hooks.qt).encode(self.scheme)))
+        data["__class__"] = {"__module__": SmallScheme.__module__, "__qualname__": SmallScheme.__qualname__}
+
+        scheme = base.BaseDecoder(hooks=hooks.qt).decode(data)
+        scheme.setViewportRect(QRectF(0, 0, 800, 600))
+
+        self.assertTrue(scheme.hasCompactConnections())
+        self.assertTrue(scheme.builtGraph().nodes)
+        for node in scheme.builtGraph().nodes:
+            self.assertTrue(node.hasCompactConnections())
+            for connection in node.inputs + node.outputs:
+                self.assertTrue(connection.isCompact())
+
+    def test_painting(self):
+        connection = self.target.inputs[0]
+        self.assertEqual(connection.childItems(), [])  # Nothing is drawn by child items
+
+        # Middle of the input stem
+        point = connection.mapToScene((connection.stemRoot() + connection.stemTip()) / 2)
+        image = QImage(20, 20, QImage.Format_ARGB32)
+
+        painter = QPainter(image)
+        self.scheme.render(painter, QRectF(image.rect()), QRectF(point - QPointF(10, 10), point + QPointF(10, 10)))
+        painter.end()
+
+        background = self.scheme.schemePalette().background().color()
+        self.assertNotEqual(QColor(image.pixel(10, 10)).rgb(), background.rgb())
+
+    def test_hit_testing(self):
+        tip = self.stemTip(self.target.inputs[0])
+
+        self.assertIs(self.target.connectionAt(self.target.mapFromScene(tip)), self.target.inputs[0])
+        self.assertIn(self.target, self.scheme.items(tip))
+
+        radius = self.target.style().pixelMetric(Style.EdgeDragPrecisionRadius)
+        away = tip - QPointF(radius * 2, 0)
+        self.assertIsNone(self.target.connectionAt(self.target.mapFromScene(away)))
+        self.assertNotIn(self.target, self.scheme.items(away))
+
+    def test_edge_drag(self):
+        self.source.outputs[0].edgeDragStart()
+
+        package = QMimeData()
+        package.setData(Connection.EdgeDragMimeType, bytes())
+
+        # Dragging over the node body is ignored, over the input stem tip it is accepted
+        event = DragEvent(package, QPointF(self.target.size().width() / 2, self.target.size().height() / 2))
+        self.target.dragMoveEvent(event)
+        self.assertFalse(event.isAccepted())
+
+        event = DragEvent(package, self.target.mapFromScene(self.stemTip(self.target.inputs[0])))
+        self.target.dragMoveEvent(event)
+        self.assertTrue(event.isAccepted())
+
+        self.target.dropEvent(event)
+        self.source.outputs[0].edgeDragStop()
+
+        edges = self.scheme.graph.edges
+        self.assertEqual(len(edges), 1)
+        edge = next(iter(edges))
+        self.assertEqual((edge.source(), edge.target()), (self.source.outputs[0], self.target.inputs[0]))
@@ -0,0 +1,38 @@
+import copy
+import pickle
+from unittest import TestCase
+
+from nfb_studio.scheme.node.connection.data_type import DataType, convertible
+
+
+class TestDataType(TestCase):
+    def test_interning(self):
+        a = DataType(9001)
+        b = DataType(9002, convertible_from=[a])
+
+        self.assertIs(DataType(9001), a)
+        self.assertIs(DataType.get(9002), b)
+        self.assertIs(copy.deepcopy(b), b)
+        self.assertIs(pickle.loads(pickle.dumps(b)), b)
+        self.assertEqual(len({a, b, DataType(9001)}), 2)
+
+    def test_convertible(self):
+        a = DataType(9101)
+        b = DataType(9102, convertible_from=[9101])
+        c = DataType(9103)
+
+        self.assertTrue(convertible(a, a))
+        self.assertTrue(convertible(a, b))
+        self.assertFalse(convertible(b, a))
+        self.assertFalse(convertible(a, c))
+
+        # Conversions added to a registered type update the compatibility matrix
+        DataType(9103, convertible_to=[b])
+        self.assertTrue(convertible(c, b))
+
+    def test_deserialize_legacy(self):
+        data = {"data_id": 9201, "convertible_from": [9202], "convertible_to": []}
+        datatype = DataType.deserialize(data)
+
+        self.assertIs(datatype, DataType(9201))
+        self.assertTrue(convertible(DataType(9202), datatype))
@@ -0,0 +1,58 @@
+import json
+from unittest import TestCase
+
+from PySide2.QtWidgets import QApplication
+
+from nfb_studio.scheme import Scheme, Node, Input, Output, DataType, WarningMessage
+from nfb_studio.scheme.graph import Graph
+from nfb_studio.serial import base, hooks
+
+
+class SmallScheme(Scheme):
+    virtualization_threshold = 2
+
+
+class TestGraph(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def cyclicData(self, cls):
+        """Data of a scheme of class `cls` with two nodes connected to each other, as in an old file."""
+        scheme = Scheme()
+        first, second = Node(), Node()
+        for node, title in ((first, "First"), (second, "Second")):
+            node.setTitle(title)
+            node.addInput(Input("Input", DataType(1)))
+            node.addOutput(Output("Output", DataType(1)))
+        scheme.addItem(first)
+        scheme.addItem(second)
+        scheme.connect_nodes(first.outputs[0], second.inputs[0])
+
+        data = json.loads(json.dumps(base.BaseEncoder(hooks=hooks.qt).encode(scheme.graph)))
+        edge = data["edges"][0]
+        data["edges"].append({"source": edge["target"], "target": edge["source"]})
+        data["__class__"] = {"__module__": cls.__module__, "__qualname__": cls.__qualname__}
+        return data
+
+    def assertSkipped(self, graph: Graph):
+        self.assertEqual(len(graph.edges), 1)
+
+        edge = next(iter(graph.edges))
+        node = edge.sourceNode()
+        messages = node.transientMessages(Graph.cycle_message_key)
+        self.assertEqual(len(messages), 1)
+        self.assertIsInstance(messages[0], WarningMessage)
+        self.assertIn(edge.targetNode().title(), messages[0].text())
+        self.assertEqual(edge.targetNode().transientMessages(Graph.cycle_message_key), [])
+
+    def test_cyclic_file(self):
+        scheme = base.BaseDecoder(hooks=hooks.qt).decode(self.cyclicData(Scheme))
+        self.assertSkipped(scheme.graph)
+
+    def test_cyclic_records(self):
+        scheme = base.BaseDecoder(hooks=hooks.qt).decode(self.cyclicData(SmallScheme))
+        self.assertEqual(len(scheme.pendingNodes()), 2)
+
+        scheme.materialize()
+        self.assertSkipped(scheme.builtGraph())
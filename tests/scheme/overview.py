@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from PySide2.QtCore import QRectF
+from PySide2.QtWidgets import QApplication
+
+from nfb_studio.scheme import Scheme, SchemeOverview
+from nfb_studio.signal_nodes import LSLInput
+
+
+class TestSchemeOverview(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.scheme = Scheme()
+        self.scheme.setSceneRect(QRectF(0, 0, 4000, 3000))
+
+        for i in range(10):
+            node = LSLInput()
+            node.setPos(i * 400, i * 300)
+            self.scheme.addItem(node)
+
+        self.overview = SchemeOverview()
+        self.overview.resize(400, 300)
+        self.overview.setScheme(self.scheme)
+
+    def renderTiles(self):
+        for key in self.overview._tilesIn(QRectF(self.overview.rect())):
+            self.overview._tile(key)
+
+    def test_scene_rect_growth(self):
+        self.renderTiles()
+        tiles = dict(self.overview._tiles)
+        transform = self.overview._transform
+
+        # The scene grows to the right, but still fits: the mapping is kept, and only tiles on the right are redrawn
+        self.scheme.setSceneRect(QRectF(0, 0, 4200, 3000))
+        self.overview._flushDirtyTiles()
+
+        self.assertEqual(self.overview._transform, transform)
+        self.assertTrue(self.overview._tiles)
+        for key, pixmap in self.overview._tiles.items():
+            self.assertIs(pixmap, tiles[key])
+        self.assertLess(len(self.overview._tiles), len(tiles))
+
+        # The scene grows past the overview: everything is fitted again
+        self.scheme.setSceneRect(QRectF(0, 0, 8000, 3000))
+        self.assertNotEqual(self.overview._transform, transform)
+        self.assertEqual(self.overview._tiles, {})
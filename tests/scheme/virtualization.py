@@ -0,0 +1,121 @@
+import json
+from unittest import TestCase
+
+from PySide2.QtCore import QPointF, QRectF
+from PySide2.QtWidgets import QApplication
+
+from nfb_studio.scheme import Scheme
+from nfb_studio.serial import base, hooks
+from nfb_studio.signal_nodes import LSLInput, SpatialFilter
+
+
+class SmallScheme(Scheme):
+    virtualization_threshold = 50
+
+
+class TestVirtualization(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.scheme = Scheme()
+
+        for i in range(40):
+            source = LSLInput()
+            target = SpatialFilter()
+            source.setPos(0, i * 300)
+            target.setPos(2000, i * 300)
+
+            self.scheme.addItem(source)
+            self.scheme.addItem(target)
+            self.scheme.connect_nodes(source.outputs[0], target.inputs[0])
+
+        self.scheme.setVirtualized(True)
+
+    def assertParked(self, area):
+        """Check that exactly the items that are not near `area` are parked."""
+        graph = self.scheme.builtGraph()
+        near = {node for node in graph.nodes if area.intersects(node.sceneBoundingRect())}
+        far = set(graph.nodes) - near
+        for edge in graph.edges:
+            if (edge.sourceNode() not in near and edge.targetNode() not in near and
+                not area.intersects(edge.sceneBoundingRect())):
+                far.add(edge)
+
+        self.assertEqual(self.scheme.parkedItems(), far)
+        for item in graph:
+            self.assertEqual(item.scene() is self.scheme, item not in far)
+
+    def test_viewport(self):
+        margin = self.scheme.virtualization_margin
+        rect = QRectF(-200, 0, 800, 600)
+
+        for dy in (0, 500, 1500, 5000, -3000):
+            rect.translate(0, dy)
+            self.scheme.setViewportRect(rect)
+            self.assertParked(rect.adjusted(-800 * margin, -600 * margin, 800 * margin, 600 * margin))
+
+    def test_moved_node(self):
+        rect = QRectF(-200, 0, 800, 600)
+        self.scheme.setViewportRect(rect)
+
+        node = next(node for node in self.scheme.parkedItems() if isinstance(node, LSLInput))
+        node.setPos(QPointF(100, 100))
+        self.scheme.updateVirtualization()
+
+        self.assertIs(node.scene(), self.scheme)
+        self.assertParked(rect.adjusted(-400, -300, 400, 300))
+
+    def test_resized_node(self):
+        node = next(node for node in self.scheme.graph.nodes if isinstance(node, SpatialFilter) and node.y() == 0)
+        node.setX(3010)
+
+        rect = QRectF(1795, 0, 800, 600)  # The area ends just before the node, in the previous grid cell
+        self.scheme.setViewportRect(rect)
+        self.assertIsNone(node.scene())
+
+        node.setCompactConnections(True)  # Input stems are now part of the node
+        self.scheme.updateVirtualization()
+
+        self.assertIs(node.scene(), self.scheme)
+        self.assertParked(rect.adjusted(-400, -300, 400, 300))
+
+    def test_items_in(self):
+        self.scheme.setViewportRect(QRectF(-200, 0, 800, 600))
+
+        # Nodes far from the visible area are parked, but are still found
+        rect = QRectF(1900, 5900, 400, 400)
+        expected = {node for node in self.scheme.graph.nodes if rect.intersects(node.sceneBoundingRect())}
+        self.assertTrue(expected)
+        self.assertTrue(expected <= self.scheme.parkedItems())
+
+        items = self.scheme.itemsIn(rect)
+        self.assertEqual(items & self.scheme.graph.nodes, expected)
+        for item in items:
+            self.assertTrue(rect.intersects(item.sceneBoundingRect()))
+
+    def test_lazy_load(self):
+        data = json.loads(json.dumps(base.BaseEncoder(hooks=hooks.qt).encode(self.scheme.graph)))
+        data["__class__"] = {"__module__": SmallScheme.__module__, "__qualname__": SmallScheme.__qualname__}
+
+        self.scheme = base.BaseDecoder(hooks=hooks.qt).decode(data)
+        self.assertEqual(len(self.scheme.builtGraph().nodes), 0)
+        self.assertEqual(len(self.scheme.pendingNodes()), 80)
+
+        # Only nodes near the visible area and their neighbours are built
+        rect = QRectF(-200, 0, 800, 600)
+        self.scheme.setViewportRect(rect)
+        self.assertEqual(len(self.scheme.builtGraph().nodes), 8)
+        self.assertParked(rect.adjusted(-400, -300, 400, 300))
+
+        # Nodes that are not built yet are saved as they were read
+        statistics = self.scheme.indexStatistics()
+        self.assertEqual((statistics["nodes"], statistics["edges"]), (80, 40))
+        saved = json.loads(json.dumps(base.BaseEncoder(hooks=hooks.qt).encode(self.scheme)))
+        self.assertEqual((len(saved["nodes"]), len(saved["edges"])), (80, 40))
+        self.assertIn(next(iter(self.scheme.pendingNodes())).data, saved["nodes"])
+
+        graph = self.scheme.graph
+        self.assertEqual((len(graph.nodes), len(graph.edges)), (80, 40))
+        self.assertEqual(len(self.scheme.pendingNodes()), 0)
@@ -88,3 +88,19 @@ class TestBaseDecoder(TestCase):
         expected_result.nested.list_var.append('x')
 
         self.assertEqual(decoder.decode(self.source_data), expected_result)
+
+    def test_decoder_steps(self):
+        decoder = base.BaseDecoder()
+        steps = decoder.decode_steps(self.source_data)
+
+        # One step for every custom object: three Nested objects and the ExampleClass
+        count = 0
+        try:
+            while True:
+                next(steps)
+                count += 1
+        except StopIteration as e:
+            result = e.value
+
+        self.assertEqual(count, 4)
+        self.assertEqual(result, ExampleClass())
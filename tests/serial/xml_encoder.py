@@ -26,3 +26,16 @@ class TestXMLEncoder(TestCase):
 
         obj = {"root": ExampleClass()}
         self.assertEqual(encoder.encode(obj), expected_result)
+
+    def test_fragments(self):
+        for metadata in (True, False):
+            encoder = xml.XMLEncoder(separator="\n", indent="\t", metadata=metadata)
+            data = {"example": ExampleClass(), "items": {"item": [{"a": 1, "b": None}, None, "text"]}, "empty": {}}
+
+            # A document assembled from fragments is the same as a document encoded at once
+            fragments = [encoder.encode_element(key, value, 1) for key, value in data.items()]
+            self.assertEqual(encoder.join("root", fragments), encoder.encode({"root": data}))
+
+            items = [encoder.encode_element("item", value, 2) for value in data["items"]["item"]]
+            self.assertEqual(encoder.join("items", items, 1), encoder.encode_element("items", data["items"], 1))
+            self.assertEqual(encoder.join("empty", [], 1), encoder.encode_element("empty", {}, 1))
@@ -0,0 +1,5 @@
+from .export_plan import TestExportPlan
+from .lsl_input import TestRecordingRegistry
+from .signal_node import TestSignalNode
+from .spatial_filter import TestSpatialFilter
+from .validator import TestSchemeValidator
@@ -0,0 +1,140 @@
+from unittest import TestCase
+
+from PySide2.QtWidgets import QApplication
+
+from nfb_studio.scheme import Scheme, Edge, Input, Output
+from nfb_studio.signal_nodes import (LSLInput, SpatialFilter, BandpassFilter, EnvelopeDetector, DerivedSignalExport,
+    ExportPlan, ExportError)
+from nfb_studio.signal_nodes.signal_node import SignalNode
+
+
+class CountingFilter(SpatialFilter):
+    """SpatialFilter that counts calls to `add_nfb_export_data`."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.calls = 0
+
+    def add_nfb_export_data(self, signal: dict):
+        self.calls += 1
+        super().add_nfb_export_data(signal)
+
+
+class Relay(SignalNode):
+    """A node whose output has the type of its input, so that it can be connected to itself."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.addInput(Input("Input", SpatialFilter.output_type))
+        self.addOutput(Output("Output", SpatialFilter.output_type))
+
+    def dataSourceInfo(self):
+        return None  # Do not follow the cycle upstream
+
+
+def sequential_export(chain) -> dict:
+    """Signal dict of a chain, computed the way Experiment did before ExportPlan."""
+    signal = {}
+
+    for node in chain:
+        node.add_nfb_export_data(signal)
+
+    if isinstance(chain[1], EnvelopeDetector):
+        signal["sTemporalType"] = "envdetector"
+    elif isinstance(chain[1], BandpassFilter):
+        signal["sTemporalType"] = "filter"
+    else:
+        signal["sTemporalType"] = "identity"
+    return signal
+
+
+class TestExportPlan(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.scheme = Scheme()
+
+    def add(self, node_type, *sources):
+        node = node_type()
+        self.scheme.addItem(node)
+
+        for source in sources:
+            self.scheme.connect_nodes(source.outputs[0], node.inputs[0])
+        return node
+
+    def export(self, name, source):
+        node = self.add(DerivedSignalExport, source)
+        node.setSignalName(name)
+        return node
+
+    def assertError(self, plan, signal_node, node, text):
+        self.assertEqual(len(plan.errors), 1)
+        error = plan.errors[0]
+        self.assertEqual((error.signal_node, error.node), (signal_node, node))
+        self.assertIn(text, str(error))
+        self.assertEqual(plan.signals, [])
+
+        with self.assertRaises(ExportError) as context:
+            plan.raise_errors()
+        self.assertEqual(context.exception.errors, plan.errors)
+
+    def test_dangling_input(self):
+        filter = self.add(SpatialFilter)
+        signal = self.export("Alpha", filter)
+
+        self.assertError(ExportPlan(self.scheme.graph), signal, filter, "is not connected")
+
+    def test_many_connections(self):
+        first, second = self.add(LSLInput), self.add(LSLInput)
+        filter = self.add(SpatialFilter, first, second)
+        signal = self.export("Alpha", filter)
+
+        self.assertError(ExportPlan(self.scheme.graph), signal, filter, "more than one connection")
+
+    def test_cycle(self):
+        relay = self.add(Relay)
+        signal = self.export("Alpha", relay)
+
+        # The graph does not accept cycles, so the edge is made without it
+        edge = Edge()
+        edge.setSource(relay.outputs[0])
+        edge.setTarget(relay.inputs[0])
+
+        self.assertError(ExportPlan(self.scheme.graph), signal, relay, "has a cycle")
+
+    def test_chain_start(self):
+        filter = self.add(SpatialFilter)
+        filter.removeInput(0)
+        signal = self.export("Alpha", filter)
+
+        self.assertError(ExportPlan(self.scheme.graph), signal, filter, "does not start with")
+
+    def test_shared_prefix(self):
+        source = self.add(LSLInput)
+        shared = self.add(CountingFilter, source)
+        bandpass = self.add(BandpassFilter, shared)
+        signals = [self.export("Alpha", bandpass), self.export("Beta", shared), self.export("Gamma", bandpass)]
+
+        shared.calls = 0
+        plan = ExportPlan(self.scheme.graph)
+        self.assertEqual(plan.errors, [])
+        self.assertEqual(shared.calls, 1)
+        self.assertEqual(plan.signals, [
+            [signals[0], bandpass, shared, source],
+            [signals[1], shared, source],
+            [signals[2], bandpass, shared, source],
+        ])
+
+    def test_old_output(self):
+        source = self.add(LSLInput)
+        spatial = self.add(SpatialFilter, source)
+        bandpass = self.add(BandpassFilter, spatial)
+        envelope = self.add(EnvelopeDetector, bandpass)
+        self.export("Spatial", spatial)
+        self.export("Filter", bandpass)
+        self.export("Envelope", envelope)
+
+        plan = ExportPlan(self.scheme.graph)
+        self.assertEqual(len(plan.signals), 3)
+        for chain in plan.signals:
+            self.assertEqual(plan.signal_data(chain), sequential_export(chain))
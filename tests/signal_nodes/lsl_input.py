@@ -0,0 +1,76 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import h5py
+import numpy as np
+from PySide2.QtWidgets import QApplication
+
+from nfb_studio.experiment import Experiment
+from nfb_studio.signal_nodes import LSLInput
+
+
+class TestRecordingRegistry(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "recording.h5")
+
+        with h5py.File(self.path, "w") as file:
+            file["fs"] = np.array(250)
+            file["raw_data"] = np.zeros((10, 3))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def lslInput(self, experiment):
+        return next(node for node in experiment.signal_scheme.graph.nodes if isinstance(node, LSLInput))
+
+    def test_experiments(self):
+        experiment = Experiment()
+        node = LSLInput()
+        experiment.signal_scheme.addItem(node)
+        self.assertIs(node.recordings(), experiment.recordings)
+
+        data_source = experiment.recordings.add(self.path)
+        node.setDataSource(data_source.name)
+        self.assertIs(node.dataSourceInfo(), data_source)
+
+        # A loaded experiment opens the recording in its own registry
+        loaded = Experiment.load(experiment.save())
+        loaded_source = self.lslInput(loaded).dataSourceInfo()
+        self.assertIsNot(loaded.recordings, experiment.recordings)
+        self.assertEqual(loaded.recordings.dataSources(), [loaded_source])
+        self.assertEqual(loaded_source.path, data_source.path)
+
+        # Recordings are not shared between experiments or with nodes outside of them
+        self.assertNotIn(data_source, LSLInput().dataSources())
+        self.assertNotIn(data_source, loaded.recordings.dataSources())
+
+        # Closing an experiment closes its files
+        dataset = data_source.recording().segments[0]
+        experiment.close()
+        self.assertFalse(dataset.id.valid)
+        self.assertEqual(experiment.recordings.dataSources(), [])
+
+        self.assertTrue(loaded_source.recording().segments[0].id.valid)
+        loaded.close()
+
+    def test_missing_recording(self):
+        experiment = Experiment()
+        node = LSLInput()
+        experiment.signal_scheme.addItem(node)
+        node.setDataSource(experiment.recordings.add(self.path).name)
+
+        data = experiment.save()
+        experiment.close()
+        os.remove(self.path)
+
+        # The node shows a warning, and the recording is kept when the experiment is saved again
+        loaded = Experiment.load(data)
+        self.assertIsNone(self.lslInput(loaded).dataSourceInfo())
+        saved = self.lslInput(Experiment.load(loaded.save())).serialize()
+        self.assertEqual(saved["recording"]["path"], os.path.abspath(self.path))
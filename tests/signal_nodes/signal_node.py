@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+from PySide2.QtWidgets import QApplication
+
+from nfb_studio.scheme import Edge, Input, Output
+from nfb_studio.signal_nodes.signal_node import SignalNode
+
+
+class Join(SignalNode):
+    """A node with two inputs that counts its updates."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.addInput(Input("A"))
+        self.addInput(Input("B"))
+        self.addOutput(Output("Output"))
+
+        self.updates = 0
+
+    def upstreamUpdate(self):
+        self.updates += 1
+        super().upstreamUpdate()
+
+
+def connect(source, target, index):
+    edge = Edge()
+    edge.setSource(source.outputs[0])
+    edge.setTarget(target.inputs[index])
+
+
+class TestSignalNode(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_diamonds(self):
+        # A chain of 20 diamonds has 2**20 paths from the root to the last node
+        root = Join()
+        layer = [root, root]
+        nodes = []
+
+        for i in range(20):
+            next_layer = [Join(), Join()]
+            for target in next_layer:
+                connect(layer[0], target, 0)
+                connect(layer[1], target, 1)
+
+            layer = next_layer
+            nodes.extend(layer)
+
+        for node in nodes:
+            node.updates = 0
+
+        root.parameterChange()
+        self.assertEqual([node.updates for node in nodes], [1] * len(nodes))
+
+        root.upstreamChange()
+        self.assertEqual([node.updates for node in nodes], [2] * len(nodes))
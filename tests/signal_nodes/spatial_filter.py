@@ -0,0 +1,53 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+from PySide2.QtWidgets import QApplication
+
+from nfb_studio.scheme import Scheme, ErrorMessage, WarningMessage
+from nfb_studio.signal_nodes import LSLInput, SpatialFilter, RecordingRegistry
+
+
+class TestSpatialFilter(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, "recording.npy")
+        np.save(path, np.zeros((10, 3)))
+
+        self.recordings = RecordingRegistry()
+        data_source = self.recordings.add(path, 250, ["Cz", "Pz", "O1"])
+
+        self.scheme = Scheme()
+        self.source = LSLInput()
+        self.source.setRecordings(self.recordings)
+        self.source.setDataSource(data_source.name)
+        self.node = SpatialFilter()
+        self.scheme.addItem(self.source)
+        self.scheme.addItem(self.node)
+        self.scheme.connect_nodes(self.source.outputs[0], self.node.inputs[0])
+
+    def tearDown(self):
+        self.recordings.close()
+        self.directory.cleanup()
+
+    def messages(self):
+        return [(type(message), message.text()) for message in self.node.transientMessages("channels")]
+
+    def test_channel_messages(self):
+        self.node.setVector("Cz=1;Pz=-1")
+        self.assertEqual(self.messages(), [])
+
+        # A channel name without a weight is not a file path
+        self.node.setVector("Cz")
+        self.assertEqual(self.messages(), [])
+
+        self.node.setVector("Cz;T3=1")
+        self.assertEqual(self.messages(), [(WarningMessage, "Unknown channel: T3")])
+
+        self.node.setVector("Cz=x")
+        self.assertEqual([kind for kind, _ in self.messages()], [ErrorMessage])
@@ -0,0 +1,89 @@
+from unittest import TestCase
+
+from PySide2.QtWidgets import QApplication
+
+from nfb_studio.scheme import Scheme, ErrorMessage
+from nfb_studio.signal_nodes import (LSLInput, SpatialFilter, BandpassFilter, EnvelopeDetector, DerivedSignalExport,
+    SchemeValidator)
+
+
+class TestSchemeValidator(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        # Two signals share a spatial filter, a third one has a chain of its own
+        self.scheme = Scheme()
+        source = self.add(LSLInput)
+        self.spatial = self.add(SpatialFilter, source)
+        self.bandpass = self.add(BandpassFilter, self.spatial)
+        self.envelope = self.add(EnvelopeDetector, self.spatial)
+        self.alpha = self.export("Alpha", self.bandpass)
+        self.beta = self.export("Beta", self.envelope)
+        self.gamma = self.export("Gamma", self.add(SpatialFilter, self.add(LSLInput)))
+
+        self.validator = SchemeValidator()
+        self.validator.setScheme(self.scheme)
+        self.validator.validate()
+
+    def tearDown(self):
+        self.validator.setScheme(None)
+
+    def add(self, node_type, *sources):
+        node = node_type()
+        self.scheme.addItem(node)
+
+        for source in sources:
+            self.scheme.connect_nodes(source.outputs[0], node.inputs[0])
+        return node
+
+    def export(self, name, source):
+        node = self.add(DerivedSignalExport, source)
+        node.setSignalName(name)
+        return node
+
+    def errors(self, node):
+        return [
+            message.text() for message in node.transientMessages(SchemeValidator.message_key)
+            if isinstance(message, ErrorMessage)
+        ]
+
+    def test_dirty_nodes(self):
+        self.assertEqual(self.validator.dirtyNodes(), set())
+
+        self.bandpass.setUpperBound(30)
+        self.assertEqual(self.validator.dirtyNodes(), {self.bandpass, self.alpha})
+        self.validator.validate()
+
+        self.spatial.setVector("1;0;0")
+        self.assertEqual(
+            self.validator.dirtyNodes(),
+            {self.spatial, self.bandpass, self.envelope, self.alpha, self.beta}
+        )
+
+    def test_duplicate_names(self):
+        message = "Signal name \"Alpha\" is used by another signal"
+
+        self.gamma.setSignalName("Alpha")
+        self.validator.validate()
+        self.assertEqual(self.errors(self.alpha), [message])
+        self.assertEqual(self.errors(self.gamma), [message])
+        self.assertEqual(self.errors(self.beta), [])
+
+        self.gamma.setSignalName("Gamma")
+        self.validator.validate()
+        self.assertEqual(self.errors(self.alpha), [])
+        self.assertEqual(self.errors(self.gamma), [])
+
+    def test_type_mismatch(self):
+        input = self.bandpass.inputs[0]
+        input.setDataType(EnvelopeDetector.output_type)  # The edge from the spatial filter is kept
+        self.validator.validate()
+
+        self.assertEqual(self.errors(self.bandpass), [
+            "Input \"{}\" is connected to \"{}\" of a different type".format(
+                input.text(), self.spatial.outputs[0].text()
+            )
+        ])
+        self.assertEqual(self.errors(self.envelope), [])
@@ -0,0 +1,75 @@
+import threading
+from unittest import TestCase
+
+from nfb_studio.stream_registry import StreamInfo, StreamRegistry
+
+
+class _Network:
+    """Stand-in for LSL outlets on the network. Resolving blocks until `release` is called."""
+    def __init__(self):
+        self.streams = []
+        self.calls = 0
+        self.released = threading.Event()
+
+    def release(self):
+        self.released.set()
+
+    def resolve(self, timeout):
+        self.calls += 1
+        self.released.wait(5)
+        return list(self.streams)
+
+
+class TestStreamRegistry(TestCase):
+    def setUp(self):
+        self.time = 0.0
+        self.network = _Network()
+        self.registry = StreamRegistry(resolver=self.network.resolve, clock=lambda: self.time)
+
+    def test_non_blocking(self):
+        self.network.streams = [StreamInfo("Amp", "EEG", 8, 500.0, tuple("Ch{}".format(i) for i in range(8)))]
+
+        # The first call starts a refresh and returns the empty cache while streams are being resolved
+        self.assertEqual(self.registry.streams(), [])
+        self.assertFalse(self.registry.waitForRefresh(0.05))
+        self.assertEqual(self.registry.streams(), [])
+        self.assertEqual(self.network.calls, 1)  # A running refresh is not started again
+
+        self.network.release()
+        self.assertTrue(self.registry.waitForRefresh(5))
+        self.assertEqual(self.registry.find("Amp").channel_count, 8)
+        self.assertIsNone(self.registry.find("Mitsar"))
+
+    def test_ttl(self):
+        self.network.release()
+        self.network.streams = [StreamInfo("Amp", "EEG", 8, 500.0)]
+        self.registry.refresh()
+        self.registry.waitForRefresh(5)
+
+        # The cache is used until it is older than ttl
+        self.network.streams = [StreamInfo("Mitsar", "EEG", 30, 250.0)]
+        self.time = StreamRegistry.ttl / 2
+        self.assertEqual([s.name for s in self.registry.streams()], ["Amp"])
+        self.assertEqual(self.network.calls, 1)
+
+        # A stream that stopped answering is kept until it expires
+        self.time = StreamRegistry.ttl
+        self.registry.streams()
+        self.registry.waitForRefresh(5)
+        self.assertEqual([s.name for s in self.registry.streams()], ["Amp", "Mitsar"])
+
+        self.time = StreamRegistry.expiry
+        self.registry.refresh(force=True)
+        self.registry.waitForRefresh(5)
+        self.assertEqual([s.name for s in self.registry.streams()], ["Mitsar"])
+
+    def test_unavailable(self):
+        def resolver(timeout):
+            raise ImportError("No module named 'pylsl'")
+
+        registry = StreamRegistry(resolver=resolver)
+        registry.refresh()
+        registry.waitForRefresh(5)
+
+        self.assertFalse(registry.isAvailable())
+        self.assertEqual(registry.streams(), [])